@@ -2,12 +2,13 @@
 LangGraph Agent Definition
 Minimal orchestration of retrieval → reasoning → formatting
 """
+from functools import lru_cache
 from typing import TypedDict, Optional
 from langgraph.graph import END, StateGraph
 
 from app.core.retrieval import (
     perform_hybrid_retrieval,
-    build_llm_prompt,
+    build_llm_messages,
     format_context_for_llm,
     HybridContext
 )
@@ -69,7 +70,8 @@ def reasoning_node(state: GraphState) -> GraphState:
         logger.info("[REASON] Building prompt and calling LLM...")
         
         # Build prompt
-        prompt = build_llm_prompt(
+        # Stable prefix (instructions + context) as the system message, query last
+        system_prefix, user_suffix = build_llm_messages(
             query=state['query'],
             context=context,
             system_role="financial research assistant"
@@ -79,7 +81,7 @@ def reasoning_node(state: GraphState) -> GraphState:
         is_deep_mode = state.get('mode') == 'deep'
         model_fn = deep_model_call if is_deep_mode else quick_model_call
         
-        result = model_fn(prompt)
+        result = model_fn(user_suffix, system=system_prefix)
         state['raw_analysis'] = result.get('output', '')
         
         logger.info(f"[REASON] Generated analysis ({len(state['raw_analysis'])} chars)")
@@ -123,11 +125,15 @@ def format_node(state: GraphState) -> GraphState:
     return state
 
 
+@lru_cache(maxsize=1)
 def build_graph():
     """
     Build LangGraph state machine for financial reasoning
     
     Flow: retrieve → reason → format → end
+    
+    Compiled once and shared: the graph has no checkpointer, so every
+    invocation gets its own state.
     """
     graph = StateGraph(GraphState)
     
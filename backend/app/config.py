@@ -17,6 +17,7 @@ class Settings:
     groq_deep_model: str = os.getenv("GROQ_DEEP_MODEL", "llama-3.3-70b-versatile")
     qdrant_url: str = os.getenv("QDRANT_URL", "")
     qdrant_api_key: str = os.getenv("QDRANT_API_KEY", "")
+    qdrant_prefer_grpc: bool = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
     database_url: str = os.getenv("DATABASE_URL", "")
 
 
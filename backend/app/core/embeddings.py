@@ -3,16 +3,30 @@ Embeddings Module
 Lazy-loads sentence-transformers for semantic search
 Handles query and document embedding with caching
 """
+from functools import lru_cache
 from typing import Optional
+import hashlib
 import os
 
+import numpy as np
+
+from app.config import CACHE_DIR
 from app.utils.helpers import get_logger
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 logger = get_logger(__name__)
 
 # Global model cache
 _embedding_model = None
 
+# Persistent text -> vector cache, opened on first batch embed
+_embedding_cache = None
+EMBEDDING_CACHE_DIR = CACHE_DIR / "embeddings"
+
 
 def get_embedding_model():
     """
@@ -72,12 +86,71 @@ def embed_text(text: str) -> Optional[list[float]]:
         return None
 
 
-def embed_batch(texts: list[str]) -> Optional[list[list[float]]]:
+@lru_cache(maxsize=256)
+def _cached_text_embedding(text: str) -> Optional[tuple[float, ...]]:
+    embedding = embed_text(text)
+    return tuple(embedding) if embedding is not None else None
+
+
+def embed_text_cached(text: str) -> Optional[list[float]]:
+    """
+    embed_text memoized in-process on the exact text (last 256 texts)
+    
+    For query embedding, where the same question is often asked repeatedly.
+    Hit/miss counts are available from embed_text_cache_info().
+    """
+    if not text or not isinstance(text, str):
+        return None
+    embedding = _cached_text_embedding(text)
+    return list(embedding) if embedding is not None else None
+
+
+def embed_text_cache_info():
+    """functools cache statistics (hits, misses, maxsize, currsize) for embed_text_cached"""
+    return _cached_text_embedding.cache_info()
+
+
+def get_embedding_cache():
+    """
+    Lazy-open the on-disk embedding cache
+    
+    Returns:
+        diskcache.Cache or None if diskcache is unavailable
+    """
+    global _embedding_cache
+    
+    if _embedding_cache is not None:
+        return _embedding_cache
+    
+    try:
+        from diskcache import Cache
+        
+        _embedding_cache = Cache(str(EMBEDDING_CACHE_DIR))
+        return _embedding_cache
+        
+    except Exception as exc:
+        logger.warning(f"Embedding cache unavailable: {exc}")
+        return None
+
+
+def _embedding_key(model_name: str, text: str) -> str:
+    """Content key for a text; includes the model so switching models never reuses vectors"""
+    payload = f"{model_name}\0{text}".encode("utf-8")
+    if xxhash is not None:
+        return f"emb:xxh3:{xxhash.xxh3_128_hexdigest(payload)}"
+    return f"emb:b2:{hashlib.blake2b(payload, digest_size=16).hexdigest()}"
+
+
+def embed_batch(texts: list[str], batch_size: int = 64) -> Optional[list[list[float]]]:
     """
     Embed multiple texts efficiently via batch processing
     
+    Identical texts are embedded once, and vectors are cached on disk by content
+    so re-ingests and boilerplate shared across documents skip the model.
+    
     Args:
         texts: List of texts to embed
+        batch_size: Texts per model forward pass
         
     Returns:
         List of embedding vectors
@@ -90,8 +163,32 @@ def embed_batch(texts: list[str]) -> Optional[list[list[float]]]:
         if model is None:
             return None
         
-        embeddings = model.encode(texts, convert_to_tensor=False)
-        return [emb.tolist() for emb in embeddings]
+        model_name = os.getenv("EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5")
+        cache = get_embedding_cache()
+        stripped = [text.strip() for text in texts]
+        
+        # Resolve each distinct text from the cache, collecting misses for one encode call
+        vectors = {}
+        pending = []
+        for text in dict.fromkeys(stripped):
+            cached = cache.get(_embedding_key(model_name, text)) if cache is not None else None
+            if cached is not None:
+                vectors[text] = np.frombuffer(cached, dtype=np.float32)
+            else:
+                pending.append(text)
+        
+        if pending:
+            embeddings = np.asarray(
+                model.encode(pending, batch_size=batch_size, convert_to_tensor=False),
+                dtype=np.float32,
+            )
+            for text, vector in zip(pending, embeddings):
+                vectors[text] = vector
+                if cache is not None:
+                    cache.set(_embedding_key(model_name, text), vector.tobytes())
+        
+        logger.debug(f"Embedded {len(pending)} texts, {len(stripped) - len(pending)} from cache")
+        return [vectors[text].tolist() for text in stripped]
         
     except Exception as exc:
         logger.error(f"Failed to embed batch: {exc}")
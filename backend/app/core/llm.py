@@ -13,10 +13,21 @@ def _get_client() -> Groq | None:
 	return Groq(api_key=settings.groq_api_key)
 
 
-def _call_model(prompt: str, model: str) -> dict:
+def _build_messages(prompt: str, system: str | None) -> list[dict]:
+	"""Chat messages with the stable system prefix (if any) first"""
+	messages = [{"role": "user", "content": prompt}]
+	if system:
+		messages.insert(0, {"role": "system", "content": system})
+	return messages
+
+
+def _call_model(prompt: str, model: str, system: str | None = None) -> dict:
 	"""
 	Call Groq LLM with token usage and latency tracking (Area #7).
 	
+	A system message, when given, is sent ahead of the prompt; keeping it
+	identical across calls lets Groq reuse its cached prefix.
+	
 	Returns:
 		dict with 'output', 'tokens_used', 'latency_ms', 'model', 'mock'
 	"""
@@ -37,7 +48,7 @@ def _call_model(prompt: str, model: str) -> dict:
 	try:
 		response = client.chat.completions.create(
 			model=model,
-			messages=[{"role": "user", "content": prompt}],
+			messages=_build_messages(prompt, system),
 			temperature=0.2,
 		)
 		
@@ -78,11 +89,11 @@ def _call_model(prompt: str, model: str) -> dict:
 		}
 
 
-def quick_model_call(prompt: str) -> dict:
+def quick_model_call(prompt: str, system: str | None = None) -> dict:
 	"""Call quick model (llama-3.1-8b-instant) with usage tracking."""
-	return _call_model(prompt, settings.groq_quick_model)
+	return _call_model(prompt, settings.groq_quick_model, system)
 
 
-def deep_model_call(prompt: str) -> dict:
+def deep_model_call(prompt: str, system: str | None = None) -> dict:
 	"""Call deep model (llama-3.3-70b-versatile) with usage tracking."""
-	return _call_model(prompt, settings.groq_deep_model)
+	return _call_model(prompt, settings.groq_deep_model, system)
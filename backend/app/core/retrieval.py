@@ -2,17 +2,39 @@
 Hybrid Retrieval Module
 Combines structured PostgreSQL queries with semantic Qdrant searches
 Bridges numeric financial data with narrative context
+
+Prompt layout contract: prompts built here put the stable part first (role,
+instructions and retrieved context, in a deterministic order and without
+per-request values such as latency) and the user query last. Providers that
+cache prompt prefixes can then reuse the prefix across queries over the same
+data. build_llm_messages returns the two parts separately for use as the
+system and user messages. assemble_context also renders each narrative chunk
+as an identical <chunk id="..."> block wherever it appears, with per-query
+relevance scores listed after the chunks rather than inside them.
 """
 from typing import Optional, TypedDict
 from datetime import datetime
+from functools import lru_cache
+import asyncio
+import hashlib
 import json
 
 from app.core.schema import get_financial_metrics
 from app.core.vector import get_qdrant_client
 from app.utils.helpers import get_logger
 
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
 logger = get_logger(__name__)
 
+# Prompt tokens assemble_context may spend on narrative excerpts, markup included.
+# Five full 800-char excerpts render to ~1100 tokens, so a normal retrieval always
+# fits; callers wanting a tighter prompt pass a smaller narrative_token_budget.
+NARRATIVE_TOKEN_BUDGET = 3000
+
 
 class StructuredMetrics(TypedDict, total=False):
     """Structured financial metrics retrieved from PostgreSQL"""
@@ -332,6 +354,32 @@ def classify_query_mode(query: str) -> str:
     return mode
 
 
+def _to_narrative_chunks(narrative_results: Optional[list[dict]], narrative_limit: int) -> list[NarrativeChunk]:
+    """Convert search_narrative results to NarrativeChunks, skipping malformed ones"""
+    # DEFENSIVE: Ensure results is list
+    if narrative_results is None:
+        narrative_results = []
+    
+    narrative_chunks = []
+    for result in narrative_results[:narrative_limit]:  # Double-check limit
+        try:
+            metadata = result.get('metadata', {})
+            narrative_chunks.append(NarrativeChunk(
+                doc_type=metadata.get('doc_type', 'unknown'),
+                company=metadata.get('company', 'Unknown'),
+                ticker=metadata.get('ticker', 'Unknown'),
+                year=metadata.get('year', 0),
+                text=result.get('text', '')[:800],  # Cap text
+                section_title=metadata.get('section_title', ''),
+                point_id=result.get('point_id', 0),
+                score=max(0.0, min(result.get('similarity_score', 0.0), 1.0))  # Clamp score
+            ))
+        except Exception as chunk_exc:
+            logger.warning(f"Failed to parse narrative chunk: {chunk_exc}")
+            continue
+    return narrative_chunks
+
+
 def perform_hybrid_retrieval(
     query: str,
     embeddings_model_fn=None,
@@ -408,7 +456,7 @@ def perform_hybrid_retrieval(
                 query_embedding = embeddings_model_fn(query)
                 
                 # DEFENSIVE: Validate embedding
-                if not query_embedding or len(query_embedding) == 0:
+                if query_embedding is None or len(query_embedding) == 0:
                     logger.warning("Query embedding is empty")
                 else:
                     # Use search_narrative with safe defaults
@@ -419,28 +467,7 @@ def perform_hybrid_retrieval(
                         score_threshold=0.4
                     )
                     
-                    # DEFENSIVE: Ensure results is list
-                    if narrative_results is None:
-                        narrative_results = []
-                    
-                    # Convert to NarrativeChunk format
-                    narrative_chunks = []
-                    for result in narrative_results[:narrative_limit]:  # Double-check limit
-                        try:
-                            metadata = result.get('metadata', {})
-                            narrative_chunks.append(NarrativeChunk(
-                                doc_type=metadata.get('doc_type', 'unknown'),
-                                company=metadata.get('company', 'Unknown'),
-                                ticker=metadata.get('ticker', 'Unknown'),
-                                year=metadata.get('year', 0),
-                                text=result.get('text', '')[:800],  # Cap text
-                                section_title=metadata.get('section_title', ''),
-                                point_id=result.get('point_id', 0),
-                                score=max(0.0, min(result.get('similarity_score', 0.0), 1.0))  # Clamp score
-                            ))
-                        except Exception as chunk_exc:
-                            logger.warning(f"Failed to parse narrative chunk: {chunk_exc}")
-                            continue
+                    narrative_chunks = _to_narrative_chunks(narrative_results, narrative_limit)
                     
                     context['narrative_chunks'] = narrative_chunks
                     context['retrieval_summary']['narrative_retrieved'] = len(narrative_chunks)
@@ -463,12 +490,203 @@ def perform_hybrid_retrieval(
         return context
 
 
-def format_context_for_llm(context: HybridContext) -> str:
+async def perform_hybrid_retrieval_async(
+    query: str,
+    embeddings_model_fn=None,
+    tickers: Optional[list[str]] = None,
+    force_mode: Optional[str] = None,
+    numeric_limit: int = 50,
+    narrative_limit: int = 5
+) -> HybridContext:
+    """
+    Async perform_hybrid_retrieval with the numeric and narrative branches overlapped.
+    
+    The PostgreSQL query and the embedding + Qdrant search are independent, so
+    they run concurrently and retrieval takes as long as the slower of the two.
+    The narrative search goes through the shared AsyncQdrantClient; the blocking
+    metrics query and embedding call run on worker threads.
+    Same arguments, return shape and graceful degradation as perform_hybrid_retrieval.
+    """
+    from app.core.vector import asearch_narrative
+    
+    # DEFENSIVE: Sanitize limits
+    numeric_limit = min(max(numeric_limit, 10), 100)
+    narrative_limit = min(max(narrative_limit, 1), 5)
+    
+    start_time = datetime.now()
+    mode = force_mode or classify_query_mode(query)
+    logger.info(f"Performing {mode} retrieval for query: {query[:80]}")
+    
+    context = HybridContext(
+        query=query,
+        mode=mode,
+        numeric_data=[],
+        narrative_chunks=[],
+        retrieval_summary={
+            'query_mode': mode,
+            'numeric_retrieved': 0,
+            'narrative_retrieved': 0,
+            'latency_ms': 0
+        }
+    )
+    
+    async def retrieve_numeric():
+        try:
+            numeric_data = await asyncio.to_thread(
+                retrieve_structured_metrics, tickers=tickers, limit=numeric_limit
+            )
+            # DEFENSIVE: Ensure numeric_data is list
+            numeric_data = numeric_data or []
+            context['numeric_data'] = numeric_data
+            context['retrieval_summary']['numeric_retrieved'] = len(numeric_data)
+            logger.info(f"Retrieved {len(numeric_data)} numeric records")
+        except Exception as exc:
+            logger.warning(f"Numeric retrieval failed: {exc}")
+    
+    async def retrieve_narrative():
+        try:
+            query_embedding = await asyncio.to_thread(embeddings_model_fn, query)
+            
+            # DEFENSIVE: Validate embedding
+            if query_embedding is None or len(query_embedding) == 0:
+                logger.warning("Query embedding is empty")
+                return
+            
+            narrative_results = await asearch_narrative(
+                query_embedding=query_embedding,
+                tickers=tickers,
+                top_k=narrative_limit,
+                score_threshold=0.4
+            )
+            narrative_chunks = _to_narrative_chunks(narrative_results, narrative_limit)
+            context['narrative_chunks'] = narrative_chunks
+            context['retrieval_summary']['narrative_retrieved'] = len(narrative_chunks)
+            logger.info(f"Retrieved {len(narrative_chunks)} narrative chunks")
+        except Exception as exc:
+            logger.warning(f"Narrative retrieval failed (non-blocking): {exc}")
+    
+    branches = []
+    if mode in ['numeric', 'hybrid']:
+        branches.append(retrieve_numeric())
+    if mode in ['narrative', 'hybrid'] and embeddings_model_fn:
+        branches.append(retrieve_narrative())
+    
+    # Each branch handles its own failures, so one never cancels the other
+    await asyncio.gather(*branches)
+    
+    elapsed = (datetime.now() - start_time).total_seconds() * 1000
+    context['retrieval_summary']['latency_ms'] = int(elapsed)
+    logger.debug(f"Retrieval completed in {elapsed:.0f}ms: {len(context['numeric_data'])} metrics, {len(context['narrative_chunks'])} narratives")
+    return context
+
+
+def perform_hybrid_retrieval_batch(
+    queries: list[str],
+    embeddings_model_fn=None,
+    tickers: Optional[list[str]] = None,
+    force_mode: Optional[str] = None,
+    numeric_limit: int = 50,
+    narrative_limit: int = 5,
+    embeddings_batch_fn=None
+) -> list[HybridContext]:
+    """
+    perform_hybrid_retrieval for several queries sharing the same filters.
+    
+    Numeric metrics are fetched once for the shared tickers, and every query
+    needing narrative context is searched in a single Qdrant batch request.
+    Each context's latency_ms is the time for the whole batch.
+    
+    Args:
+        queries: User queries
+        embeddings_model_fn: Function to generate one query embedding
+        tickers: Filter by specific tickers
+        force_mode: Override automatic mode selection ('numeric', 'narrative', 'hybrid')
+        numeric_limit: Max numeric records to retrieve (capped at 100)
+        narrative_limit: Max narrative chunks per query (capped at 5)
+        embeddings_batch_fn: Optional function embedding a list of queries at once
+            (e.g., embed_batch); used instead of embeddings_model_fn when given
+        
+    Returns:
+        One HybridContext per query, in order
+    """
+    from app.core.vector import search_narrative_batch
+    
+    # DEFENSIVE: Sanitize limits
+    numeric_limit = min(max(numeric_limit, 10), 100)
+    narrative_limit = min(max(narrative_limit, 1), 5)
+    
+    start_time = datetime.now()
+    modes = [force_mode or classify_query_mode(query) for query in queries]
+    logger.info(f"Performing batch retrieval for {len(queries)} queries")
+    
+    numeric_data = []
+    if any(mode in ['numeric', 'hybrid'] for mode in modes):
+        try:
+            numeric_data = retrieve_structured_metrics(tickers=tickers, limit=numeric_limit) or []
+        except Exception as exc:
+            logger.warning(f"Numeric retrieval failed: {exc}")
+    
+    # Narrative search for every query that needs it, in one request
+    narrative_by_query = {}
+    narrative_idx = [i for i, mode in enumerate(modes) if mode in ['narrative', 'hybrid']]
+    if narrative_idx and (embeddings_model_fn or embeddings_batch_fn):
+        try:
+            texts = [queries[i] for i in narrative_idx]
+            if embeddings_batch_fn:
+                embeddings = embeddings_batch_fn(texts) or [None] * len(texts)
+            else:
+                embeddings = [embeddings_model_fn(text) for text in texts]
+            
+            # DEFENSIVE: Skip queries whose embedding is empty
+            searchable = [
+                (i, embedding) for i, embedding in zip(narrative_idx, embeddings)
+                if embedding is not None and len(embedding) > 0
+            ]
+            if len(searchable) < len(narrative_idx):
+                logger.warning(f"{len(narrative_idx) - len(searchable)} query embeddings were empty")
+            
+            if searchable:
+                batch_results = search_narrative_batch(
+                    query_embeddings=[embedding for _, embedding in searchable],
+                    tickers=tickers,
+                    top_k=narrative_limit,
+                    score_threshold=0.4
+                )
+                for (i, _), results in zip(searchable, batch_results):
+                    narrative_by_query[i] = _to_narrative_chunks(results, narrative_limit)
+        except Exception as exc:
+            logger.warning(f"Batch narrative retrieval failed (non-blocking): {exc}")
+    
+    latency_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+    
+    contexts = []
+    for i, (query, mode) in enumerate(zip(queries, modes)):
+        query_numeric = list(numeric_data) if mode in ['numeric', 'hybrid'] else []
+        narrative_chunks = narrative_by_query.get(i, [])
+        contexts.append(HybridContext(
+            query=query,
+            mode=mode,
+            numeric_data=query_numeric,
+            narrative_chunks=narrative_chunks,
+            retrieval_summary={
+                'query_mode': mode,
+                'numeric_retrieved': len(query_numeric),
+                'narrative_retrieved': len(narrative_chunks),
+                'latency_ms': latency_ms
+            }
+        ))
+    
+    logger.debug(f"Batch retrieval completed in {latency_ms}ms for {len(queries)} queries")
+    return contexts
+
+
+def format_context_for_llm(context: HybridContext, include_latency: bool = True) -> str:
     """
     Format hybrid context into LLM-friendly prompt section
     
     Args:
         context: HybridContext from retrieval
+        include_latency: Include the retrieval latency, which differs on every call
         
     Returns:
         Formatted context string for inclusion in LLM prompt
@@ -525,18 +743,19 @@ def format_context_for_llm(context: HybridContext) -> str:
     parts.append(f"- Mode: {summary.get('query_mode')}")
     parts.append(f"- Numeric Records: {summary.get('numeric_retrieved')}")
     parts.append(f"- Narrative Chunks: {summary.get('narrative_retrieved')}")
-    parts.append(f"- Retrieval Latency: {summary.get('latency_ms')}ms")
+    if include_latency:
+        parts.append(f"- Retrieval Latency: {summary.get('latency_ms')}ms")
     
     return "\n".join(parts)
 
 
-def build_llm_prompt(
+def build_llm_messages(
     query: str,
     context: HybridContext,
     system_role: str = "assistant"
-) -> str:
+) -> tuple[str, str]:
     """
-    Build complete LLM prompt with query and retrieved context
+    Build the LLM prompt as a stable prefix and a query suffix
     
     Args:
         query: Original user query
@@ -544,23 +763,17 @@ def build_llm_prompt(
         system_role: Role description for the model
         
     Returns:
-        Complete prompt string
+        (system_prefix, user_suffix): instructions plus retrieved context, then the query
     """
-    prompt_parts = [
-        f"""You are a financial research agent. Your role is to {system_role}.
+    system_prefix = f"""You are a financial research agent. Your role is to {system_role}.
 
 Analyze the following financial data and provide insights grounded in the data.
 Always cite your sources and explain your reasoning.
 
 ---
 
-USER QUERY:
-{query}
-
----
-
 RETRIEVED CONTEXT:
-{format_context_for_llm(context)}
+{format_context_for_llm(context, include_latency=False)}
 
 ---
 
@@ -569,28 +782,161 @@ INSTRUCTIONS:
 2. Cite specific metrics and sources
 3. If data is missing, note what additional information would help
 4. Be concise but thorough
-5. Highlight key insights and trends
+5. Highlight key insights and trends"""
+    
+    user_suffix = f"""USER QUERY:
+{query}
 
 RESPONSE:"""
-    ]
     
-    return "\n".join(prompt_parts)
+    return system_prefix, user_suffix
+
+
+def build_llm_prompt(
+    query: str,
+    context: HybridContext,
+    system_role: str = "assistant"
+) -> str:
+    """
+    Build complete LLM prompt with query and retrieved context
+    
+    Args:
+        query: Original user query
+        context: HybridContext from retrieval
+        system_role: Role description for the model
+        
+    Returns:
+        Complete prompt string (build_llm_messages parts, query last)
+    """
+    system_prefix, user_suffix = build_llm_messages(query, context, system_role)
+    return f"{system_prefix}\n\n---\n\n{user_suffix}"
+
+
+def _sort_year(year) -> int:
+    """Fiscal year as an int for ordering; unparseable years sort as 0"""
+    try:
+        return int(year)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _metric_sort_key(metric) -> tuple:
+    """Order metric records by ticker, then newest year (stable for equal keys)"""
+    if not isinstance(metric, dict):
+        return ('', 0)
+    return (str(metric.get('ticker', '')), -_sort_year(metric.get('year')))
+
+
+def _narrative_sort_key(chunk) -> tuple:
+    """Order narrative chunks by ticker, then newest year (stable for equal keys)"""
+    metadata = chunk.get('metadata', {}) if isinstance(chunk, dict) else {}
+    if not isinstance(metadata, dict):
+        metadata = {}
+    return (str(metadata.get('ticker', '')), -_sort_year(metadata.get('year')))
+
+
+@lru_cache(maxsize=1)
+def _token_encoder():
+    """cl100k_base encoder, or None if tiktoken (or its encoding file) is unavailable"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as exc:
+        logger.warning(f"tiktoken encoding unavailable, estimating token counts: {exc}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Prompt tokens in text: exact with tiktoken, else ~4 characters per token"""
+    encoder = _token_encoder()
+    if encoder is None:
+        return (len(text) + 3) // 4
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def select_within_budget(scores: list[float], costs: list[int], budget: int) -> list[int]:
+    """
+    0/1 knapsack: indices (in input order) of the items with the highest total
+    score whose costs fit in budget
+    """
+    if sum(costs) <= budget:
+        return list(range(len(costs)))
+    
+    # Tiny floor so zero-score items still fill otherwise unused budget
+    values = [max(score, 0.0) + 1e-9 for score in scores]
+    best = [0.0] * (budget + 1)
+    taken = [[False] * (budget + 1) for _ in costs]
+    for i, (value, cost) in enumerate(zip(values, costs)):
+        for capacity in range(budget, cost - 1, -1):
+            candidate = best[capacity - cost] + value
+            if candidate > best[capacity]:
+                best[capacity] = candidate
+                taken[i][capacity] = True
+    
+    chosen = []
+    capacity = budget
+    for i in range(len(costs) - 1, -1, -1):
+        if taken[i][capacity]:
+            chosen.append(i)
+            capacity -= costs[i]
+    return chosen[::-1]
+
+
+def _fit_token_budget(blocks: list, budget: int) -> list:
+    """
+    Keep the best-scoring rendered narrative blocks that fit in budget tokens
+    
+    Args:
+        blocks: (chunk_id, similarity, rendered lines) tuples in prompt order
+        budget: Max tokens across the kept blocks, markup included
+        
+    Returns:
+        The kept blocks, in their original order
+    """
+    scores = [similarity for _, similarity, _ in blocks]
+    costs = [count_tokens("\n".join(lines)) for _, _, lines in blocks]
+    
+    chosen = select_within_budget(scores, costs, max(budget, 0))
+    if len(chosen) < len(blocks):
+        logger.debug(
+            f"Narrative tokens: {sum(costs[i] for i in chosen)}/{budget} "
+            f"(kept {len(chosen)} of {len(blocks)} chunks)"
+        )
+    return [blocks[i] for i in chosen]
+
+
+def narrative_chunk_id(metadata: dict, text: str) -> str:
+    """
+    Stable id for a narrative chunk: ticker, doc type, year and a digest of its text
+    
+    The same chunk gets the same id (and the same rendered block) in every
+    prompt, whichever query retrieved it.
+    """
+    if not isinstance(metadata, dict):
+        metadata = {}
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=4).hexdigest()
+    parts = [metadata.get('ticker'), metadata.get('doc_type'), metadata.get('year'), digest]
+    return "_".join(str(part).lower().replace(' ', '_') for part in parts if part)
 
 
 def assemble_context(
     query: str,
     numeric_data: list[dict],
     narrative_chunks: list[dict],
-    include_contradiction_check: bool = True
+    include_contradiction_check: bool = True,
+    narrative_token_budget: Optional[int] = NARRATIVE_TOKEN_BUDGET
 ) -> str:
     """
     Assemble retrieved data into structured, citation-rich context for LLM.
     
     DEFENSIVE: Gracefully handles malformed/missing data.
     - Caps narrative chunks at 5 max (Area #4 safeguard)
-    - Validates text length (800 char per chunk, 5000 char total narrative)
+    - Validates text length (800 char per chunk)
     - Ensures every narrative item has [Source: ...] label
     - Caps numeric metrics at 15
+    - Keeps the best-scoring narrative chunks that fit narrative_token_budget
+      (0/1 knapsack on similarity score vs. rendered token count)
     - Skips malformed records, logs warnings
     
     Formats numeric metrics and narrative excerpts with source labels, creating
@@ -602,6 +948,7 @@ def assemble_context(
         numeric_data: List of financial metric records from PostgreSQL
         narrative_chunks: List of narrative chunk records from Qdrant with metadata
         include_contradiction_check: Add prompt instruction to detect contradictions
+        narrative_token_budget: Max tokens of narrative text (None for no budget)
         
     Returns:
         Formatted context string optimized for LLM reasoning with citations
@@ -616,11 +963,39 @@ def assemble_context(
     if not isinstance(narrative_chunks, list):
         narrative_chunks = []
     
-    # Query context
+    # Query context (the query itself goes last, after the stable prefix)
     sections.append("=" * 70)
     sections.append("FINANCIAL RESEARCH CONTEXT")
     sections.append("=" * 70)
-    sections.append(f"\nQuery: {query}\n")
+    
+    # Instructions section (identical for every query, so it leads the prompt)
+    sections.append("\n" + "=" * 70)
+    sections.append("ANALYSIS INSTRUCTIONS")
+    sections.append("=" * 70)
+    sections.append("""
+You are a financial research agent. Analyze the provided data and respond to the query.
+
+REQUIREMENTS:
+1. Ground all claims in the provided metrics or citations
+2. Use [Source: ...] labels to cite where each insight originates
+3. Compare numeric data with narrative insights where relevant
+4. Identify any contradictions between quantitative metrics and qualitative commentary
+5. Provide both bull and bear perspectives when appropriate
+6. Quantify risks and opportunities with specific metrics
+7. Flag any data inconsistencies or missing information
+
+FORMATTING:
+- Use bullet points for key findings
+- Bold important figures and quotes
+- Structure analysis: Summary → Key Metrics → Narrative Insights → Risks → Conclusions
+    """)
+    
+    if include_contradiction_check:
+        sections.append("""\nCONTRADICTION DETECTION:
+If any earnings commentary contradicts the financial metrics (e.g., management
+claims "strong growth" but metrics show declining revenue), highlight this explicitly.
+Example: "[ALERT] Management stated 'record Q4 performance' but YoY revenue declined 3%"
+    """)
     
     # Numeric metrics section
     if numeric_data:
@@ -628,7 +1003,9 @@ def assemble_context(
         sections.append("-" * 70)
         
         # DEFENSIVE: Cap at 15 metrics, validate each record
-        for metric in numeric_data[:15]:
+        # Deterministic order (ticker, then newest year) keeps the prompt prefix stable
+        capped_metrics = sorted(numeric_data[:15], key=_metric_sort_key)
+        for metric in capped_metrics:
             if not isinstance(metric, dict):
                 logger.warning(f"Skipping non-dict metric: {type(metric)}")
                 continue
@@ -684,9 +1061,10 @@ def assemble_context(
         capped_chunks = narrative_chunks[:5]
         if len(narrative_chunks) > 5:
             logger.debug(f"Narrative chunks capped at 5 (had {len(narrative_chunks)})")
+        capped_chunks = sorted(capped_chunks, key=_narrative_sort_key)
         
-        total_narrative_length = 0
-        narrative_count = 0
+        seen_chunk_ids = set()
+        blocks = []  # (chunk_id, similarity, rendered lines)
         
         # Group by document type and source for better organization
         by_source = {}
@@ -716,24 +1094,25 @@ def assemble_context(
         
         for source_label, chunks_list in by_source.items():
             for section_title, chunk in chunks_list:
-                # DEFENSIVE: Cap total narrative length (5000 chars max)
-                if total_narrative_length > 5000:
-                    logger.debug(f"Narrative context exceeded 5000 char limit, truncating")
-                    break
-                
                 try:
+                    # Format narrative text with proper indentation
+                    text = chunk.get('text', '')
+                    if not isinstance(text, str):
+                        text = str(text or "")
+                    
+                    # The same chunk retrieved twice is only sent once
+                    chunk_id = narrative_chunk_id(chunk.get('metadata', {}), text)
+                    if chunk_id in seen_chunk_ids:
+                        continue
+                    seen_chunk_ids.add(chunk_id)
+                    
                     # DEFENSIVE: Ensure source label is present (Area #5 safeguard)
                     source_label_safe = source_label.replace('<', '').replace('>', '')  # Sanitize
-                    sections.append(f"\n[Source: {source_label_safe}]")
+                    lines = [f'\n<chunk id="{chunk_id}">', f"[Source: {source_label_safe}]"]
                     
                     if section_title and section_title != source_label:
                         section_title_safe = str(section_title)[:100]  # Cap at 100 chars
-                        sections.append(f"Section: {section_title_safe}")
-                    
-                    # Format narrative text with proper indentation
-                    text = chunk.get('text', '')
-                    if not isinstance(text, str):
-                        text = str(text or "")
+                        lines.append(f"Section: {section_title_safe}")
                     
                     similarity = chunk.get('similarity_score', 0)
                     try:
@@ -742,51 +1121,34 @@ def assemble_context(
                     except (ValueError, TypeError):
                         similarity = 0.0
                     
-                    sections.append(f"Relevance Score: {similarity:.3f}")
-                    
                     # DEFENSIVE: Cap individual chunk text at 800 chars (Area #4 safeguard)
-                    text_capped = text[:800]
-                    sections.append("\n" + "```")
-                    sections.append(text_capped)
+                    lines.append("\n" + "```")
+                    lines.append(text[:800])
                     if len(text) > 800:
-                        sections.append("...[truncated]")
-                    sections.append("```\n")
+                        lines.append("...[truncated]")
+                    lines.append("```")
+                    lines.append("</chunk>")
                     
-                    total_narrative_length += len(text_capped)
-                    narrative_count += 1
+                    blocks.append((chunk_id, similarity, lines))
                     
                 except Exception as chunk_exc:
                     logger.warning(f"Error processing narrative chunk: {chunk_exc}")
                     continue
+        
+        # DEFENSIVE: Cap total narrative size by tokens, dropping the lowest-value blocks
+        if narrative_token_budget is not None:
+            blocks = _fit_token_budget(blocks, narrative_token_budget)
+        
+        relevance_scores = []
+        for chunk_id, similarity, lines in blocks:
+            sections.extend(lines)
+            relevance_scores.append(f"{chunk_id}={similarity:.3f}")
+        
+        # Scores vary per query, so they follow the chunks instead of sitting inside them
+        if relevance_scores:
+            sections.append(f"\nRelevance Scores: {', '.join(relevance_scores)}")
     
-    # Instructions section
-    sections.append("\n" + "=" * 70)
-    sections.append("ANALYSIS INSTRUCTIONS")
-    sections.append("=" * 70)
-    sections.append("""
-You are a financial research agent. Analyze the provided data and respond to the query.
-
-REQUIREMENTS:
-1. Ground all claims in the provided metrics or citations
-2. Use [Source: ...] labels to cite where each insight originates
-3. Compare numeric data with narrative insights where relevant
-4. Identify any contradictions between quantitative metrics and qualitative commentary
-5. Provide both bull and bear perspectives when appropriate
-6. Quantify risks and opportunities with specific metrics
-7. Flag any data inconsistencies or missing information
-
-FORMATTING:
-- Use bullet points for key findings
-- Bold important figures and quotes
-- Structure analysis: Summary → Key Metrics → Narrative Insights → Risks → Conclusions
-    """)
-    
-    if include_contradiction_check:
-        sections.append("""\nCONTRADICTION DETECTION:
-If any earnings commentary contradicts the financial metrics (e.g., management
-claims "strong growth" but metrics show declining revenue), highlight this explicitly.
-Example: "[ALERT] Management stated 'record Q4 performance' but YoY revenue declined 3%"
-    """)
+    sections.append(f"\nQuery: {query}\n")
     
     return "\n".join(sections)
     
@@ -158,12 +158,13 @@ def init_schema():
         return False
 
 
-def insert_financial_metrics(data: list[dict]) -> int:
+def insert_financial_metrics(data: list[dict], commit_every: int = 1000) -> int:
     """
     Batch insert financial metrics into PostgreSQL
     
     Args:
         data: List of financial metric dicts
+        commit_every: Rows per INSERT page; each page is committed separately
         
     Returns:
         Number of rows inserted
@@ -171,33 +172,38 @@ def insert_financial_metrics(data: list[dict]) -> int:
     if not data:
         return 0
     
+    commit_every = max(commit_every, 1)
+    rows_inserted = 0
+    
     try:
         with psycopg2.connect(settings.database_url) as conn:
             with conn.cursor() as cur:
                 # Extract column names from first record
                 columns = list(data[0].keys())
-                placeholders = ','.join(['%s'] * len(columns))
                 column_names = ','.join(columns)
                 
                 query = f"""
                     INSERT INTO financial_metrics ({column_names})
-                    VALUES ({placeholders})
+                    VALUES %s
                     ON CONFLICT (company, year) DO UPDATE SET
                     updated_at = CURRENT_TIMESTAMP,
                     {', '.join([f'{col} = EXCLUDED.{col}' for col in columns if col not in ['company', 'year']])}
                 """
                 
-                # Batch insert all records at once for performance
-                values_list = [tuple(record.get(col) for col in columns) for record in data]
-                rows_inserted = execute_values(cur, query, values_list, page_size=1000)
-                conn.commit()
+                # Batch insert in pages, committing each so large loads make progress
+                for offset in range(0, len(data), commit_every):
+                    page = data[offset:offset + commit_every]
+                    values_list = [tuple(record.get(col) for col in columns) for record in page]
+                    execute_values(cur, query, values_list, page_size=commit_every)
+                    conn.commit()
+                    rows_inserted += len(values_list)
         
         logger.info("Inserted %d financial metric records", rows_inserted)
         return rows_inserted
         
     except Exception as exc:
         logger.error("Failed to insert financial metrics: %s", exc)
-        return 0
+        return rows_inserted
 
 
 def get_financial_metrics(
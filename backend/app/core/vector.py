@@ -1,5 +1,16 @@
-from typing import Optional, Dict, List, Any
-from qdrant_client import QdrantClient
+import functools
+import inspect
+import json
+from functools import lru_cache
+from typing import Callable, Optional, Dict, List, Any, Union
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from app.config import settings
 from app.utils.helpers import get_logger
@@ -7,12 +18,133 @@ from app.utils.helpers import get_logger
 logger = get_logger(__name__)
 
 
+def _orjson_json(response):
+    """Make this response's .json() decode with orjson; other responses are untouched"""
+    def decode(**kwargs):
+        if kwargs:
+            return json.loads(response.content, **kwargs)
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            # stdlib accepts NaN/Infinity and arbitrarily large ints; orjson does not
+            return json.loads(response.content)
+    
+    response.json = decode
+    return response
+
+
+def install_orjson_codec(client: Union[QdrantClient, AsyncQdrantClient]) -> bool:
+    """
+    Decode one Qdrant client's HTTP (REST) responses with orjson.
+    
+    Installed as middleware on that client's own API client, so other httpx
+    users (Groq, the SEC fetcher, test clients) keep the stdlib decoder.
+    Only matters when gRPC is not in use.
+    
+    Returns:
+        True if installed, False if orjson or the middleware hook is unavailable
+    """
+    if orjson is None:
+        return False
+    try:
+        api_client = client.http.client
+        if inspect.iscoroutinefunction(api_client.send):
+            async def middleware(request, call_next):
+                return _orjson_json(await call_next(request))
+        else:
+            def middleware(request, call_next):
+                return _orjson_json(call_next(request))
+        api_client.add_middleware(middleware)
+    except Exception as exc:
+        logger.debug(f"orjson codec not installed, qdrant-client uses stdlib json: {exc}")
+        return False
+    return True
+
+
 def get_qdrant_client() -> QdrantClient:
     """Get Qdrant client, raises error if QDRANT_URL not configured"""
     if not settings.qdrant_url:
         logger.error("QDRANT_URL not configured - Qdrant features unavailable")
         raise ValueError("QDRANT_URL environment variable not set")
-    return QdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key or None)
+    client = QdrantClient(
+        url=settings.qdrant_url,
+        api_key=settings.qdrant_api_key or None,
+        prefer_grpc=settings.qdrant_prefer_grpc,
+    )
+    install_orjson_codec(client)
+    return client
+
+
+@lru_cache(maxsize=1)
+def get_async_qdrant_client() -> AsyncQdrantClient:
+    """Get shared async Qdrant client, raises error if QDRANT_URL not configured"""
+    if not settings.qdrant_url:
+        logger.error("QDRANT_URL not configured - Qdrant features unavailable")
+        raise ValueError("QDRANT_URL environment variable not set")
+    client = AsyncQdrantClient(
+        url=settings.qdrant_url,
+        api_key=settings.qdrant_api_key or None,
+        prefer_grpc=settings.qdrant_prefer_grpc,
+    )
+    install_orjson_codec(client)
+    return client
+
+
+@lru_cache(maxsize=1)
+def _cached_client() -> QdrantClient:
+    """Shared sync client for hot search paths"""
+    return get_qdrant_client()
+
+
+# Collections confirmed to exist; missing ones are re-checked on every call
+_known_collections: set[str] = set()
+
+
+def _collection_exists(client: QdrantClient, collection_name: str) -> bool:
+    if collection_name in _known_collections:
+        return True
+    try:
+        collection_info = client.get_collection(collection_name)
+        logger.debug(f"Found collection '{collection_name}' ({collection_info.points_count} points)")
+    except Exception:
+        return False
+    _known_collections.add(collection_name)
+    return True
+
+
+def require_qdrant(collection_name_arg: str = "collection_name") -> Callable:
+    """
+    Resolve the shared Qdrant client and verify the target collection once.
+    
+    The wrapped function receives the client as its first argument. If Qdrant is
+    unavailable or the collection is missing, returns an empty list instead of
+    calling it (graceful degradation).
+    """
+    def deco(fn: Callable) -> Callable:
+        sig = inspect.signature(fn)
+        
+        @functools.wraps(fn)
+        def wrapped(*args, **kwargs):
+            try:
+                client = _cached_client()
+            except ValueError as exc:
+                logger.warning(f"Qdrant unavailable: {exc}")
+                return []
+            except Exception as exc:
+                logger.error(f"Qdrant client failed: {exc}")
+                return []
+            
+            bound = sig.bind(client, *args, **kwargs)
+            bound.apply_defaults()
+            collection_name = bound.arguments[collection_name_arg]
+            if not _collection_exists(client, collection_name):
+                logger.warning(f"Collection '{collection_name}' not found - narrative search unavailable")
+                return []
+            
+            return fn(*bound.args, **bound.kwargs)
+        
+        return wrapped
+    return deco
 
 
 def test_qdrant_connection() -> bool:
@@ -26,8 +158,56 @@ def test_qdrant_connection() -> bool:
         return False
 
 
+def _as_vector(query_embedding: Union[List[float], np.ndarray]) -> np.ndarray:
+    """Return the embedding as a contiguous float32 array (no copy if it already is one)"""
+    return np.ascontiguousarray(query_embedding, dtype=np.float32)
+
+
+def _format_search_results(
+    search_results: List[Any],
+    tickers: Optional[List[str]],
+    years: Optional[List[int]],
+    doc_types: Optional[List[str]]
+) -> List[Dict[str, Any]]:
+    """Post-filter scored points and convert them to narrative chunk dicts"""
+    # Normalize filters once so each result is a set lookup
+    tickers_u = frozenset(t.upper() for t in tickers) if tickers else None
+    years_s = frozenset(years) if years else None
+    doc_types_s = frozenset(doc_types) if doc_types else None
+    
+    results = []
+    for result in search_results:
+        payload = result.payload or {}
+        
+        # Post-filter by tickers, years, doc_types if specified
+        if tickers_u and payload.get('ticker', '').upper() not in tickers_u:
+            continue
+        if years_s and payload.get('year', 0) not in years_s:
+            continue
+        if doc_types_s and payload.get('doc_type', 'unknown') not in doc_types_s:
+            continue
+        
+        results.append({
+            'point_id': result.id,
+            'text': payload.get('summary', '')[:500],  # First 500 chars as preview
+            'metadata': {
+                'company': payload.get('company', 'Unknown'),
+                'ticker': payload.get('ticker', 'Unknown'),
+                'year': payload.get('year', 0),
+                'doc_type': payload.get('doc_type', 'unknown'),
+                'section_title': payload.get('section_title', ''),
+                'chunk_id': payload.get('chunk_id', 0),
+            },
+            'similarity_score': result.score or 0.0
+        })
+    
+    return results
+
+
+@require_qdrant()
 def search_narrative(
-    query_embedding: List[float],
+    client: QdrantClient,
+    query_embedding: Union[List[float], np.ndarray],
     collection_name: str = "financial_narratives",
     tickers: Optional[List[str]] = None,
     years: Optional[List[int]] = None,
@@ -43,7 +223,9 @@ def search_narrative(
     Gracefully returns empty list if Qdrant unavailable or collection missing.
     
     Args:
-        query_embedding: Vector embedding of user query (e.g., from embed_text)
+        client: Qdrant client, injected by @require_qdrant
+        query_embedding: Vector embedding of user query (e.g., from embed_text);
+            lists are converted once to a contiguous float32 array
         collection_name: Qdrant collection to search (default: financial_narratives)
         tickers: Filter by stock tickers (e.g., ['AAPL', 'MSFT'])
         years: Filter by fiscal years (e.g., [2025, 2024])
@@ -58,29 +240,13 @@ def search_narrative(
         - metadata: Dict with company, ticker, year, doc_type, section_title
         - similarity_score: Cosine similarity score (0.0-1.0)
     """
-    # DEFENSIVE: Sanitize parameters
+    # DEFENSIVE: Sanitize parameters (client/collection checked by @require_qdrant)
+    query_embedding = _as_vector(query_embedding)
     top_k = min(max(top_k, 1), 10)  # Cap between 1 and 10
-    score_threshold = max(0.0, min(score_threshold, 1.0))  # Clamp 0-1
+    if not 0.0 <= score_threshold <= 1.0:
+        score_threshold = max(0.0, min(score_threshold, 1.0))  # Clamp 0-1
     
-    # DEFENSIVE: Handle Qdrant unavailability gracefully
     try:
-        client = get_qdrant_client()
-    except ValueError as exc:
-        logger.warning(f"Qdrant unavailable: {exc}")
-        return []
-    except Exception as exc:
-        logger.error(f"Qdrant client failed: {exc}")
-        return []
-    
-    try:
-        # DEFENSIVE: Verify collection exists before search
-        try:
-            collection_info = client.get_collection(collection_name)
-            logger.debug(f"Searching collection '{collection_name}' ({collection_info.points_count} points)")
-        except Exception as exc:
-            logger.warning(f"Collection '{collection_name}' not found - narrative search unavailable")
-            return []
-        
         # Build query filter - simplified to avoid Qdrant API complexity
         # In production, these filters should be indexed in Qdrant for performance
         filters = None
@@ -116,32 +282,7 @@ def search_narrative(
             logger.warning(f"Narrative search failed: {search_exc}")
             return []
         
-        # Format results with post-filtering
-        results = []
-        for result in search_results:
-            payload = result.payload or {}
-            
-            # Post-filter by tickers, years, doc_types if specified
-            if tickers and payload.get('ticker', '').upper() not in [t.upper() for t in tickers]:
-                continue
-            if years and payload.get('year', 0) not in years:
-                continue
-            if doc_types and payload.get('doc_type', 'unknown') not in doc_types:
-                continue
-            
-            results.append({
-                'point_id': result.id,
-                'text': payload.get('summary', '')[:500],  # First 500 chars as preview
-                'metadata': {
-                    'company': payload.get('company', 'Unknown'),
-                    'ticker': payload.get('ticker', 'Unknown'),
-                    'year': payload.get('year', 0),
-                    'doc_type': payload.get('doc_type', 'unknown'),
-                    'section_title': payload.get('section_title', ''),
-                    'chunk_id': payload.get('chunk_id', 0),
-                },
-                'similarity_score': result.score or 0.0
-            })
+        results = _format_search_results(search_results, tickers, years, doc_types)
         
         logger.debug(f"Found {len(results)} narrative chunks for query (post-filtered)")
         return results
@@ -149,3 +290,133 @@ def search_narrative(
     except Exception as exc:
         logger.error(f"Narrative search failed: {exc}")
         return []
+
+
+@require_qdrant()
+def search_narrative_batch(
+    client: QdrantClient,
+    query_embeddings: List[Union[List[float], np.ndarray]],
+    collection_name: str = "financial_narratives",
+    tickers: Optional[List[str]] = None,
+    years: Optional[List[int]] = None,
+    doc_types: Optional[List[str]] = None,
+    top_k: int = 5,
+    score_threshold: float = 0.5
+) -> List[List[Dict[str, Any]]]:
+    """
+    Run several narrative searches in one Qdrant batch request.
+    
+    Same filters, caps and result shape as search_narrative, applied to every
+    query embedding. Returns one result list per embedding, in order, or an
+    empty list (not one per embedding) if Qdrant is unavailable.
+    """
+    if not query_embeddings:
+        return []
+    
+    vectors = [_as_vector(embedding).tolist() for embedding in query_embeddings]
+    top_k = min(max(top_k, 1), 10)  # Cap between 1 and 10
+    score_threshold = max(0.0, min(score_threshold, 1.0))  # Clamp 0-1
+    
+    try:
+        if hasattr(client, 'search_batch'):
+            from qdrant_client.models import SearchRequest
+            
+            point_lists = client.search_batch(
+                collection_name=collection_name,
+                requests=[
+                    SearchRequest(
+                        vector=vector, limit=top_k, score_threshold=score_threshold, with_payload=True
+                    )
+                    for vector in vectors
+                ]
+            )
+        else:
+            # qdrant-client >= 1.13 only exposes the universal query API
+            from qdrant_client.models import QueryRequest
+            
+            responses = client.query_batch_points(
+                collection_name=collection_name,
+                requests=[
+                    QueryRequest(
+                        query=vector, limit=top_k, score_threshold=score_threshold, with_payload=True
+                    )
+                    for vector in vectors
+                ]
+            )
+            point_lists = [response.points for response in responses]
+    except Exception as exc:
+        logger.warning(f"Batch narrative search failed: {exc}")
+        return [[] for _ in vectors]
+    
+    results = [_format_search_results(points, tickers, years, doc_types) for points in point_lists]
+    logger.debug(f"Batch narrative search: {sum(map(len, results))} chunks for {len(vectors)} queries")
+    return results
+
+
+async def asearch_narrative(
+    query_embedding: Union[List[float], np.ndarray],
+    collection_name: str = "financial_narratives",
+    tickers: Optional[List[str]] = None,
+    years: Optional[List[int]] = None,
+    doc_types: Optional[List[str]] = None,
+    top_k: int = 5,
+    score_threshold: float = 0.5
+) -> List[Dict[str, Any]]:
+    """
+    Async variant of search_narrative using AsyncQdrantClient.
+    
+    Does not block the event loop, so several narrative searches can run
+    concurrently, e.g. asyncio.gather(*[asearch_narrative(e) for e in embeddings]).
+    Same arguments, return shape and graceful degradation as search_narrative.
+    """
+    # DEFENSIVE: Sanitize parameters
+    query_embedding = _as_vector(query_embedding)
+    top_k = min(max(top_k, 1), 10)  # Cap between 1 and 10
+    score_threshold = max(0.0, min(score_threshold, 1.0))  # Clamp 0-1
+    
+    # DEFENSIVE: Handle Qdrant unavailability gracefully
+    try:
+        client = get_async_qdrant_client()
+    except ValueError as exc:
+        logger.warning(f"Qdrant unavailable: {exc}")
+        return []
+    except Exception as exc:
+        logger.error(f"Async Qdrant client failed: {exc}")
+        return []
+    
+    try:
+        # DEFENSIVE: Verify collection exists before search
+        try:
+            await client.get_collection(collection_name)
+        except Exception:
+            logger.warning(f"Collection '{collection_name}' not found - narrative search unavailable")
+            return []
+        
+        try:
+            if hasattr(client, 'search'):
+                search_results = await client.search(
+                    collection_name=collection_name,
+                    query_vector=query_embedding,
+                    limit=top_k,
+                    score_threshold=score_threshold
+                )
+            else:
+                # qdrant-client >= 1.13 only exposes the universal query API
+                search_result = await client.query_points(
+                    collection_name=collection_name,
+                    query=query_embedding,
+                    limit=top_k,
+                    score_threshold=score_threshold
+                )
+                search_results = search_result.points
+        except Exception as search_exc:
+            logger.warning(f"Async narrative search failed: {search_exc}")
+            return []
+        
+        results = _format_search_results(search_results, tickers, years, doc_types)
+        logger.debug(f"Found {len(results)} narrative chunks for query (async, post-filtered)")
+        return results
+        
+    except Exception as exc:
+        logger.error(f"Async narrative search failed: {exc}")
+        return []
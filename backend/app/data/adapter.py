@@ -3,20 +3,146 @@ Data Adapter Module
 Converts raw pipeline outputs (CSVs) into structured data for AI agent
 Bridges SEC EDGAR pipeline → PostgreSQL (numeric) + Qdrant (narrative)
 """
+import itertools
 import os
+import re
+import threading
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Union
 from datetime import datetime
-from uuid import uuid4
 
 from app.config import DATA_OUTPUT_DIR, settings
 from app.core.schema import insert_financial_metrics, register_narrative_document
 from app.core.vector import get_qdrant_client
 from app.utils.helpers import get_logger
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 logger = get_logger(__name__)
 
+# Points per Qdrant upsert request when storing a document's chunks
+QDRANT_UPSERT_BATCH = 256
+
+# Point IDs are a per-process random 62-bit base plus a counter: one urandom
+# read per process rather than per point. Two runs only collide if their
+# bases land within a run's point count of each other (~N / 2**61), the same
+# practical uniqueness as the random 63-bit IDs this replaced.
+_id_counter = itertools.count(int.from_bytes(os.urandom(8), 'big') >> 2)
+_id_lock = threading.Lock()
+
+
+def _next_point_id() -> int:
+    """Allocate the next unique, non-negative 63-bit Qdrant point ID"""
+    with _id_lock:
+        return next(_id_counter)
+
+
+def _row_to_metric_record(row, ticker: str, company: str, cik: int, source_file: str) -> dict:
+    """Convert one annual CSV row into a financial_metrics record dict"""
+    return {
+        'company': company,
+        'ticker': ticker,
+        'cik': cik,
+        'year': int(row.get('fy')) if pd.notna(row.get('fy')) else None,
+        
+        # Base metrics (convert from scientific notation to plain floats)
+        'revenue': float(row.get('Revenue')) if pd.notna(row.get('Revenue')) else None,
+        'net_income': float(row.get('NetIncome')) if pd.notna(row.get('NetIncome')) else None,
+        'gross_profit': float(row.get('GrossProfit')) if pd.notna(row.get('GrossProfit')) else None,
+        'operating_income': float(row.get('OperatingIncome')) if pd.notna(row.get('OperatingIncome')) else None,
+        'operating_cashflow': float(row.get('OperatingCashFlow')) if pd.notna(row.get('OperatingCashFlow')) else None,
+        'capex': float(row.get('Capex')) if pd.notna(row.get('Capex')) else None,
+        'free_cashflow': float(row.get('CalculatedFCF')) if pd.notna(row.get('CalculatedFCF')) else None,
+        
+        # Balance sheet
+        'assets': float(row.get('Assets')) if pd.notna(row.get('Assets')) else None,
+        'current_assets': float(row.get('CurrentAssets')) if pd.notna(row.get('CurrentAssets')) else None,
+        'liabilities': float(row.get('Liabilities')) if pd.notna(row.get('Liabilities')) else None,
+        'current_liabilities': float(row.get('CurrentLiabilities')) if pd.notna(row.get('CurrentLiabilities')) else None,
+        'equity': float(row.get('Equity')) if pd.notna(row.get('Equity')) else None,
+        'long_term_debt': float(row.get('LongTermDebt')) if pd.notna(row.get('LongTermDebt')) else None,
+        'cash': float(row.get('Cash')) if pd.notna(row.get('Cash')) else None,
+        
+        # Calculated ratios (already in %)
+        'profit_margin_pct': float(row.get('ProfitMargin')) if pd.notna(row.get('ProfitMargin')) else None,
+        'gross_margin_pct': float(row.get('GrossMargin')) if pd.notna(row.get('GrossMargin')) else None,
+        'roe_pct': float(row.get('ROE')) if pd.notna(row.get('ROE')) else None,
+        'roa_pct': float(row.get('ROA')) if pd.notna(row.get('ROA')) else None,
+        'current_ratio': float(row.get('CurrentRatio')) if pd.notna(row.get('CurrentRatio')) else None,
+        'debt_to_equity': float(row.get('DebtToEquity')) if pd.notna(row.get('DebtToEquity')) else None,
+        
+        # Growth rates (already in %)
+        'revenue_growth_pct': float(row.get('Revenue_YoY_%')) if pd.notna(row.get('Revenue_YoY_%')) else None,
+        'net_income_growth_pct': float(row.get('NetIncome_YoY_%')) if pd.notna(row.get('NetIncome_YoY_%')) else None,
+        'assets_growth_pct': float(row.get('Assets_YoY_%')) if pd.notna(row.get('Assets_YoY_%')) else None,
+        
+        # Source
+        'source_file': source_file,
+        'fiscal_year_end': pd.to_datetime(row.get('end')) if pd.notna(row.get('end')) else None,
+    }
+
+
+def _iter_annual_frames(path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Read an annual CSV or Parquet file in chunks of at most chunksize rows"""
+    if str(path).endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def iter_annual_csv_metrics(
+    csv_path: str,
+    ticker: str,
+    company: str,
+    cik: int,
+    chunksize: int = 1024
+) -> Iterator[list[dict]]:
+    """
+    Stream company annual CSV rows as batches of financial metric records.
+    
+    Reads the CSV in fixed-size chunks so peak memory is bounded by the chunk
+    rather than the file. Rows without a valid fiscal year are skipped.
+    A .parquet path is read in row batches the same way.
+    
+    Args:
+        csv_path: Path to {TICKER}_annual.csv (or .parquet) from bulk_download directory
+        ticker: Stock ticker symbol (e.g., 'AAPL')
+        company: Full company name
+        cik: SEC Central Index Key identifier
+        chunksize: Rows per CSV chunk (default 1024)
+        
+    Yields:
+        Lists of metric record dicts, one list per non-empty chunk
+    """
+    source_file = os.path.basename(csv_path)
+    total = 0
+    
+    try:
+        for chunk_df in _iter_annual_frames(csv_path, chunksize):
+            records = []
+            for _, row in chunk_df.iterrows():
+                record = _row_to_metric_record(row, ticker, company, cik, source_file)
+                
+                # Only add record if it has a valid year
+                if record['year'] is not None:
+                    records.append(record)
+            
+            if records:
+                total += len(records)
+                yield records
+        
+        logger.info(f"Loaded {total} metric records from {csv_path}")
+        
+    except Exception as exc:
+        logger.error(f"Failed to load CSV {csv_path}: {exc}")
+
 
 def load_annual_csv_to_metrics(csv_path: str, ticker: str, company: str, cik: int) -> list[dict]:
     """
@@ -37,69 +163,16 @@ def load_annual_csv_to_metrics(csv_path: str, ticker: str, company: str, cik: in
     Returns:
         List of metric record dicts with validated values ready for PostgreSQL insertion
     """
-    try:
-        df = pd.read_csv(csv_path)
-        
-        records = []
-        for _, row in df.iterrows():
-            # Extract metric columns (skip date/form/period columns)
-            record = {
-                'company': company,
-                'ticker': ticker,
-                'cik': cik,
-                'year': int(row.get('fy')) if pd.notna(row.get('fy')) else None,
-                
-                # Base metrics (convert from scientific notation to plain floats)
-                'revenue': float(row.get('Revenue')) if pd.notna(row.get('Revenue')) else None,
-                'net_income': float(row.get('NetIncome')) if pd.notna(row.get('NetIncome')) else None,
-                'gross_profit': float(row.get('GrossProfit')) if pd.notna(row.get('GrossProfit')) else None,
-                'operating_income': float(row.get('OperatingIncome')) if pd.notna(row.get('OperatingIncome')) else None,
-                'operating_cashflow': float(row.get('OperatingCashFlow')) if pd.notna(row.get('OperatingCashFlow')) else None,
-                'capex': float(row.get('Capex')) if pd.notna(row.get('Capex')) else None,
-                'free_cashflow': float(row.get('CalculatedFCF')) if pd.notna(row.get('CalculatedFCF')) else None,
-                
-                # Balance sheet
-                'assets': float(row.get('Assets')) if pd.notna(row.get('Assets')) else None,
-                'current_assets': float(row.get('CurrentAssets')) if pd.notna(row.get('CurrentAssets')) else None,
-                'liabilities': float(row.get('Liabilities')) if pd.notna(row.get('Liabilities')) else None,
-                'current_liabilities': float(row.get('CurrentLiabilities')) if pd.notna(row.get('CurrentLiabilities')) else None,
-                'equity': float(row.get('Equity')) if pd.notna(row.get('Equity')) else None,
-                'long_term_debt': float(row.get('LongTermDebt')) if pd.notna(row.get('LongTermDebt')) else None,
-                'cash': float(row.get('Cash')) if pd.notna(row.get('Cash')) else None,
-                
-                # Calculated ratios (already in %)
-                'profit_margin_pct': float(row.get('ProfitMargin')) if pd.notna(row.get('ProfitMargin')) else None,
-                'gross_margin_pct': float(row.get('GrossMargin')) if pd.notna(row.get('GrossMargin')) else None,
-                'roe_pct': float(row.get('ROE')) if pd.notna(row.get('ROE')) else None,
-                'roa_pct': float(row.get('ROA')) if pd.notna(row.get('ROA')) else None,
-                'current_ratio': float(row.get('CurrentRatio')) if pd.notna(row.get('CurrentRatio')) else None,
-                'debt_to_equity': float(row.get('DebtToEquity')) if pd.notna(row.get('DebtToEquity')) else None,
-                
-                # Growth rates (already in %)
-                'revenue_growth_pct': float(row.get('Revenue_YoY_%')) if pd.notna(row.get('Revenue_YoY_%')) else None,
-                'net_income_growth_pct': float(row.get('NetIncome_YoY_%')) if pd.notna(row.get('NetIncome_YoY_%')) else None,
-                'assets_growth_pct': float(row.get('Assets_YoY_%')) if pd.notna(row.get('Assets_YoY_%')) else None,
-                
-                # Source
-                'source_file': os.path.basename(csv_path),
-                'fiscal_year_end': pd.to_datetime(row.get('end')) if pd.notna(row.get('end')) else None,
-            }
-            
-            # Only add record if it has a valid year
-            if record['year'] is not None:
-                records.append(record)
-        
-        logger.info(f"Loaded {len(records)} metric records from {csv_path}")
-        return records
-        
-    except Exception as exc:
-        logger.error(f"Failed to load CSV {csv_path}: {exc}")
-        return []
+    records = []
+    for batch in iter_annual_csv_metrics(csv_path, ticker, company, cik):
+        records.extend(batch)
+    return records
 
 
 def ingest_bulk_download_data(
     bulk_download_dir: Optional[str] = None,
-    tickers: Optional[list] = None
+    tickers: Optional[list] = None,
+    file_format: str = 'csv'
 ) -> dict:
     """
     Ingest all annual CSV files from bulk_download directory into PostgreSQL
@@ -107,6 +180,7 @@ def ingest_bulk_download_data(
     Args:
         bulk_download_dir: Override default bulk_download directory path
         tickers: Filter to specific tickers (e.g., ['AAPL', 'MSFT'])
+        file_format: Annual file format written by bulk_download ('csv' or 'parquet')
         
     Returns:
         Summary dict with ingestion stats
@@ -134,8 +208,8 @@ def ingest_bulk_download_data(
             for _, row in summary_df.iterrows()
         }
     
-    # Find and ingest all annual CSVs
-    for csv_file in sorted(bulk_dir.glob('*_annual.csv')):
+    # Find and ingest all annual files
+    for csv_file in sorted(bulk_dir.glob(f'*_annual.{file_format}')):
         ticker = csv_file.stem.split('_')[0]
         
         # Skip if not in filter list
@@ -146,70 +220,120 @@ def ingest_bulk_download_data(
         company = metadata.get('company', ticker)
         cik = metadata.get('cik', 0)
         
-        # Load and convert CSV
-        records = load_annual_csv_to_metrics(str(csv_file), ticker, company, cik)
-        
-        # Insert into PostgreSQL
-        if records:
-            inserted = insert_financial_metrics(records)
-            summary['companies'][ticker] = {
-                'file': csv_file.name,
-                'records_loaded': len(records),
-                'records_inserted': inserted,
-                'success': inserted > 0
-            }
+        # Stream file chunks into PostgreSQL so parsing overlaps with inserts
+        loaded = 0
+        inserted = 0
+        for records in iter_annual_csv_metrics(str(csv_file), ticker, company, cik, chunksize=1024):
+            loaded += len(records)
+            inserted += insert_financial_metrics(records, commit_every=1024)
+        
+        summary['companies'][ticker] = {
+            'file': csv_file.name,
+            'records_loaded': loaded,
+            'records_inserted': inserted,
+            'success': inserted > 0
+        }
+        if loaded:
             logger.info(f"Ingested {inserted} records for {ticker}")
-        else:
-            summary['companies'][ticker] = {
-                'file': csv_file.name,
-                'records_loaded': 0,
-                'records_inserted': 0,
-                'success': False
-            }
     
     return summary
 
 
-def chunk_text(text: str, chunk_size: int = 500, overlap: int = 100) -> list[str]:
+_WORD_RE = re.compile(r'\S+')
+
+# str.isspace() per byte value; bytes >= 0x80 are never ASCII whitespace, and
+# multi-byte UTF-8 sequences only contain such bytes
+_ASCII_SPACE = np.array([i < 0x80 and chr(i).isspace() for i in range(256)])
+
+# Unicode whitespace outside ASCII (e.g. NBSP); texts containing it take the regex path
+_NON_ASCII_SPACE_RE = re.compile(r'[^\S\x00-\x7f]')
+
+
+def _emit_chunks(spans: np.ndarray, chunk_size: int, overlap: int) -> np.ndarray:
+    """
+    Compute chunk boundaries over word spans.
+    
+    Args:
+        spans: (N, 2) int64 array of word (start, end) text offsets
+        chunk_size: Words per chunk
+        overlap: Word overlap between consecutive chunks
+        
+    Returns:
+        (M, 2) int64 array of chunk (start, end) text offsets
+    """
+    n = spans.shape[0]
+    out = np.empty((n, 2), dtype=np.int64)
+    m = 0
+    i = 0
+    while i < n:
+        end = min(i + chunk_size, n)
+        out[m, 0] = spans[i, 0]
+        out[m, 1] = spans[end - 1, 1]
+        m += 1
+        
+        # Move forward with overlap
+        i = end - overlap if end - overlap > i else end
+    
+    return out[:m]
+
+
+if njit is not None:
+    _emit_chunks = njit(cache=True, nogil=True)(_emit_chunks)
+
+
+def chunk_text(text: Union[str, bytes], chunk_size: int = 500, overlap: int = 100) -> list[str]:
     """
     Split narrative text into overlapping chunks for embedding and vector storage.
     
     Creates semantic chunks suitable for embedding models (e.g., sentence-transformers).
     Overlapping chunks improve retrieval quality by preserving context at chunk boundaries.
     Uses word-based tokenization (approximate); for precise token counting use tiktoken.
+    Word spans are found with a NumPy scan over the UTF-8 bytes; chunk boundaries
+    are then computed by _emit_chunks, which is
+    JIT-compiled with numba when available.
     
     Args:
-        text: Full narrative text to chunk (e.g., 10-K filing, earnings call transcript)
+        text: Full narrative text to chunk (e.g., 10-K filing, earnings call transcript),
+            as str or UTF-8 bytes; ASCII bytes are scanned without re-encoding
         chunk_size: Target words per chunk (default 500 ~= 1500 tokens for business text)
         overlap: Word overlap between consecutive chunks (default 100 ~= 300 tokens)
         
     Returns:
         List of overlapping text chunks, or empty list if text too short (<50 chars)
     """
+    data = None
+    if isinstance(text, bytes):
+        # Byte and character offsets only coincide for ASCII
+        if text.isascii():
+            data = text
+        else:
+            text = text.decode('utf-8')
+    
     if not text or len(text.strip()) < 50:
         return []
     
-    # Simple tokenization by splitting on sentences/words
-    # For production, use tiktoken or similar
-    words = text.split()
-    chunks = []
-    i = 0
+    chunk_size = max(chunk_size, 1)
     
-    while i < len(words):
-        end = min(i + chunk_size, len(words))
-        chunk = ' '.join(words[i:end])
-        chunks.append(chunk)
-        
-        # Move forward with overlap
-        i = end - overlap if end - overlap > i else end
-        
-        if i >= len(words):
-            break
+    if data is None:
+        if _NON_ASCII_SPACE_RE.search(text) is not None:
+            # Rare: whitespace the byte table cannot see, tokenize on the str
+            spans = np.array(
+                [m.span() for m in _WORD_RE.finditer(text)], dtype=np.int64
+            ).reshape(-1, 2)
+            bounds = _emit_chunks(spans, chunk_size, overlap)
+            return [' '.join(text[start:end].split()) for start, end in bounds.tolist()]
+        data = text.encode('utf-8')
     
-    return chunks
-
-
-
+    # Word spans over the UTF-8 bytes: a word starts where whitespace ends
+    is_word = ~_ASCII_SPACE[np.frombuffer(data, dtype=np.uint8)]
+    edges = np.diff(is_word.view(np.int8), prepend=0, append=0)
+    spans = np.stack([np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)], axis=1)
+    bounds = _emit_chunks(spans.astype(np.int64, copy=False), chunk_size, overlap)
+    
+    # Decode each window straight from the buffer; boundaries fall on ASCII
+    # whitespace so they never split a multi-byte character
+    view = memoryview(data)
+    return [' '.join(str(view[start:end], 'utf-8').split()) for start, end in bounds.tolist()]
 
 
 def create_qdrant_collection_if_needed(collection_name: str = "financial_narratives") -> bool:
@@ -289,7 +413,7 @@ def embed_and_store_narrative(
         
         # Store in Qdrant
         client = get_qdrant_client()
-        point_id = int(uuid4().int % (2**63))  # Generate unique ID using UUID
+        point_id = _next_point_id()
         
         payload = {
             'company': company,
@@ -329,3 +453,111 @@ def embed_and_store_narrative(
     except Exception as exc:
         logger.error(f"Failed to embed and store narrative: {exc}")
         return None
+
+
+def embed_and_store_narratives(
+    chunks: list[dict],
+    collection_name: str,
+    company: str,
+    ticker: str,
+    year: int,
+    doc_type: str,
+    embeddings_batch_fn,  # Function that takes a list of texts and returns a list of vectors
+    source_file: str = None,
+    source_url: str = None
+) -> list[Optional[int]]:
+    """
+    Batch version of embed_and_store_narrative for one document
+    
+    All chunks are embedded in one model call and written to Qdrant in
+    QDRANT_UPSERT_BATCH-point upserts; each is then registered in PostgreSQL.
+    Only the last upsert waits for indexing: Qdrant applies updates in order,
+    so every point is searchable once it returns.
+    
+    Args:
+        chunks: Dicts with 'text', 'chunk_id', 'total_chunks' and optional 'section_title'
+        collection_name: Qdrant collection name
+        company: Company name
+        ticker: Stock ticker
+        year: Fiscal year
+        doc_type: Type of document (e.g., 'earnings_call', 'risk_factors')
+        embeddings_batch_fn: Function to generate embeddings for a list of texts
+        source_file: Source file name
+        source_url: Source URL if available
+        
+    Returns:
+        PostgreSQL row IDs in chunk order for the upserted chunks (None where
+        registration failed), or an empty list if embedding or the upsert failed
+    """
+    if not chunks:
+        return []
+    
+    try:
+        embeddings = embeddings_batch_fn([chunk['text'] for chunk in chunks])
+        if embeddings is None:
+            logger.error(f"Failed to embed {len(chunks)} narrative chunks for {ticker}")
+            return []
+        
+        from qdrant_client.models import PointStruct
+        
+        point_ids = [_next_point_id() for _ in chunks]
+        points = [
+            PointStruct(
+                id=point_id,
+                vector=embedding,
+                payload={
+                    'company': company,
+                    'ticker': ticker,
+                    'year': year,
+                    'doc_type': doc_type,
+                    'section_title': chunk.get('section_title') or '',
+                    'chunk_id': chunk['chunk_id'],
+                    'summary': chunk['text'][:200],  # First 200 chars as summary
+                },
+            )
+            for chunk, point_id, embedding in zip(chunks, point_ids, embeddings)
+        ]
+        if len(points) < len(chunks):
+            logger.warning(
+                f"Got {len(points)} embeddings for {len(chunks)} narrative chunks; "
+                f"storing only the embedded chunks for {ticker}"
+            )
+        
+        client = get_qdrant_client()
+        for start in range(0, len(points), QDRANT_UPSERT_BATCH):
+            end = start + QDRANT_UPSERT_BATCH
+            client.upsert(
+                collection_name=collection_name,
+                points=points[start:end],
+                wait=end >= len(points),
+            )
+        
+    except Exception as exc:
+        logger.error(f"Failed to embed and store narratives: {exc}")
+        return []
+    
+    # Only chunks that made it into an upserted point are registered
+    db_ids = []
+    for chunk, point in zip(chunks, points):
+        point_id = point.id
+        try:
+            db_ids.append(register_narrative_document(
+                company=company,
+                ticker=ticker,
+                year=year,
+                doc_type=doc_type,
+                qdrant_point_id=point_id,
+                qdrant_collection=collection_name,
+                chunk_id=chunk['chunk_id'],
+                total_chunks=chunk['total_chunks'],
+                section_title=chunk.get('section_title'),
+                summary=chunk['text'][:200],
+                source_file=source_file,
+                source_url=source_url
+            ))
+        except Exception as exc:
+            logger.error(f"Failed to register narrative chunk {chunk['chunk_id']}: {exc}")
+            db_ids.append(None)
+    
+    logger.debug(f"Stored {len(points)} narrative chunks: {doc_type} for {ticker}")
+    return db_ids
@@ -2,9 +2,21 @@
 Earnings Call Data Fetcher
 Downloads and analyzes earnings call transcripts, audio, and slides
 """
+import asyncio
+import functools
+import hashlib
 import json
-from typing import Dict, List, Optional
+import pickle
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
+from pathlib import Path
+
+import numpy as np
 
 try:
     from earningscall import get_company
@@ -12,8 +24,159 @@ except ImportError:
     print("⚠️  earningscall library not installed. Run: pip install earningscall")
     get_company = None
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
 from app.config import DATA_OUTPUT_DIR
 
+# Cache TTLs: past quarters are immutable, the current year may still change
+HISTORICAL_TTL = 90 * 24 * 3600
+CURRENT_TTL = 24 * 3600
+AVAILABLE_CALLS_TTL = 6 * 3600
+
+# Transcripts are written as one blob; a large buffer keeps that to a single write
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _dump_json(data: Dict) -> bytes:
+    """
+    Serialize a dict to indented UTF-8 JSON bytes.
+
+    Uses orjson when installed, falling back to the stdlib encoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=str
+        )
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def fast_word_count(text: str) -> int:
+    """
+    Count whitespace-separated words like len(text.split()) without building the list.
+    
+    ASCII text is scanned as a byte array for word starts; short or non-ASCII
+    text (str.split also splits on Unicode spaces) uses split directly.
+    """
+    if len(text) < 4096 or not text.isascii():
+        return len(text.split())
+    buf = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    # str.split whitespace in ASCII: \t-\r, \x1c-\x1f and space
+    space = (buf == 32) | ((buf >= 9) & (buf <= 13)) | ((buf >= 28) & (buf <= 31))
+    return int(np.count_nonzero(space[:-1] & ~space[1:])) + int(not space[0])
+
+
+def _keyword_regex(keywords: Sequence[str]) -> "re.Pattern":
+    """
+    Compile keywords into one alternation for matching lower-cased text.
+    
+    The lookahead reports a hit at every position, so each keyword is counted
+    as str.count would count it, including inside longer words.
+    """
+    alternation = '|'.join(map(re.escape, sorted(keywords, key=len, reverse=True)))
+    return re.compile(r'(?=(' + alternation + '))')
+
+
+# Keyword groups counted in transcripts
+RISK_KEYWORDS = (
+    'risk', 'concern', 'challenge', 'headwind', 'uncertainty',
+    'pressure', 'difficult', 'weak', 'decline', 'loss',
+)
+POSITIVE_KEYWORDS = (
+    'growth', 'strong', 'increase', 'improve', 'opportunity',
+    'momentum', 'success', 'gain', 'expand', 'optimize',
+)
+METRIC_KEYWORDS = (
+    'revenue', 'margin', 'profit', 'earnings', 'cash flow',
+    'roce', 'roe', 'ebitda', 'guidance', 'outlook',
+)
+# Tone keywords for contradiction reports
+OPTIMISTIC_KEYWORDS = ('strong', 'growth', 'success', 'opportunity', 'excellent')
+CAUTIOUS_KEYWORDS = ('concern', 'risk', 'challenge', 'pressure', 'difficult')
+DEFENSIVE_PHRASES = ('as we mentioned', 'we already discussed', 'to be clear', 'let me clarify')
+
+KEYWORD_GROUPS = {
+    'risk': RISK_KEYWORDS,
+    'positive': POSITIVE_KEYWORDS,
+    'metric': METRIC_KEYWORDS,
+    'optimistic': OPTIMISTIC_KEYWORDS,
+    'cautious': CAUTIOUS_KEYWORDS,
+    'defensive': DEFENSIVE_PHRASES,
+}
+
+
+def _keyword_automaton() -> Optional["ahocorasick.Automaton"]:
+    """
+    Build one Aho-Corasick automaton that scans text for every keyword group.
+    
+    Each keyword maps to (keyword, categories it belongs to).
+    """
+    if ahocorasick is None:
+        return None
+    categories_by_kw: Dict[str, List[str]] = {}
+    for category, keywords in KEYWORD_GROUPS.items():
+        for kw in keywords:
+            categories_by_kw.setdefault(kw, []).append(category)
+    automaton = ahocorasick.Automaton()
+    for kw, categories in categories_by_kw.items():
+        automaton.add_word(kw, (kw, tuple(categories)))
+    automaton.make_automaton()
+    return automaton
+
+
+# Compiled once at import; the regexes are the fallback without pyahocorasick
+KEYWORD_AUTOMATON = _keyword_automaton()
+KEYWORD_RES = {
+    category: _keyword_regex(keywords)
+    for category, keywords in KEYWORD_GROUPS.items()
+}
+
+
+def _scan_keywords(text_lower: str) -> Dict[str, Counter]:
+    """
+    Count keyword hits for every keyword group in one pass over text
+    
+    Args:
+        text_lower: Already lower-cased text
+        
+    Returns:
+        Dict mapping group name to a Counter of keyword -> hits
+    """
+    counts = {category: Counter() for category in KEYWORD_GROUPS}
+    
+    if KEYWORD_AUTOMATON is not None:
+        for _, (kw, categories) in KEYWORD_AUTOMATON.iter(text_lower):
+            for category in categories:
+                counts[category][kw] += 1
+    else:
+        for category, pattern in KEYWORD_RES.items():
+            counts[category].update(pattern.findall(text_lower))
+    
+    return counts
+
+
+@functools.lru_cache(maxsize=8)
+def _section_keyword_counts(prepared: str, qa: str) -> Dict[str, Dict[str, Counter]]:
+    """Keyword group counts per section; results are shared, so callers must not mutate them"""
+    return {
+        'prepared': _scan_keywords(prepared.lower()),
+        'qa': _scan_keywords(qa.lower()),
+    }
+
 
 class EarningsCallFetcher:
     """Fetches earnings call transcripts and audio files"""
@@ -24,10 +187,63 @@ class EarningsCallFetcher:
         self.transcripts_dir = self.earnings_dir / "transcripts"
         self.audio_dir = self.earnings_dir / "audio"
         self.analysis_dir = self.earnings_dir / "analysis"
+        self.cache_dir = self.earnings_dir / "cache"
         
         # Create directories
-        for dir_path in [self.earnings_dir, self.transcripts_dir, self.audio_dir, self.analysis_dir]:
+        for dir_path in [self.earnings_dir, self.transcripts_dir, self.audio_dir, self.analysis_dir, self.cache_dir]:
             dir_path.mkdir(parents=True, exist_ok=True)
+        
+        # One earningscall Company per ticker, shared by every fetch method
+        self._company_cache: Dict[str, Any] = {}
+        self._company_lock = threading.Lock()
+    
+    def _get_company(self, ticker: str):
+        """Return the cached earningscall Company for ticker, creating it on first use"""
+        key = ticker.lower()
+        company = self._company_cache.get(key)
+        if company is None:
+            # Built outside the lock so different tickers can load concurrently
+            company = get_company(key)
+            with self._company_lock:
+                company = self._company_cache.setdefault(key, company)
+        return company
+    
+    def _cache_path(self, key: tuple):
+        digest = hashlib.md5(repr(key).encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{digest}.pkl"
+    
+    def _cache_get(self, key: tuple, ttl: int) -> Optional[Any]:
+        """Return cached data for key if younger than ttl seconds, else None"""
+        path = self._cache_path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except Exception:
+            # Missing or corrupt entries are cache misses
+            return None
+        
+        if not isinstance(entry, dict) or not isinstance(entry.get('ts'), (int, float)):
+            return None
+        if time.time() - entry['ts'] > ttl:
+            return None
+        return entry.get('data')
+    
+    def _cache_put(self, key: tuple, value: Any):
+        """
+        Store data for key with the current timestamp
+        
+        Pickled rather than JSON so cache hits return the same types as a
+        fresh fetch (e.g. transcript dates stay datetime objects).
+        """
+        try:
+            with open(self._cache_path(key), 'wb') as f:
+                pickle.dump({'ts': time.time(), 'data': value}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            print(f"   ⚠️  Could not cache {key}: {e}")
+    
+    @staticmethod
+    def _ttl_for_year(year: int) -> int:
+        return HISTORICAL_TTL if year < datetime.now().year else CURRENT_TTL
     
     def get_transcript(
         self, 
@@ -52,6 +268,24 @@ class EarningsCallFetcher:
         Returns:
             Dictionary with transcript data
         """
+        cached = self._load_transcript(ticker, year, quarter, level)
+        if cached is not None:
+            print(f"\n📦 Using cached {ticker} Q{quarter} {year} transcript")
+            return cached
+        
+        result = self._fetch_transcript(ticker, year, quarter, level)
+        if result is not None:
+            self._save_transcript(result)
+        return result
+    
+    def _fetch_transcript(
+        self,
+        ticker: str,
+        year: int,
+        quarter: int,
+        level: int
+    ) -> Optional[Dict]:
+        """Download a transcript from earningscall without touching disk"""
         if get_company is None:
             print("❌ earningscall library not installed")
             return None
@@ -59,7 +293,7 @@ class EarningsCallFetcher:
         try:
             print(f"\n📞 Fetching {ticker} Q{quarter} {year} earnings call transcript...")
             
-            company = get_company(ticker.lower())
+            company = self._get_company(ticker)
             transcript = company.get_transcript(year=year, quarter=quarter, level=level)
             
             result = {
@@ -77,13 +311,14 @@ class EarningsCallFetcher:
                 
             elif level == 2:
                 # Speaker-separated
-                speakers_data = []
-                for speaker in transcript.speakers:
-                    speakers_data.append({
+                speakers_data = [
+                    {
                         'name': speaker.speaker_info.name,
                         'title': speaker.speaker_info.title,
                         'text': speaker.text
-                    })
+                    }
+                    for speaker in transcript.speakers
+                ]
                 result['speakers'] = speakers_data
                 print(f"   ✅ Retrieved transcript with {len(speakers_data)} speakers")
                 
@@ -96,9 +331,6 @@ class EarningsCallFetcher:
                 print(f"      • Prepared remarks: {len(result['prepared_remarks'])} chars")
                 print(f"      • Q&A section: {len(result['qa_section'])} chars")
             
-            # Save to file
-            self._save_transcript(result)
-            
             return result
             
         except Exception as e:
@@ -126,13 +358,16 @@ class EarningsCallFetcher:
             print("❌ earningscall library not installed")
             return None
         
+        filename = f"{ticker}_Q{quarter}_{year}.mp3"
+        filepath = self.audio_dir / filename
+        if filepath.exists() and filepath.stat().st_size > 0:
+            print(f"\n📦 Audio already downloaded: {filepath}")
+            return str(filepath)
+        
         try:
             print(f"\n🎧 Downloading {ticker} Q{quarter} {year} audio...")
             
-            company = get_company(ticker.lower())
-            
-            filename = f"{ticker}_Q{quarter}_{year}.mp3"
-            filepath = self.audio_dir / filename
+            company = self._get_company(ticker)
             
             company.download_audio_file(
                 year=year, 
@@ -173,13 +408,17 @@ class EarningsCallFetcher:
             print("❌ earningscall library not installed")
             return None
         
+        filename = f"{ticker}_Q{quarter}_{year}_slides.pdf"
+        filepath = self.earnings_dir / "slides" / filename
+        if filepath.exists() and filepath.stat().st_size > 0:
+            print(f"\n📦 Slides already downloaded: {filepath}")
+            return str(filepath)
+        
         try:
             print(f"\n📊 Downloading {ticker} Q{quarter} {year} slides...")
             
-            company = get_company(ticker.lower())
+            company = self._get_company(ticker)
             
-            filename = f"{ticker}_Q{quarter}_{year}_slides.pdf"
-            filepath = self.earnings_dir / "slides" / filename
             filepath.parent.mkdir(exist_ok=True)
             
             company.download_slides(
@@ -200,6 +439,103 @@ class EarningsCallFetcher:
             print(f"   ⚠️  Slides not available: {e}")
             return None
     
+    async def get_transcript_async(
+        self,
+        ticker: str,
+        year: int,
+        quarter: int,
+        level: int = 4
+    ) -> Optional[Dict]:
+        """Async get_transcript; the fetch runs in a worker thread and the save is non-blocking"""
+        cached = self._load_transcript(ticker, year, quarter, level)
+        if cached is not None:
+            print(f"\n📦 Using cached {ticker} Q{quarter} {year} transcript")
+            return cached
+        
+        result = await asyncio.to_thread(self._fetch_transcript, ticker, year, quarter, level)
+        if result is not None:
+            await self._save_transcript_async(result)
+        return result
+    
+    async def batch_fetch(
+        self,
+        tickers: List[str],
+        year: int,
+        quarter: int,
+        level: int = 4
+    ) -> List[Dict]:
+        """
+        Fetch the same quarter's transcript for many tickers concurrently
+        
+        Args:
+            tickers: Stock ticker symbols
+            year: Year of earnings call
+            quarter: Quarter (1-4)
+            level: Detail level (see get_transcript)
+            
+        Returns:
+            Transcripts that were retrieved, in ticker order
+        """
+        results = await asyncio.gather(
+            *[self.get_transcript_async(t, year, quarter, level) for t in tickers]
+        )
+        return [r for r in results if r is not None]
+    
+    async def download_audio_async(self, ticker: str, year: int, quarter: int) -> Optional[str]:
+        """Async download_audio; the blocking download runs in a worker thread"""
+        return await asyncio.to_thread(self.download_audio, ticker, year, quarter)
+    
+    async def download_slides_async(self, ticker: str, year: int, quarter: int) -> Optional[str]:
+        """Async download_slides; the blocking download runs in a worker thread"""
+        return await asyncio.to_thread(self.download_slides, ticker, year, quarter)
+    
+    @staticmethod
+    def _map_threaded(func, calls: List[Tuple], max_workers: int) -> List:
+        """Run func(*call) for each call on a thread pool, preserving order"""
+        if not calls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as executor:
+            return list(executor.map(lambda call: func(*call), calls))
+    
+    def get_transcript_batch(
+        self,
+        calls: List[Tuple[str, int, int]],
+        level: int = 4,
+        max_workers: int = 8
+    ) -> List[Optional[Dict]]:
+        """
+        Fetch many transcripts in parallel worker threads
+        
+        Args:
+            calls: (ticker, year, quarter) tuples
+            level: Detail level (see get_transcript)
+            max_workers: Maximum concurrent downloads
+            
+        Returns:
+            Transcript (or None) for each call, in input order
+        """
+        return self._map_threaded(
+            lambda ticker, year, quarter: self.get_transcript(ticker, year, quarter, level),
+            calls,
+            max_workers
+        )
+    
+    def download_audio_batch(
+        self,
+        calls: List[Tuple[str, int, int]],
+        max_workers: int = 8
+    ) -> List[Optional[str]]:
+        """Download audio for many (ticker, year, quarter) calls in parallel; see download_audio"""
+        return self._map_threaded(self.download_audio, calls, max_workers)
+    
+    def download_slides_batch(
+        self,
+        calls: List[Tuple[str, int, int]],
+        max_workers: int = 8
+    ) -> List[Optional[str]]:
+        """Download slides for many (ticker, year, quarter) calls in parallel; see download_slides"""
+        return self._map_threaded(self.download_slides, calls, max_workers)
+    
     def analyze_transcript(self, transcript_data: Dict) -> Dict:
         """
         Analyze transcript for key insights
@@ -225,13 +561,16 @@ class EarningsCallFetcher:
             analysis['insights'] = {
                 'prepared_remarks_length': len(prepared),
                 'qa_length': len(qa),
-                'prepared_word_count': len(prepared.split()),
-                'qa_word_count': len(qa.split()),
+                'prepared_word_count': fast_word_count(prepared),
+                'qa_word_count': fast_word_count(qa),
                 'ratio_qa_to_prepared': len(qa) / len(prepared) if len(prepared) > 0 else 0,
             }
             
             # Keyword analysis
-            analysis['insights']['keywords'] = self._extract_keywords(prepared, qa)
+            kw_counts = self._keyword_counts(transcript_data)
+            analysis['insights']['keywords'] = self._extract_keywords(
+                kw_counts['prepared'], kw_counts['qa']
+            )
             
             print(f"\n📊 Analysis Summary:")
             print(f"   • Prepared remarks: {analysis['insights']['prepared_word_count']} words")
@@ -242,14 +581,15 @@ class EarningsCallFetcher:
             speakers = transcript_data.get('speakers', [])
             
             # Speaker analysis
-            speaker_stats = []
-            for speaker in speakers:
-                speaker_stats.append({
+            speaker_stats = [
+                {
                     'name': speaker['name'],
                     'title': speaker['title'],
-                    'word_count': len(speaker['text'].split()),
+                    'word_count': fast_word_count(speaker['text']),
                     'char_count': len(speaker['text'])
-                })
+                }
+                for speaker in speakers
+            ]
             
             analysis['insights']['speakers'] = speaker_stats
             analysis['insights']['total_speakers'] = len(speakers)
@@ -264,40 +604,87 @@ class EarningsCallFetcher:
         
         return analysis
     
-    def _extract_keywords(self, prepared: str, qa: str) -> Dict[str, List[str]]:
-        """Extract important keywords from prepared vs Q&A sections"""
-        
-        # Risk-related keywords
-        risk_keywords = ['risk', 'concern', 'challenge', 'headwind', 'uncertainty', 
-                        'pressure', 'difficult', 'weak', 'decline', 'loss']
-        
-        # Positive keywords
-        positive_keywords = ['growth', 'strong', 'increase', 'improve', 'opportunity',
-                           'momentum', 'success', 'gain', 'expand', 'optimize']
-        
-        # Financial metrics
-        metric_keywords = ['revenue', 'margin', 'profit', 'earnings', 'cash flow',
-                          'roce', 'roe', 'ebitda', 'guidance', 'outlook']
-        
-        def count_keywords(text, keywords):
-            text_lower = text.lower()
-            return {kw: text_lower.count(kw) for kw in keywords if text_lower.count(kw) > 0}
+    def _keyword_counts(self, transcript_data: Dict) -> Dict[str, Dict[str, Counter]]:
+        """
+        Keyword group counts for the prepared and Q&A sections
         
+        Memoized on the section text so analyze_transcript and
+        create_contradiction_report share a single scan.
+        """
+        return _section_keyword_counts(
+            transcript_data.get('prepared_remarks') or '',
+            transcript_data.get('qa_section') or ''
+        )
+    
+    def _extract_keywords(
+        self,
+        prepared_counts: Dict[str, Counter],
+        qa_counts: Dict[str, Counter]
+    ) -> Dict[str, Dict[str, int]]:
+        """Extract important keywords from prepared vs Q&A section counts"""
         return {
-            'risks_in_prepared': count_keywords(prepared, risk_keywords),
-            'risks_in_qa': count_keywords(qa, risk_keywords),
-            'positive_in_prepared': count_keywords(prepared, positive_keywords),
-            'positive_in_qa': count_keywords(qa, positive_keywords),
-            'metrics_mentioned': count_keywords(prepared + qa, metric_keywords)
+            'risks_in_prepared': dict(prepared_counts['risk']),
+            'risks_in_qa': dict(qa_counts['risk']),
+            'positive_in_prepared': dict(prepared_counts['positive']),
+            'positive_in_qa': dict(qa_counts['positive']),
+            'metrics_mentioned': dict(prepared_counts['metric'] + qa_counts['metric'])
         }
     
+    def _transcript_file(self, ticker: str, year: int, quarter: int, level: int) -> Path:
+        return self.transcripts_dir / f"{ticker.upper()}_Q{quarter}_{year}_L{level}.json"
+    
+    def _transcript_path(self, transcript_data: Dict) -> Path:
+        return self._transcript_file(
+            transcript_data['ticker'], transcript_data['year'],
+            transcript_data['quarter'], transcript_data['level']
+        )
+    
+    def _load_transcript(self, ticker: str, year: int, quarter: int, level: int) -> Optional[Dict]:
+        """
+        Return the saved transcript if it is younger than its TTL, else None
+        
+        The saved JSON file doubles as the cache entry; the date is parsed
+        back into a datetime so hits match a fresh fetch.
+        """
+        path = self._transcript_file(ticker, year, quarter, level)
+        try:
+            if time.time() - path.stat().st_mtime > self._ttl_for_year(year):
+                return None
+            with open(path, 'rb') as f:
+                data = orjson.loads(f.read()) if orjson is not None else json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if isinstance(data.get('date'), str):
+            try:
+                data['date'] = datetime.fromisoformat(data['date'])
+            except ValueError:
+                pass
+        return data
+    
+    @staticmethod
+    def _write_json(filepath: Path, data: Dict):
+        """Write data as one buffered blob; fsync is left to the OS page cache"""
+        with open(filepath, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(_dump_json(data))
+    
     def _save_transcript(self, transcript_data: Dict):
         """Save transcript to JSON file"""
-        filename = f"{transcript_data['ticker']}_Q{transcript_data['quarter']}_{transcript_data['year']}_L{transcript_data['level']}.json"
-        filepath = self.transcripts_dir / filename
+        filepath = self._transcript_path(transcript_data)
+        self._write_json(filepath, transcript_data)
+        
+        print(f"   💾 Saved transcript: {filepath}")
+    
+    async def _save_transcript_async(self, transcript_data: Dict):
+        """Save transcript to JSON file without blocking the event loop"""
+        filepath = self._transcript_path(transcript_data)
+        payload = _dump_json(transcript_data)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(transcript_data, f, indent=2, ensure_ascii=False)
+        if aiofiles is not None:
+            async with aiofiles.open(filepath, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                await f.write(payload)
+        else:
+            await asyncio.to_thread(filepath.write_bytes, payload)
         
         print(f"   💾 Saved transcript: {filepath}")
     
@@ -305,12 +692,35 @@ class EarningsCallFetcher:
         """Save analysis to JSON file"""
         filename = f"{analysis['ticker']}_Q{analysis['quarter']}_{analysis['year']}_analysis.json"
         filepath = self.analysis_dir / filename
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(analysis, f, indent=2, ensure_ascii=False)
+        self._write_json(filepath, analysis)
         
         print(f"   💾 Saved analysis: {filepath}")
     
+    @staticmethod
+    def _recent_periods() -> List[Tuple[int, int]]:
+        """(year, quarter) pairs for the last three years, newest year first"""
+        current_year = datetime.now().year
+        return [
+            (year, quarter)
+            for year in range(current_year, current_year - 3, -1)
+            for quarter in range(1, 5)
+        ]
+    
+    @staticmethod
+    def _probe_call(company, year: int, quarter: int) -> Optional[Dict]:
+        """Return the available-call entry for one quarter, or None if it has no transcript"""
+        try:
+            transcript = company.get_transcript(year=year, quarter=quarter, level=1)
+        except Exception:
+            return None
+        if not transcript:
+            return None
+        return {
+            'year': year,
+            'quarter': quarter,
+            'date': getattr(transcript, 'date', None)
+        }
+    
     def get_available_calls(self, ticker: str) -> List[Dict]:
         """
         Get list of available earnings calls for a company
@@ -321,32 +731,72 @@ class EarningsCallFetcher:
         Returns:
             List of available calls with dates
         """
+        cache_key = ('available_calls', ticker.upper())
+        cached = self._cache_get(cache_key, AVAILABLE_CALLS_TTL)
+        if cached is not None:
+            print(f"\n📦 Using cached available calls for {ticker}")
+            return cached
+        
         if get_company is None:
             print("❌ earningscall library not installed")
             return []
         
         try:
             print(f"\n📋 Checking available calls for {ticker}...")
-            company = get_company(ticker.lower())
-            
-            # Try to get transcripts for recent quarters
-            available = []
-            current_year = datetime.now().year
-            
-            for year in range(current_year, current_year - 3, -1):
-                for quarter in range(1, 5):
-                    try:
-                        transcript = company.get_transcript(year=year, quarter=quarter, level=1)
-                        if transcript:
-                            available.append({
-                                'year': year,
-                                'quarter': quarter,
-                                'date': getattr(transcript, 'date', None)
-                            })
-                    except:
-                        continue
+            company = self._get_company(ticker)
+            
+            # Probe transcripts for recent quarters on a thread pool
+            periods = self._recent_periods()
+            calls = self._map_threaded(
+                lambda year, quarter: self._probe_call(company, year, quarter),
+                periods,
+                len(periods)
+            )
+            available = [call for call in calls if call is not None]
             
             print(f"   ✅ Found {len(available)} available calls")
+            self._cache_put(cache_key, available)
+            return available
+            
+        except Exception as e:
+            print(f"   ❌ Error checking available calls: {e}")
+            return []
+    
+    async def get_available_calls_async(self, ticker: str) -> List[Dict]:
+        """
+        Async get_available_calls: probes all recent quarters concurrently
+        
+        Args:
+            ticker: Stock ticker symbol
+            
+        Returns:
+            List of available calls with dates, newest first
+        """
+        cache_key = ('available_calls', ticker.upper())
+        cached = self._cache_get(cache_key, AVAILABLE_CALLS_TTL)
+        if cached is not None:
+            print(f"\n📦 Using cached available calls for {ticker}")
+            return cached
+        
+        if get_company is None:
+            print("❌ earningscall library not installed")
+            return []
+        
+        try:
+            print(f"\n📋 Checking available calls for {ticker}...")
+            company = await asyncio.to_thread(self._get_company, ticker)
+            
+            # Probe transcripts for recent quarters in parallel
+            calls = await asyncio.gather(
+                *[
+                    asyncio.to_thread(self._probe_call, company, year, quarter)
+                    for year, quarter in self._recent_periods()
+                ]
+            )
+            available = [call for call in calls if call is not None]
+            
+            print(f"   ✅ Found {len(available)} available calls")
+            self._cache_put(cache_key, available)
             return available
             
         except Exception as e:
@@ -368,13 +818,6 @@ class EarningsCallFetcher:
             print("⚠️  Contradiction analysis requires level 4 transcripts")
             return {}
         
-        prepared = transcript_data.get('prepared_remarks', '').lower()
-        qa = transcript_data.get('qa_section', '').lower()
-        
-        # Keywords that suggest different tones
-        optimistic_prepared = ['strong', 'growth', 'success', 'opportunity', 'excellent']
-        cautious_qa = ['concern', 'risk', 'challenge', 'pressure', 'difficult']
-        
         report = {
             'ticker': transcript_data['ticker'],
             'year': transcript_data['year'],
@@ -383,8 +826,10 @@ class EarningsCallFetcher:
         }
         
         # Check if management is optimistic but Q&A reveals concerns
-        optimism_count = sum(prepared.count(word) for word in optimistic_prepared)
-        concern_count = sum(qa.count(word) for word in cautious_qa)
+        kw_counts = self._keyword_counts(transcript_data)
+        prepared_counts, qa_counts = kw_counts['prepared'], kw_counts['qa']
+        optimism_count = sum(prepared_counts['optimistic'].values())
+        concern_count = sum(qa_counts['cautious'].values())
         
         if optimism_count > 5 and concern_count > optimism_count:
             report['flags'].append({
@@ -395,8 +840,7 @@ class EarningsCallFetcher:
             })
         
         # Check for defensive language in Q&A
-        defensive_phrases = ['as we mentioned', 'we already discussed', 'to be clear', 'let me clarify']
-        defensive_count = sum(qa.count(phrase) for phrase in defensive_phrases)
+        defensive_count = sum(qa_counts['defensive'].values())
         
         if defensive_count > 3:
             report['flags'].append({
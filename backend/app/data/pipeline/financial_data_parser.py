@@ -2,24 +2,161 @@
 Financial Data Parser
 Extracts and structures financial data from SEC EDGAR JSON responses
 """
+import functools
+import json
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import IO, AbstractSet, Any, Dict, FrozenSet, List, Optional, Tuple
 from datetime import datetime
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 from app.config import FINANCIAL_METRICS
 
+WIDE_INDEX = ['end', 'fy', 'fp', 'form']
+
+DERIVED_INPUTS = (
+    'NetIncome', 'Revenue', 'GrossProfit', 'OperatingCashFlow', 'Capex',
+    'CurrentAssets', 'CurrentLiabilities', 'LongTermDebt', 'Equity', 'Assets'
+)
+
+# (derived column, numerator, denominator, scale); zero denominators give NaN
+DERIVED_RATIOS = (
+    ('ProfitMargin', 'NetIncome', 'Revenue', 100),     # Net Income / Revenue
+    ('GrossMargin', 'GrossProfit', 'Revenue', 100),    # Gross Profit / Revenue
+    ('CurrentRatio', 'CurrentAssets', 'CurrentLiabilities', 1),
+    ('DebtToEquity', 'LongTermDebt', 'Equity', 1),
+    ('ROA', 'NetIncome', 'Assets', 100),               # Return on Assets
+    ('ROE', 'NetIncome', 'Equity', 100),               # Return on Equity
+)
+
+
+def _latest_index(end: np.ndarray, mask: np.ndarray) -> Optional[int]:
+    """Position of the most recent 'end' among masked rows, or None"""
+    if end.dtype.kind == 'M':
+        mask = mask & ~np.isnat(end)
+    candidates = np.flatnonzero(mask)
+    if candidates.size == 0:
+        return None
+    return candidates[np.argmax(end[candidates])]
+
+
+def prune_facts(facts_data: Dict, names: AbstractSet[str], taxonomy: str = "us-gaap") -> Dict:
+    """Drop every facts.<taxonomy> entry whose name is not in names (in place)"""
+    taxonomy_data = facts_data.get('facts', {}).get(taxonomy, {})
+    facts_data['facts'] = {taxonomy: {
+        name: data for name, data in taxonomy_data.items() if name in names
+    }}
+    return facts_data
+
+
+class _FactsPruner:
+    """
+    ijson event consumer that keeps only the facts.<taxonomy>.<name> subtrees
+    whose name is wanted, plus the top-level cik and entityName
+    """
+    
+    def __init__(self, names: AbstractSet[str], taxonomy: str):
+        self.names = names
+        self.facts_data = {'facts': {taxonomy: {}}}
+        self._selected = self.facts_data['facts'][taxonomy]
+        self._taxonomy_prefix = f"facts.{taxonomy}"
+        self._metric_prefix = None
+        self._builder = None
+    
+    def feed(self, prefix: str, event: str, value: Any):
+        if self._builder is not None:
+            self._builder.event(event, value)
+            if prefix == self._metric_prefix and event in ('end_map', 'end_array'):
+                self._selected[self._metric_prefix.rsplit('.', 1)[1]] = self._builder.value
+                self._builder = None
+        elif prefix == self._taxonomy_prefix and event == 'map_key':
+            if value in self.names:
+                self._metric_prefix = f"{self._taxonomy_prefix}.{value}"
+                self._builder = ijson.ObjectBuilder()
+        elif prefix in ('cik', 'entityName') and event in ('string', 'number'):
+            self.facts_data[prefix] = value
+
+
+def stream_facts(fp: IO[bytes], names: AbstractSet[str], taxonomy: str = "us-gaap") -> Dict:
+    """
+    Parse a companyfacts JSON byte stream keeping only the named metrics
+    
+    Only the selected subtrees are materialized, so memory tracks the wanted
+    metrics rather than the whole (often 50MB+) document. Requires ijson.
+    """
+    pruner = _FactsPruner(names, taxonomy)
+    for prefix, event, value in ijson.parse(fp, use_float=True):
+        pruner.feed(prefix, event, value)
+    return pruner.facts_data
+
+
+async def stream_facts_async(reader: Any, names: AbstractSet[str], taxonomy: str = "us-gaap") -> Dict:
+    """stream_facts for an object with an async read(size) method"""
+    pruner = _FactsPruner(names, taxonomy)
+    async for prefix, event, value in ijson.parse_async(reader, use_float=True):
+        pruner.feed(prefix, event, value)
+    return pruner.facts_data
+
+
+@functools.lru_cache(maxsize=1)
+def _fact_name_index() -> Tuple[Dict[str, Tuple[str, int]], FrozenSet[str]]:
+    """
+    Flat fact name -> (metric label, preference rank within that label), and its key set
+    
+    FINANCIAL_METRICS is fixed at import, so every parser shares one index.
+    """
+    name_to_label = {
+        name: (label, rank)
+        for label, names in FINANCIAL_METRICS.items()
+        for rank, name in enumerate(names)
+    }
+    return name_to_label, frozenset(name_to_label)
+
 
 class FinancialDataParser:
     """Parses SEC EDGAR company facts into structured financial data"""
     
     def __init__(self):
         self.metrics_config = FINANCIAL_METRICS
+        # Shared, read-only lookup tables
+        self._name_to_label, self.wanted_names = _fact_name_index()
+        # extract_metric results for the most recent facts_data only
+        self._extract_cache: Dict[Tuple[int, Tuple[str, ...], str, Optional[str]], Optional[pd.DataFrame]] = {}
+        self._extract_cache_facts: Optional[Dict] = None
+    
+    def load_facts_partial(self, path: str, taxonomy: str = "us-gaap") -> Dict:
+        """
+        Load a companyfacts JSON file keeping only the configured metrics
+        
+        Streams the file with ijson and materializes just the
+        facts.<taxonomy>.<name> subtrees whose name is configured, so memory
+        tracks the selected metrics rather than the whole (often 50MB+) file.
+        Without ijson the file is loaded fully and pruned afterwards.
+        
+        Args:
+            path: Path to a SEC companyfacts JSON file
+            taxonomy: Accounting taxonomy (default: 'us-gaap')
+            
+        Returns:
+            Facts dict shaped like the SEC response, with pruned taxonomy data
+        """
+        if ijson is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                return prune_facts(json.load(f), self.wanted_names, taxonomy)
+        
+        with open(path, 'rb') as f:
+            return stream_facts(f, self.wanted_names, taxonomy)
     
     def extract_metric(
         self, 
         facts_data: Dict, 
         metric_names: List[str],
-        taxonomy: str = "us-gaap"
+        taxonomy: str = "us-gaap",
+        form_type: Optional[str] = None
     ) -> Optional[pd.DataFrame]:
         """
         Extract a specific metric from company facts
@@ -28,10 +165,30 @@ class FinancialDataParser:
             facts_data: Company facts JSON from SEC
             metric_names: List of possible metric names to look for
             taxonomy: Accounting taxonomy (default: 'us-gaap')
+            form_type: Keep only this form ('10-K', '10-Q'); default keeps all
             
         Returns:
-            DataFrame with metric values over time, or None if not found
+            DataFrame with metric values over time, or None if not found.
+            Results are memoized per facts_data; copy before mutating.
         """
+        if facts_data is not self._extract_cache_facts:
+            self._extract_cache = {}
+            self._extract_cache_facts = facts_data
+        
+        cache_key = (id(facts_data), tuple(metric_names), taxonomy, form_type)
+        if cache_key not in self._extract_cache:
+            self._extract_cache[cache_key] = self._extract_metric(
+                facts_data, metric_names, taxonomy, form_type
+            )
+        return self._extract_cache[cache_key]
+    
+    def _extract_metric(
+        self,
+        facts_data: Dict,
+        metric_names: List[str],
+        taxonomy: str,
+        form_type: Optional[str]
+    ) -> Optional[pd.DataFrame]:
         if not facts_data or 'facts' not in facts_data:
             return None
         
@@ -46,6 +203,10 @@ class FinancialDataParser:
                 if 'units' in metric_data and 'USD' in metric_data['units']:
                     values = metric_data['units']['USD']
                     
+                    # Filter by form type before building the DataFrame
+                    if form_type is not None:
+                        values = [v for v in values if v.get('form') == form_type]
+                    
                     # Convert to DataFrame
                     df = pd.DataFrame(values)
                     
@@ -76,21 +237,17 @@ class FinancialDataParser:
             return None
         
         # Filter for annual reports (10-K)
-        annual = metric_df[metric_df['form'] == '10-K'].copy()
-        
-        if annual.empty:
-            return None
+        mask = metric_df['form'].to_numpy() == '10-K'
         
         # Filter by fiscal year if specified
-        if fiscal_year and 'fy' in annual.columns:
-            annual = annual[annual['fy'] == fiscal_year]
-        
-        if annual.empty:
-            return None
+        if fiscal_year and 'fy' in metric_df.columns:
+            mask &= metric_df['fy'].to_numpy() == fiscal_year
         
         # Get most recent entry
-        latest = annual.sort_values('end', ascending=False).iloc[0]
-        return latest.get('val')
+        idx = _latest_index(metric_df['end'].to_numpy(), mask)
+        if idx is None or 'val' not in metric_df.columns:
+            return None
+        return metric_df['val'].to_numpy()[idx]
     
     def get_latest_quarterly_value(
         self, 
@@ -113,37 +270,56 @@ class FinancialDataParser:
             return None
         
         # Filter for quarterly reports (10-Q)
-        quarterly = metric_df[metric_df['form'].isin(['10-Q', '10-K'])].copy()
-        
-        if quarterly.empty:
-            return None
+        form = metric_df['form'].to_numpy()
+        mask = (form == '10-Q') | (form == '10-K')
         
         # Filter by fiscal year if specified
-        if fiscal_year and 'fy' in quarterly.columns:
-            quarterly = quarterly[quarterly['fy'] == fiscal_year]
+        if fiscal_year and 'fy' in metric_df.columns:
+            mask &= metric_df['fy'].to_numpy() == fiscal_year
         
         # Filter by fiscal period if specified
-        if fiscal_period and 'fp' in quarterly.columns:
-            quarterly = quarterly[quarterly['fp'] == fiscal_period]
-        
-        if quarterly.empty:
-            return None
+        if fiscal_period and 'fp' in metric_df.columns:
+            mask &= metric_df['fp'].to_numpy() == fiscal_period
         
         # Get most recent entry
-        latest = quarterly.sort_values('end', ascending=False).iloc[0]
-        return latest.get('val')
+        idx = _latest_index(metric_df['end'].to_numpy(), mask)
+        if idx is None or 'val' not in metric_df.columns:
+            return None
+        return metric_df['val'].to_numpy()[idx]
 
     def get_latest_non_null(self, df: pd.DataFrame, column: str) -> Optional[float]:
         """Get the most recent non-null value for a column."""
         if df is None or df.empty or column not in df.columns:
             return None
 
-        ordered = df.sort_values('end', ascending=False)
-        for value in ordered[column]:
-            if pd.notna(value):
-                return value
-
-        return None
+        values = df[column].to_numpy()
+        idx = _latest_index(df['end'].to_numpy(), pd.notna(values))
+        return None if idx is None else values[idx]
+    
+    def get_latest_values(self, df: pd.DataFrame, columns: List[str]) -> pd.Series:
+        """
+        get_latest_non_null for several columns in one vectorized pass
+        
+        Returns:
+            Series indexed by columns; NaN where a column is missing or all-null
+        """
+        if df is None or df.empty:
+            return pd.Series(np.nan, index=columns, dtype=object)
+        
+        # Rank of each row's 'end' (NaN where missing); rows without one never win
+        end_rank = df['end'].rank(method='dense').to_numpy()
+        if np.isnan(end_rank).all():
+            return pd.Series(np.nan, index=columns, dtype=object)
+        
+        present = [column for column in columns if column in df.columns]
+        block = df[present].to_numpy()
+        
+        # Column-wise over the (rows x metrics) block: the newest non-null row per
+        # metric (the first such row on ties), else the newest row's null
+        keys = end_rank[:, None] + pd.notna(block) * len(end_rank)
+        rows = np.where(np.isnan(keys), -np.inf, keys).argmax(axis=0)
+        latest = pd.Series(block[rows, np.arange(len(present))], index=present, dtype=block.dtype)
+        return latest.reindex(columns)
     
     def extract_all_metrics(
         self, 
@@ -160,36 +336,78 @@ class FinancialDataParser:
         Returns:
             DataFrame with all metrics over time
         """
-        all_data = []
+        return self._extract_wide(facts_data, (form_type,))[form_type]
+    
+    def _extract_wide(
+        self,
+        facts_data: Dict,
+        form_types: Tuple[str, ...]
+    ) -> Dict[str, pd.DataFrame]:
+        """Build the wide metrics table for several form types in one walk of the facts"""
+        # form -> (end, fy, fp, form) -> {metric_label: val}, keeping the first value seen
+        wide = {form_type: {} for form_type in form_types}
+        for metric_label, values in self._usd_values_by_label(facts_data).items():
+            for entry in values:
+                if entry.get('form') not in form_types:
+                    continue
+                key = tuple(entry.get(k) for k in WIDE_INDEX)
+                if None in key:
+                    continue
+                wide[key[-1]].setdefault(key, {}).setdefault(metric_label, entry['val'])
+        
+        return {form_type: self._wide_to_frame(rows) for form_type, rows in wide.items()}
+    
+    def _usd_values_by_label(
+        self,
+        facts_data: Dict,
+        taxonomy: str = "us-gaap"
+    ) -> Dict[str, List[Dict]]:
+        """
+        Map each metric label to the raw USD entries of its preferred fact name
         
-        for metric_label, metric_names in self.metrics_config.items():
-            metric_df = self.extract_metric(facts_data, metric_names)
-            
-            if metric_df is not None and not metric_df.empty:
-                # Filter by form type
-                filtered = metric_df[metric_df['form'] == form_type].copy()
-                
-                if not filtered.empty:
-                    # Keep relevant columns
-                    filtered = filtered[['end', 'val', 'fy', 'fp', 'form']].copy()
-                    filtered['metric'] = metric_label
-                    all_data.append(filtered)
+        Same choice as extract_metric (first configured name with USD units),
+        resolved through the flat name map. Walks the taxonomy once when it is
+        smaller than the name map, otherwise probes the configured names.
+        """
+        if not facts_data or 'facts' not in facts_data:
+            return {}
         
-        if not all_data:
+        taxonomy_data = facts_data['facts'].get(taxonomy, {})
+        if len(taxonomy_data) < len(self._name_to_label):
+            candidates = (
+                (name, taxonomy_data[name]) for name in taxonomy_data
+                if name in self._name_to_label
+            )
+        else:
+            candidates = (
+                (name, taxonomy_data[name]) for name in self._name_to_label
+                if name in taxonomy_data
+            )
+        
+        chosen: Dict[str, Tuple[int, List[Dict]]] = {}
+        for name, metric_data in candidates:
+            values = metric_data.get('units', {}).get('USD')
+            if values is None:
+                continue
+            label, rank = self._name_to_label[name]
+            if label not in chosen or rank < chosen[label][0]:
+                chosen[label] = (rank, values)
+        
+        return {label: values for label, (_, values) in chosen.items()}
+    
+    @staticmethod
+    def _wide_to_frame(wide: Dict[tuple, Dict[str, float]]) -> pd.DataFrame:
+        if not wide:
             return pd.DataFrame()
         
-        # Combine all metrics
-        combined = pd.concat(all_data, ignore_index=True)
-        
-        # Pivot to wide format for easier analysis
-        pivot = combined.pivot_table(
-            index=['end', 'fy', 'fp', 'form'],
-            columns='metric',
-            values='val',
-            aggfunc='first'
-        ).reset_index()
+        df = pd.DataFrame.from_dict(wide, orient='index')
+        df = df[sorted(df.columns)]
+        df.index.names = WIDE_INDEX
+        df.columns.name = 'metric'
+        df = df.reset_index()
         
-        return pivot
+        df['end'] = pd.to_datetime(df['end'])
+        return df.sort_values(WIDE_INDEX, ignore_index=True)
     
     def create_financial_summary(
         self, 
@@ -207,17 +425,18 @@ class FinancialDataParser:
             Dictionary with 'annual' and 'quarterly' DataFrames
         """
         summary = {}
+        tables = self._extract_wide(facts_data, ('10-K', '10-Q'))
         
         # Annual data (10-K)
-        annual_df = self.extract_all_metrics(facts_data, form_type='10-K')
+        annual_df = tables['10-K']
         if not annual_df.empty:
-            annual_df = annual_df.sort_values('end', ascending=False).head(num_periods)
+            annual_df = annual_df.nlargest(num_periods, 'end', keep='last')
             summary['annual'] = annual_df
         
         # Quarterly data (10-Q)
-        quarterly_df = self.extract_all_metrics(facts_data, form_type='10-Q')
+        quarterly_df = tables['10-Q']
         if not quarterly_df.empty:
-            quarterly_df = quarterly_df.sort_values('end', ascending=False).head(num_periods)
+            quarterly_df = quarterly_df.nlargest(num_periods, 'end', keep='last')
             summary['quarterly'] = quarterly_df
         
         return summary
@@ -232,37 +451,26 @@ class FinancialDataParser:
         Returns:
             DataFrame with additional calculated metrics
         """
-        df = df.copy()
+        cols = {
+            k: df[k].to_numpy(dtype=np.float64)
+            for k in DERIVED_INPUTS if k in df.columns
+        }
+        derived = {}
         
         # Free Cash Flow = Operating Cash Flow - Capex
-        if 'OperatingCashFlow' in df.columns and 'Capex' in df.columns:
-            df['CalculatedFCF'] = df['OperatingCashFlow'] - df['Capex'].abs()
-        
-        # Profit Margin = Net Income / Revenue
-        if 'NetIncome' in df.columns and 'Revenue' in df.columns:
-            df['ProfitMargin'] = (df['NetIncome'] / df['Revenue'] * 100).round(2)
-        
-        # Gross Margin = Gross Profit / Revenue
-        if 'GrossProfit' in df.columns and 'Revenue' in df.columns:
-            df['GrossMargin'] = (df['GrossProfit'] / df['Revenue'] * 100).round(2)
-        
-        # Current Ratio = Current Assets / Current Liabilities
-        if 'CurrentAssets' in df.columns and 'CurrentLiabilities' in df.columns:
-            df['CurrentRatio'] = (df['CurrentAssets'] / df['CurrentLiabilities']).round(2)
-        
-        # Debt to Equity = Long Term Debt / Equity
-        if 'LongTermDebt' in df.columns and 'Equity' in df.columns:
-            df['DebtToEquity'] = (df['LongTermDebt'] / df['Equity']).round(2)
-        
-        # Return on Assets = Net Income / Assets
-        if 'NetIncome' in df.columns and 'Assets' in df.columns:
-            df['ROA'] = (df['NetIncome'] / df['Assets'] * 100).round(2)
-        
-        # Return on Equity = Net Income / Equity
-        if 'NetIncome' in df.columns and 'Equity' in df.columns:
-            df['ROE'] = (df['NetIncome'] / df['Equity'] * 100).round(2)
-        
-        return df
+        if 'OperatingCashFlow' in cols and 'Capex' in cols:
+            derived['CalculatedFCF'] = cols['OperatingCashFlow'] - np.abs(cols['Capex'])
+        
+        for name, numerator, denominator, scale in DERIVED_RATIOS:
+            if numerator in cols and denominator in cols:
+                denom = cols[denominator]
+                ratio = np.divide(
+                    cols[numerator], denom,
+                    out=np.full_like(denom, np.nan), where=denom != 0
+                )
+                derived[name] = np.round(ratio * scale, 2)
+        
+        return df.assign(**derived)
     
     def calculate_growth_rates(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -277,15 +485,24 @@ class FinancialDataParser:
         if df.empty or len(df) < 2:
             return df
         
-        df = df.copy().sort_values('end', ascending=False).reset_index(drop=True)
+        # sort_values already returns a new frame, no copy needed
+        df = df.sort_values('end', ascending=False, ignore_index=True)
         
-        numeric_cols = df.select_dtypes(include=['number']).columns
+        numeric_cols = [
+            col for col in df.select_dtypes(include=['number']).columns
+            if col not in ['fy', 'fp']
+        ]
+        if not numeric_cols:
+            return df
         
-        for col in numeric_cols:
-            if col not in ['fy', 'fp']:
-                growth_col = f"{col}_YoY_%"
-                df[growth_col] = ((df[col] / df[col].shift(-1) - 1) * 100).round(2)
+        # One NumPy pass over the numeric block: each row against the next (older) one
+        values = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        growth = np.full_like(values, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth[:-1] = np.round((values[:-1] / values[1:] - 1) * 100, 2)
         
+        # Assigned rather than concatenated so rerunning overwrites existing growth columns
+        df[[f"{col}_YoY_%" for col in numeric_cols]] = growth
         return df
 
 
@@ -0,0 +1,150 @@
+"""
+Fetcher Persistence
+Columnar on-disk formats for the fetchers' saved DataFrames, plus fast JSON writes
+"""
+import importlib.util
+import json
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FrameFormat = Literal["parquet", "feather", "csv"]
+
+# Parquet and Feather both need pyarrow; without it everything is saved as CSV
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+if not HAS_PYARROW:
+    print("⚠️  pyarrow not installed, saving DataFrames as CSV. Run: pip install pyarrow")
+
+
+def _downcast_column(col: pd.Series) -> pd.Series:
+    if pd.api.types.is_float_dtype(col):
+        # to_numeric(downcast="float") rounds to float32, so only keep it when exact
+        f32 = col.astype("float32" if isinstance(col.dtype, np.dtype) else "Float32")
+        if ((f32.astype("float64") == col) | col.isna()).all():
+            return f32
+        return col
+    if pd.api.types.is_integer_dtype(col):
+        return pd.to_numeric(col, downcast="integer")
+    return col
+
+
+def downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink float64/int64 columns to float32/int32 (or smaller) where no value changes
+
+    Integer columns take the smallest type that holds their range. A float
+    column becomes float32 only if every value survives the round trip
+    exactly (e.g. whole-dollar amounts); prices like 171.23 stay float64.
+    """
+    return df.apply(_downcast_column)
+
+
+def save_frame(df: pd.DataFrame, stem: Path, fmt: FrameFormat = "parquet", index: bool = True) -> Path:
+    """
+    Save a DataFrame next to stem with the extension of the chosen format
+
+    Args:
+        df: DataFrame to save
+        stem: Output path without extension
+        fmt: 'parquet' (zstd-compressed), 'feather' or 'csv'
+        index: Whether to keep the index (feather stores it as a column)
+
+    Returns:
+        Path written
+    """
+    if fmt != "csv" and not HAS_PYARROW:
+        fmt = "csv"
+
+    # Append rather than with_suffix: tickers like BRK.B contain dots
+    path = Path(stem)
+    path = path.with_name(f"{path.name}.{fmt}")
+
+    if fmt == "parquet":
+        df.to_parquet(path, engine="pyarrow", compression="zstd", index=index)
+    elif fmt == "feather":
+        # Feather only stores a default RangeIndex
+        df = df.reset_index() if index else df.reset_index(drop=True)
+        df.to_feather(path)
+    else:
+        df.to_csv(path, index=index)
+
+    return path
+
+
+def write_csv(df: pd.DataFrame, path: Path) -> Path:
+    """
+    Write df as CSV without its index, using pyarrow's multi-threaded writer when available
+    
+    Values are formatted slightly differently from pandas (e.g. 3.9e+11,
+    full timestamps) but read back identically with pd.read_csv.
+    """
+    path = Path(path)
+    if HAS_PYARROW:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def _str_keys(obj: Any) -> Any:
+    """Recursively stringify dict keys (e.g. Timestamps from DataFrame.to_dict)"""
+    if isinstance(obj, dict):
+        return {k if isinstance(k, str) else str(k): _str_keys(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_str_keys(v) for v in obj]
+    return obj
+
+
+def _dumps(data: Any, indent: bool) -> bytes:
+    """Serialize with orjson when installed, else the stdlib encoder"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, option=option, default=str)
+        except TypeError:
+            # Keys orjson cannot stringify itself, such as pandas Timestamps
+            return orjson.dumps(_str_keys(data), option=option, default=str)
+    return json.dumps(_str_keys(data), indent=2 if indent else None, default=str).encode("utf-8")
+
+
+def save_json(data: Any, path: Path, indent: bool = True) -> Path:
+    """
+    Write data as JSON in one buffered write
+
+    Uses orjson (NumPy values serialized natively, NaN written as null) and
+    falls back to the stdlib encoder; anything else unserializable is str()'d.
+    Pass indent=False for compact output.
+    """
+    path = Path(path)
+    path.write_bytes(_dumps(data, indent=indent))
+    return path
+
+
+def load_json(path: Path) -> Any:
+    """Read a JSON file written by save_json"""
+    payload = Path(path).read_bytes()
+    return orjson.loads(payload) if orjson is not None else json.loads(payload)
+
+
+def json_line(record: Any) -> bytes:
+    """Encode one record as a compact JSON Lines row, newline included"""
+    return _dumps(record, indent=False) + b"\n"
+
+
+def load_jsonl(path: Path) -> list:
+    """Read every record of a JSON Lines file written with json_line"""
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(path, "rb") as f:
+        return [loads(line) for line in f if line.strip()]
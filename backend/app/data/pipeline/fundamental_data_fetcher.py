@@ -9,23 +9,172 @@ Data Source: yfinance (Yahoo Finance)
 - Analyst estimates and recommendations
 - Company profile and statistics
 """
+import asyncio
 import yfinance as yf
 import pandas as pd
 from pathlib import Path
-import json
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
 
 from app.config import DATA_OUTPUT_DIR
+from app.data.pipeline.frame_io import FrameFormat, downcast_numeric, load_json, save_frame, save_json
+from app.data.pipeline.yf_session import TickerFactory, make_cached_session
+
+
+def _value(field: str, scale: float = 1, divisor: float = 1) -> Callable[[Dict], Optional[float]]:
+    """Extractor for a numeric info field; missing or zero values become None"""
+    def extract(info: Dict) -> Optional[float]:
+        value = info.get(field)
+        return value * scale / divisor if value else None
+    return extract
+
+
+def _fcf_per_share(info: Dict) -> Optional[float]:
+    if info.get('freeCashflow') and info.get('sharesOutstanding'):
+        return info['freeCashflow'] / info['sharesOutstanding']
+    return None
+
+
+_DOLLARS = "${:.2f}".format
+_BILLIONS = "${:.2f}B".format
+_PERCENT = "{:.2f}%".format
+_RATIO = "{:.2f}".format
+
+# (summary key, extractor from yfinance info, display formatter)
+KPI_SPECS: List[Tuple[str, Callable[[Dict], Any], Callable[[Any], str]]] = [
+    ('company_name', lambda info: info.get('longName', 'N/A'), str),
+    ('sector', lambda info: info.get('sector', 'N/A'), str),
+    ('industry', lambda info: info.get('industry', 'N/A'), str),
+    ('date_updated', lambda info: str(datetime.now().date()), str),
+    
+    # Market Data
+    ('current_price', lambda info: info.get('currentPrice', info.get('regularMarketPrice', 0)), _DOLLARS),
+    ('market_cap', lambda info: info.get('marketCap', 0) / 1e9, _BILLIONS),
+    ('enterprise_value', _value('enterpriseValue', divisor=1e9), _BILLIONS),
+    
+    # Valuation Ratios
+    ('pe_ratio', _value('trailingPE'), _RATIO),
+    ('forward_pe', _value('forwardPE'), _RATIO),
+    ('peg_ratio', _value('pegRatio'), _RATIO),
+    ('pb_ratio', _value('priceToBook'), _RATIO),
+    ('ps_ratio', _value('priceToSalesTrailing12Months'), _RATIO),
+    ('ev_to_ebitda', _value('enterpriseToEbitda'), _RATIO),
+    ('ev_to_revenue', _value('enterpriseToRevenue'), _RATIO),
+    
+    # Profitability Metrics (percentages)
+    ('profit_margin', _value('profitMargins', scale=100), _PERCENT),
+    ('operating_margin', _value('operatingMargins', scale=100), _PERCENT),
+    ('gross_margin', _value('grossMargins', scale=100), _PERCENT),
+    ('roe', _value('returnOnEquity', scale=100), _PERCENT),
+    ('roa', _value('returnOnAssets', scale=100), _PERCENT),
+    
+    # Financial Health
+    ('current_ratio', _value('currentRatio'), _RATIO),
+    ('quick_ratio', _value('quickRatio'), _RATIO),
+    ('debt_to_equity', _value('debtToEquity', divisor=100), _RATIO),
+    ('total_debt', _value('totalDebt', divisor=1e9), _BILLIONS),
+    ('total_cash', _value('totalCash', divisor=1e9), _BILLIONS),
+    
+    # Growth Metrics (percentages)
+    ('revenue_growth', _value('revenueGrowth', scale=100), _PERCENT),
+    ('earnings_growth', _value('earningsGrowth', scale=100), _PERCENT),
+    
+    # Per Share Metrics
+    ('eps_trailing', _value('trailingEps'), _DOLLARS),
+    ('eps_forward', _value('forwardEps'), _DOLLARS),
+    ('book_value_per_share', _value('bookValue'), _DOLLARS),
+    ('free_cash_flow_per_share', _fcf_per_share, _DOLLARS),
+    
+    # Dividend Info (percentages)
+    ('dividend_yield', _value('dividendYield', scale=100), _PERCENT),
+    ('payout_ratio', _value('payoutRatio', scale=100), _PERCENT),
+    
+    # Analyst Data
+    ('target_price', _value('targetMeanPrice'), _DOLLARS),
+    ('recommendation', lambda info: info.get('recommendationKey', 'N/A'), lambda v: str(v).upper()),
+    ('num_analysts', lambda info: info.get('numberOfAnalystOpinions', 0), str),
+]
+KPI_FORMATTERS = {key: fmt for key, _, fmt in KPI_SPECS}
+
+# Printed sections of the KPI summary: (header, [(label, summary key)])
+KPI_SECTIONS = [
+    ("🏢 COMPANY INFO", [("Name", 'company_name'), ("Sector", 'sector'), ("Industry", 'industry')]),
+    ("💰 MARKET DATA", [
+        ("Current Price", 'current_price'), ("Market Cap", 'market_cap'),
+        ("Enterprise Value", 'enterprise_value'),
+    ]),
+    ("📊 VALUATION RATIOS", [
+        ("P/E Ratio (Trailing)", 'pe_ratio'), ("P/E Ratio (Forward)", 'forward_pe'),
+        ("PEG Ratio", 'peg_ratio'), ("P/B Ratio", 'pb_ratio'), ("P/S Ratio", 'ps_ratio'),
+        ("EV/EBITDA", 'ev_to_ebitda'),
+    ]),
+    ("📈 PROFITABILITY", [
+        ("ROE", 'roe'), ("ROA", 'roa'), ("Profit Margin", 'profit_margin'),
+        ("Operating Margin", 'operating_margin'), ("Gross Margin", 'gross_margin'),
+    ]),
+    ("💵 FINANCIAL HEALTH", [
+        ("Current Ratio", 'current_ratio'), ("Quick Ratio", 'quick_ratio'),
+        ("Debt/Equity", 'debt_to_equity'), ("Total Debt", 'total_debt'), ("Total Cash", 'total_cash'),
+    ]),
+    ("🚀 GROWTH", [("Revenue Growth", 'revenue_growth'), ("Earnings Growth", 'earnings_growth')]),
+    ("💸 PER SHARE", [
+        ("EPS (Trailing)", 'eps_trailing'), ("EPS (Forward)", 'eps_forward'),
+        ("Book Value", 'book_value_per_share'), ("FCF Per Share", 'free_cash_flow_per_share'),
+    ]),
+    # Only shown for dividend payers
+    ("💰 DIVIDEND", [("Dividend Yield", 'dividend_yield'), ("Payout Ratio", 'payout_ratio')]),
+    ("🎯 ANALYST DATA", [
+        ("Target Price", 'target_price'), ("Recommendation", 'recommendation'),
+        ("Number of Analysts", 'num_analysts'),
+    ]),
+]
+
+
+# Peer comparison columns: (column, info field, scale, divisor)
+COMPARISON_COLUMNS = [
+    ('Market Cap ($B)', 'marketCap', 1, 1e9),
+    ('P/E', 'trailingPE', 1, 1),
+    ('P/B', 'priceToBook', 1, 1),
+    ('ROE (%)', 'returnOnEquity', 100, 1),
+    ('ROA (%)', 'returnOnAssets', 100, 1),
+    ('Profit Margin (%)', 'profitMargins', 100, 1),
+    ('Debt/Equity', 'debtToEquity', 1, 100),
+    ('Current Ratio', 'currentRatio', 1, 1),
+    ('Revenue Growth (%)', 'revenueGrowth', 100, 1),
+    ('Earnings Growth (%)', 'earningsGrowth', 100, 1),
+    ('Dividend Yield (%)', 'dividendYield', 100, 1),
+]
+
+
+def format_kpi(summary: Dict, key: str) -> str:
+    """Display string for a raw KPI summary value ('N/A' when missing)"""
+    value = summary.get(key)
+    if value is None:
+        return "N/A"
+    return KPI_FORMATTERS[key](value)
 
 
 class FundamentalDataFetcher:
     """Fetch fundamental financial data using yfinance (Yahoo Finance)"""
     
-    def __init__(self, data_dir: str | None = None):
+    def __init__(
+        self,
+        data_dir: str | None = None,
+        cache_hours: int = 6,
+        format: FrameFormat = "parquet"
+    ):
         self.data_dir = Path(data_dir) if data_dir else DATA_OUTPUT_DIR / "fundamental_data"
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.format = format
+        
+        # One HTTP-cached session and one Ticker per symbol for the fetcher's lifetime
+        self._ticker = TickerFactory(
+            make_cached_session(self.data_dir / "http_cache.sqlite", cache_hours)
+        )
+        # Company info payloads already fetched by this instance
+        self._info_cache: Dict[str, Dict] = {}
         
         # Create subdirectories
         self.statements_dir = self.data_dir / "statements"
@@ -36,7 +185,7 @@ class FundamentalDataFetcher:
         for dir in [self.statements_dir, self.ratios_dir, self.info_dir, self.analysis_dir]:
             dir.mkdir(exist_ok=True)
     
-    def get_company_info(self, ticker: str) -> Dict:
+    def get_company_info(self, ticker: str, persist: bool = True) -> Dict:
         """
         Get comprehensive company information and statistics
         
@@ -46,31 +195,56 @@ class FundamentalDataFetcher:
         - Financial Health: Current Ratio, Debt/Equity
         - Growth: Revenue/Earnings growth rates
         - Analyst data: Target prices, recommendations
+        
+        Args:
+            ticker: Stock ticker symbol
+            persist: Write {ticker}_info.json (internal callers pass False)
         """
+        if ticker in self._info_cache:
+            return self._info_cache[ticker]
+        
+        # A snapshot saved today is reused without hitting Yahoo or rewriting it
+        json_path = self.info_dir / f"{ticker}_info.json"
+        if self._is_fresh(json_path):
+            info = load_json(json_path)
+            self._info_cache[ticker] = info
+            return info
+        
         print(f"🏢 Fetching company info for {ticker}...")
         
-        stock = yf.Ticker(ticker)
+        stock = self._ticker(ticker)
         info = stock.info
         
         if not info or len(info) == 0:
             print(f"❌ No data found for {ticker}")
             return {}
         
-        # Save to JSON
-        json_path = self.info_dir / f"{ticker}_info.json"
-        with open(json_path, 'w') as f:
-            json.dump(info, f, indent=2, default=str)
-        
-        print(f"💾 Saved: {json_path}")
+        if persist:
+            save_json(info, json_path)
+            print(f"💾 Saved: {json_path}")
         
+        self._info_cache[ticker] = info
         return info
     
-    def get_income_statement(self, ticker: str, quarterly: bool = False) -> pd.DataFrame:
+    @staticmethod
+    def _is_fresh(path: Path) -> bool:
+        """True if path exists and was written today"""
+        return (
+            path.exists()
+            and datetime.fromtimestamp(path.stat().st_mtime).date() == datetime.now().date()
+        )
+    
+    def get_income_statement(
+        self,
+        ticker: str,
+        quarterly: bool = False,
+        stock: Optional["yf.Ticker"] = None
+    ) -> pd.DataFrame:
         """Get income statement (annual or quarterly)"""
         period = "quarterly" if quarterly else "annual"
         print(f"📊 Fetching {period} income statement for {ticker}...")
         
-        stock = yf.Ticker(ticker)
+        stock = stock or self._ticker(ticker)
         df = stock.quarterly_financials if quarterly else stock.financials
         
         if df is None or df.empty:
@@ -80,19 +254,24 @@ class FundamentalDataFetcher:
         # Transpose so dates are rows
         df = df.T
         
-        # Save to CSV
-        csv_path = self.statements_dir / f"{ticker}_income_{period}.csv"
-        df.to_csv(csv_path)
-        print(f"💾 Saved: {csv_path}")
+        saved_path = save_frame(
+            downcast_numeric(df), self.statements_dir / f"{ticker}_income_{period}", self.format
+        )
+        print(f"💾 Saved: {saved_path}")
         
         return df
     
-    def get_balance_sheet(self, ticker: str, quarterly: bool = False) -> pd.DataFrame:
+    def get_balance_sheet(
+        self,
+        ticker: str,
+        quarterly: bool = False,
+        stock: Optional["yf.Ticker"] = None
+    ) -> pd.DataFrame:
         """Get balance sheet (annual or quarterly)"""
         period = "quarterly" if quarterly else "annual"
         print(f"📊 Fetching {period} balance sheet for {ticker}...")
         
-        stock = yf.Ticker(ticker)
+        stock = stock or self._ticker(ticker)
         df = stock.quarterly_balance_sheet if quarterly else stock.balance_sheet
         
         if df is None or df.empty:
@@ -101,18 +280,24 @@ class FundamentalDataFetcher:
         
         df = df.T
         
-        csv_path = self.statements_dir / f"{ticker}_balance_{period}.csv"
-        df.to_csv(csv_path)
-        print(f"💾 Saved: {csv_path}")
+        saved_path = save_frame(
+            downcast_numeric(df), self.statements_dir / f"{ticker}_balance_{period}", self.format
+        )
+        print(f"💾 Saved: {saved_path}")
         
         return df
     
-    def get_cash_flow(self, ticker: str, quarterly: bool = False) -> pd.DataFrame:
+    def get_cash_flow(
+        self,
+        ticker: str,
+        quarterly: bool = False,
+        stock: Optional["yf.Ticker"] = None
+    ) -> pd.DataFrame:
         """Get cash flow statement (annual or quarterly)"""
         period = "quarterly" if quarterly else "annual"
         print(f"📊 Fetching {period} cash flow for {ticker}...")
         
-        stock = yf.Ticker(ticker)
+        stock = stock or self._ticker(ticker)
         df = stock.quarterly_cashflow if quarterly else stock.cashflow
         
         if df is None or df.empty:
@@ -121,9 +306,10 @@ class FundamentalDataFetcher:
         
         df = df.T
         
-        csv_path = self.statements_dir / f"{ticker}_cashflow_{period}.csv"
-        df.to_csv(csv_path)
-        print(f"💾 Saved: {csv_path}")
+        saved_path = save_frame(
+            downcast_numeric(df), self.statements_dir / f"{ticker}_cashflow_{period}", self.format
+        )
+        print(f"💾 Saved: {saved_path}")
         
         return df
     
@@ -136,183 +322,133 @@ class FundamentalDataFetcher:
         print(f"📊 KPI SUMMARY: {ticker}")
         print(f"{'='*80}\n")
         
-        info = self.get_company_info(ticker)
+        info = self.get_company_info(ticker, persist=False)
         
         if not info:
             print("❌ Insufficient data for KPI summary")
             return {}
         
-        # Extract key metrics
-        summary = {
-            'ticker': ticker,
-            'company_name': info.get('longName', 'N/A'),
-            'sector': info.get('sector', 'N/A'),
-            'industry': info.get('industry', 'N/A'),
-            'date_updated': str(datetime.now().date()),
-            
-            # Market Data
-            'current_price': f"${info.get('currentPrice', info.get('regularMarketPrice', 0)):.2f}",
-            'market_cap': f"${info.get('marketCap', 0) / 1e9:.2f}B",
-            'enterprise_value': f"${info.get('enterpriseValue', 0) / 1e9:.2f}B" if info.get('enterpriseValue') else "N/A",
-            
-            # Valuation Ratios
-            'pe_ratio': f"{info.get('trailingPE', 0):.2f}" if info.get('trailingPE') else "N/A",
-            'forward_pe': f"{info.get('forwardPE', 0):.2f}" if info.get('forwardPE') else "N/A",
-            'peg_ratio': f"{info.get('pegRatio', 0):.2f}" if info.get('pegRatio') else "N/A",
-            'pb_ratio': f"{info.get('priceToBook', 0):.2f}" if info.get('priceToBook') else "N/A",
-            'ps_ratio': f"{info.get('priceToSalesTrailing12Months', 0):.2f}" if info.get('priceToSalesTrailing12Months') else "N/A",
-            'ev_to_ebitda': f"{info.get('enterpriseToEbitda', 0):.2f}" if info.get('enterpriseToEbitda') else "N/A",
-            'ev_to_revenue': f"{info.get('enterpriseToRevenue', 0):.2f}" if info.get('enterpriseToRevenue') else "N/A",
-            
-            # Profitability Metrics
-            'profit_margin': f"{info.get('profitMargins', 0) * 100:.2f}%" if info.get('profitMargins') else "N/A",
-            'operating_margin': f"{info.get('operatingMargins', 0) * 100:.2f}%" if info.get('operatingMargins') else "N/A",
-            'gross_margin': f"{info.get('grossMargins', 0) * 100:.2f}%" if info.get('grossMargins') else "N/A",
-            'roe': f"{info.get('returnOnEquity', 0) * 100:.2f}%" if info.get('returnOnEquity') else "N/A",
-            'roa': f"{info.get('returnOnAssets', 0) * 100:.2f}%" if info.get('returnOnAssets') else "N/A",
-            
-            # Financial Health
-            'current_ratio': f"{info.get('currentRatio', 0):.2f}" if info.get('currentRatio') else "N/A",
-            'quick_ratio': f"{info.get('quickRatio', 0):.2f}" if info.get('quickRatio') else "N/A",
-            'debt_to_equity': f"{info.get('debtToEquity', 0) / 100:.2f}" if info.get('debtToEquity') else "N/A",
-            'total_debt': f"${info.get('totalDebt', 0) / 1e9:.2f}B" if info.get('totalDebt') else "N/A",
-            'total_cash': f"${info.get('totalCash', 0) / 1e9:.2f}B" if info.get('totalCash') else "N/A",
-            
-            # Growth Metrics
-            'revenue_growth': f"{info.get('revenueGrowth', 0) * 100:.2f}%" if info.get('revenueGrowth') else "N/A",
-            'earnings_growth': f"{info.get('earningsGrowth', 0) * 100:.2f}%" if info.get('earningsGrowth') else "N/A",
-            
-            # Per Share Metrics
-            'eps_trailing': f"${info.get('trailingEps', 0):.2f}" if info.get('trailingEps') else "N/A",
-            'eps_forward': f"${info.get('forwardEps', 0):.2f}" if info.get('forwardEps') else "N/A",
-            'book_value_per_share': f"${info.get('bookValue', 0):.2f}" if info.get('bookValue') else "N/A",
-            'free_cash_flow_per_share': f"${info.get('freeCashflow', 0) / info.get('sharesOutstanding', 1):.2f}" if info.get('freeCashflow') and info.get('sharesOutstanding') else "N/A",
-            
-            # Dividend Info
-            'dividend_yield': f"{info.get('dividendYield', 0) * 100:.2f}%" if info.get('dividendYield') else "N/A",
-            'payout_ratio': f"{info.get('payoutRatio', 0) * 100:.2f}%" if info.get('payoutRatio') else "N/A",
-            
-            # Analyst Data
-            'target_price': f"${info.get('targetMeanPrice', 0):.2f}" if info.get('targetMeanPrice') else "N/A",
-            'recommendation': info.get('recommendationKey', 'N/A'),
-            'num_analysts': info.get('numberOfAnalystOpinions', 0),
-        }
+        # Extract key metrics as raw values; formatting happens only for display
+        summary = {'ticker': ticker}
+        summary.update({key: extract(info) for key, extract, _ in KPI_SPECS})
         
-        # Print formatted summary
-        print("🏢 COMPANY INFO:")
-        print(f"   • Name: {summary['company_name']}")
-        print(f"   • Sector: {summary['sector']}")
-        print(f"   • Industry: {summary['industry']}")
-        
-        print("\n💰 MARKET DATA:")
-        print(f"   • Current Price: {summary['current_price']}")
-        print(f"   • Market Cap: {summary['market_cap']}")
-        print(f"   • Enterprise Value: {summary['enterprise_value']}")
-        
-        print("\n📊 VALUATION RATIOS:")
-        print(f"   • P/E Ratio (Trailing): {summary['pe_ratio']}")
-        print(f"   • P/E Ratio (Forward): {summary['forward_pe']}")
-        print(f"   • PEG Ratio: {summary['peg_ratio']}")
-        print(f"   • P/B Ratio: {summary['pb_ratio']}")
-        print(f"   • P/S Ratio: {summary['ps_ratio']}")
-        print(f"   • EV/EBITDA: {summary['ev_to_ebitda']}")
-        
-        print("\n📈 PROFITABILITY:")
-        print(f"   • ROE: {summary['roe']}")
-        print(f"   • ROA: {summary['roa']}")
-        print(f"   • Profit Margin: {summary['profit_margin']}")
-        print(f"   • Operating Margin: {summary['operating_margin']}")
-        print(f"   • Gross Margin: {summary['gross_margin']}")
-        
-        print("\n💵 FINANCIAL HEALTH:")
-        print(f"   • Current Ratio: {summary['current_ratio']}")
-        print(f"   • Quick Ratio: {summary['quick_ratio']}")
-        print(f"   • Debt/Equity: {summary['debt_to_equity']}")
-        print(f"   • Total Debt: {summary['total_debt']}")
-        print(f"   • Total Cash: {summary['total_cash']}")
-        
-        print("\n🚀 GROWTH:")
-        print(f"   • Revenue Growth: {summary['revenue_growth']}")
-        print(f"   • Earnings Growth: {summary['earnings_growth']}")
-        
-        print("\n💸 PER SHARE:")
-        print(f"   • EPS (Trailing): {summary['eps_trailing']}")
-        print(f"   • EPS (Forward): {summary['eps_forward']}")
-        print(f"   • Book Value: {summary['book_value_per_share']}")
-        print(f"   • FCF Per Share: {summary['free_cash_flow_per_share']}")
-        
-        if summary['dividend_yield'] != "N/A" and summary['dividend_yield'] != "0.00%":
-            print("\n💰 DIVIDEND:")
-            print(f"   • Dividend Yield: {summary['dividend_yield']}")
-            print(f"   • Payout Ratio: {summary['payout_ratio']}")
-        
-        print("\n🎯 ANALYST DATA:")
-        print(f"   • Target Price: {summary['target_price']}")
-        print(f"   • Recommendation: {summary['recommendation'].upper()}")
-        print(f"   • Number of Analysts: {summary['num_analysts']}")
+        # Print formatted summary in one write so threaded callers don't interleave
+        lines = []
+        for i, (header, fields) in enumerate(KPI_SECTIONS):
+            if header == "💰 DIVIDEND" and format_kpi(summary, 'dividend_yield') in ("N/A", "0.00%"):
+                continue
+            lines.append(("\n" if i else "") + f"{header}:")
+            lines.extend(f"   • {label}: {format_kpi(summary, key)}" for label, key in fields)
+        print("\n".join(lines))
         
         # Save summary
         json_path = self.analysis_dir / f"{ticker}_kpi_summary.json"
-        with open(json_path, 'w') as f:
-            json.dump(summary, f, indent=2)
+        save_json(summary, json_path)
         print(f"\n💾 Saved: {json_path}")
         
         return summary
     
-    def compare_companies(self, tickers: List[str]) -> pd.DataFrame:
+    def compare_companies(
+        self,
+        tickers: List[str],
+        verbose: bool = False,
+        display: bool = False
+    ) -> pd.DataFrame:
         """
         Compare key metrics across multiple companies
         Perfect for peer benchmarking
-        """
-        print(f"\n{'='*80}")
-        print(f"📊 PEER COMPARISON: {', '.join(tickers)}")
-        print(f"{'='*80}\n")
         
-        comparison_data = []
+        Args:
+            tickers: Ticker symbols to compare
+            verbose: Print progress for each ticker
+            display: Print the comparison table (formatting every cell is slow for large peer sets)
         
-        for ticker in tickers:
-            print(f"Fetching data for {ticker}...")
-            
-            info = self.get_company_info(ticker)
-            
-            if not info:
-                continue
-            
-            row = {
-                'Ticker': ticker,
-                'Company': info.get('shortName', ticker),
-                'Market Cap ($B)': round(info.get('marketCap', 0) / 1e9, 2) if info.get('marketCap') else None,
-                'P/E': round(info.get('trailingPE', 0), 2) if info.get('trailingPE') else None,
-                'P/B': round(info.get('priceToBook', 0), 2) if info.get('priceToBook') else None,
-                'ROE (%)': round(info.get('returnOnEquity', 0) * 100, 2) if info.get('returnOnEquity') else None,
-                'ROA (%)': round(info.get('returnOnAssets', 0) * 100, 2) if info.get('returnOnAssets') else None,
-                'Profit Margin (%)': round(info.get('profitMargins', 0) * 100, 2) if info.get('profitMargins') else None,
-                'Debt/Equity': round(info.get('debtToEquity', 0) / 100, 2) if info.get('debtToEquity') else None,
-                'Current Ratio': round(info.get('currentRatio', 0), 2) if info.get('currentRatio') else None,
-                'Revenue Growth (%)': round(info.get('revenueGrowth', 0) * 100, 2) if info.get('revenueGrowth') else None,
-                'Earnings Growth (%)': round(info.get('earningsGrowth', 0) * 100, 2) if info.get('earningsGrowth') else None,
-                'Dividend Yield (%)': round(info.get('dividendYield', 0) * 100, 2) if info.get('dividendYield') else None,
-                'Recommendation': info.get('recommendationKey', 'N/A'),
-            }
-            
-            comparison_data.append(row)
-        
-        df = pd.DataFrame(comparison_data)
+        Returns:
+            Comparison DataFrame (always saved)
+        """
+        if verbose:
+            print(f"\n{'='*80}")
+            print(f"📊 PEER COMPARISON: {', '.join(tickers)}")
+            print(f"{'='*80}\n")
+        
+        fetched = [
+            (ticker, info)
+            for ticker, info in zip(tickers, self._fetch_infos(tickers, verbose=verbose))
+            if info
+        ]
+        df = self._comparison_frame(fetched)
         
         if df.empty:
             print("❌ No data to compare")
             return df
         
         # Save comparison
-        csv_path = self.analysis_dir / f"comparison_{'_'.join(tickers)}.csv"
-        df.to_csv(csv_path, index=False)
+        saved_path = save_frame(
+            df, self.analysis_dir / f"comparison_{'_'.join(tickers)}", self.format, index=False
+        )
+        
+        if display:
+            print(f"\n📊 Comparison Table:")
+            print(df.to_string(index=False))
+        if verbose or display:
+            print(f"\n💾 Saved: {saved_path}")
+        
+        return df
+    
+    @staticmethod
+    def _comparison_frame(fetched: List[Tuple[str, Dict]]) -> pd.DataFrame:
+        """Build the peer comparison table from (ticker, info) pairs in one vectorized pass"""
+        if not fetched:
+            return pd.DataFrame()
         
-        print(f"\n📊 Comparison Table:")
-        print(df.to_string(index=False))
-        print(f"\n💾 Saved: {csv_path}")
+        tickers = [ticker for ticker, _ in fetched]
+        raw = pd.DataFrame.from_records([info for _, info in fetched])
+        raw = raw.reindex(columns=[field for _, field, _, _ in COMPARISON_COLUMNS])
+        
+        df = pd.DataFrame({
+            'Ticker': tickers,
+            'Company': [info.get('shortName', ticker) for ticker, info in fetched],
+        })
+        for column, field, scale, divisor in COMPARISON_COLUMNS:
+            values = pd.to_numeric(raw[field], errors='coerce')
+            # Missing and zero fields are reported as empty, as before
+            values = values.where(values.notna() & (values != 0))
+            df[column] = (values * scale / divisor).round(2).to_numpy()
+        df['Recommendation'] = [info.get('recommendationKey', 'N/A') for _, info in fetched]
+        
+        # Repeated short labels: category dtype keeps filters and group-bys cheap
+        for column in ('Ticker', 'Company', 'Recommendation'):
+            df[column] = df[column].astype('category')
         
         return df
     
+    def _fetch_infos(
+        self,
+        tickers: List[str],
+        max_workers: int = 16,
+        verbose: bool = True
+    ) -> List[Dict]:
+        """
+        Fetch company info for many tickers concurrently
+        
+        yfinance is blocking but network-bound, so a thread pool overlaps the
+        per-ticker round-trips. Results are returned in ticker order.
+        """
+        if not tickers:
+            return []
+        
+        def fetch(ticker: str) -> Dict:
+            if verbose:
+                print(f"Fetching data for {ticker}...")
+            try:
+                return self.get_company_info(ticker, persist=False)
+            except Exception as e:
+                print(f"❌ Error fetching info for {ticker}: {e}")
+                return {}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as executor:
+            return list(executor.map(fetch, tickers))
+    
     def get_complete_fundamental_data(self, ticker: str) -> Dict:
         """
         Get all fundamental data for a company
@@ -324,18 +460,43 @@ class FundamentalDataFetcher:
         
         result = {}
         
-        # 1. Company Info & KPIs
-        print("\n📋 Company Info & Key Metrics")
-        result['kpi_summary'] = self.create_kpi_summary(ticker)
-        
-        # 2. Financial Statements
-        print("\n📊 Financial Statements")
-        result['income_statement'] = self.get_income_statement(ticker)
-        result['balance_sheet'] = self.get_balance_sheet(ticker)
-        result['cash_flow'] = self.get_cash_flow(ticker)
+        # Company info/KPIs and the three statements are independent requests,
+        # so fetch them concurrently
+        print("\n📋 Company Info, Key Metrics & Financial Statements")
+        stock = self._ticker(ticker)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                'kpi_summary': executor.submit(self.create_kpi_summary, ticker),
+                'income_statement': executor.submit(self.get_income_statement, ticker, stock=stock),
+                'balance_sheet': executor.submit(self.get_balance_sheet, ticker, stock=stock),
+                'cash_flow': executor.submit(self.get_cash_flow, ticker, stock=stock),
+            }
+            for key, future in futures.items():
+                result[key] = future.result()
         
         print("\n" + "="*80)
         print("✅ COMPLETE FUNDAMENTAL DATA FETCHED")
         print("="*80)
         
         return result
+    
+    async def get_complete_fundamental_data_async(self, ticker: str) -> Dict:
+        """
+        Async get_complete_fundamental_data for callers already on an event loop
+        
+        The KPI summary and the three statements are gathered concurrently, each
+        blocking yfinance call running in a worker thread.
+        """
+        stock = self._ticker(ticker)
+        kpi_summary, income_statement, balance_sheet, cash_flow = await asyncio.gather(
+            asyncio.to_thread(self.create_kpi_summary, ticker),
+            asyncio.to_thread(self.get_income_statement, ticker, stock=stock),
+            asyncio.to_thread(self.get_balance_sheet, ticker, stock=stock),
+            asyncio.to_thread(self.get_cash_flow, ticker, stock=stock),
+        )
+        return {
+            'kpi_summary': kpi_summary,
+            'income_statement': income_statement,
+            'balance_sheet': balance_sheet,
+            'cash_flow': cash_flow,
+        }
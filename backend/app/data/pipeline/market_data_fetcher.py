@@ -7,22 +7,59 @@ Data Source: yfinance (Yahoo Finance)
 - Reliable for MVP
 - Includes earnings calendar, analyst estimates, price history
 """
-import yfinance as yf
 import pandas as pd
+from pathlib import Path
 from datetime import datetime, timedelta
-import json
-from typing import Dict, List
+import numpy as np
+from typing import Dict, List, Tuple
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 from app.config import DATA_OUTPUT_DIR
+from app.data.pipeline.frame_io import FrameFormat, downcast_numeric, save_frame, save_json
+from app.data.pipeline.yf_session import TickerFactory, make_cached_session
+
+
+def _longest_run(mask: np.ndarray) -> int:
+    """Length of the longest run of consecutive True values"""
+    longest = current = 0
+    for flag in mask:
+        if flag:
+            current += 1
+            if current > longest:
+                longest = current
+        else:
+            current = 0
+    return longest
+
+
+if njit is not None:
+    _longest_run = njit(cache=True)(_longest_run)
 
 
 class MarketDataFetcher:
     """Fetch market data using yfinance"""
     
-    def __init__(self, data_dir: str | None = None):
+    def __init__(
+        self,
+        data_dir: str | None = None,
+        cache_hours: int = 6,
+        format: FrameFormat = "parquet"
+    ):
         self.data_dir = Path(data_dir) if data_dir else DATA_OUTPUT_DIR / "market_data"
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.format = format
+        
+        # One HTTP-cached session and one Ticker per symbol for the fetcher's lifetime
+        self._ticker = TickerFactory(
+            make_cached_session(self.data_dir / "http_cache.sqlite", cache_hours)
+        )
+        # Earnings calendars fetched by this instance, reused for cache_hours
+        self._cache_ttl = timedelta(hours=cache_hours)
+        self._earnings_dates_cache: Dict[str, Tuple[datetime, pd.DataFrame]] = {}
         
         self.prices_dir = self.data_dir / "prices"
         self.earnings_dir = self.data_dir / "earnings"
@@ -50,17 +87,17 @@ class MarketDataFetcher:
         """
         print(f"📊 Fetching price history for {ticker} ({period})...")
         
-        stock = yf.Ticker(ticker)
+        stock = self._ticker(ticker)
         df = stock.history(period=period, interval=interval)
         
         if df.empty:
             print(f"❌ No price data found for {ticker}")
             return pd.DataFrame()
         
-        # Save to CSV
-        csv_path = self.prices_dir / f"{ticker}_{period}_{interval}.csv"
-        df.to_csv(csv_path)
-        print(f"💾 Saved: {csv_path}")
+        saved_path = save_frame(
+            downcast_numeric(df), self.prices_dir / f"{ticker}_{period}_{interval}", self.format
+        )
+        print(f"💾 Saved: {saved_path}")
         
         return df
     
@@ -71,19 +108,24 @@ class MarketDataFetcher:
         Returns:
             DataFrame with earnings dates and estimates
         """
+        cached = self._earnings_dates_cache.get(ticker)
+        if cached is not None and datetime.now() - cached[0] < self._cache_ttl:
+            return cached[1]
+        
         print(f"📅 Fetching earnings calendar for {ticker}...")
         
-        stock = yf.Ticker(ticker)
+        stock = self._ticker(ticker)
         
         try:
             earnings_dates = stock.earnings_dates
             
             if earnings_dates is not None and not earnings_dates.empty:
-                # Save to CSV
-                csv_path = self.earnings_dir / f"{ticker}_earnings_calendar.csv"
-                earnings_dates.to_csv(csv_path)
-                print(f"💾 Saved: {csv_path}")
+                saved_path = save_frame(
+                    earnings_dates, self.earnings_dir / f"{ticker}_earnings_calendar", self.format
+                )
+                print(f"💾 Saved: {saved_path}")
                 
+                self._earnings_dates_cache[ticker] = (datetime.now(), earnings_dates)
                 return earnings_dates
             else:
                 print(f"⚠️  No earnings dates available for {ticker}")
@@ -102,7 +144,7 @@ class MarketDataFetcher:
         """
         print(f"📈 Fetching earnings history for {ticker}...")
         
-        stock = yf.Ticker(ticker)
+        stock = self._ticker(ticker)
         
         result = {
             'quarterly': stock.quarterly_earnings,
@@ -118,8 +160,7 @@ class MarketDataFetcher:
         if result['annual'] is not None and not result['annual'].empty:
             save_data['annual'] = result['annual'].to_dict()
         
-        with open(json_path, 'w') as f:
-            json.dump(save_data, f, indent=2, default=str)
+        save_json(save_data, json_path)
         
         print(f"💾 Saved: {json_path}")
         
@@ -134,7 +175,7 @@ class MarketDataFetcher:
         """
         print(f"🎯 Fetching analyst data for {ticker}...")
         
-        stock = yf.Ticker(ticker)
+        stock = self._ticker(ticker)
         
         result = {
             'recommendations': stock.recommendations,
@@ -143,19 +184,19 @@ class MarketDataFetcher:
             'revenue_estimate': stock.revenue_estimate
         }
         
-        # Save to JSON
+        # DataFrames go to sidecar files; the JSON keeps plain values and file references
         json_path = self.analysis_dir / f"{ticker}_analyst_data.json"
         
         save_data = {}
         for key, value in result.items():
             if value is not None and not (isinstance(value, pd.DataFrame) and value.empty):
                 if isinstance(value, pd.DataFrame):
-                    save_data[key] = value.to_dict()
+                    frame_path = save_frame(value, self.analysis_dir / f"{ticker}_{key}", self.format)
+                    save_data[key] = {'file': frame_path.name}
                 else:
                     save_data[key] = value
         
-        with open(json_path, 'w') as f:
-            json.dump(save_data, f, indent=2, default=str)
+        save_json(save_data, json_path)
         
         print(f"💾 Saved: {json_path}")
         
@@ -186,21 +227,28 @@ class MarketDataFetcher:
         start_date = earnings_date - timedelta(days=days_before + 5)
         end_date = earnings_date + timedelta(days=days_after + 5)
         
-        stock = yf.Ticker(ticker)
+        stock = self._ticker(ticker)
         df = stock.history(start=start_date, end=end_date, interval="1d")
         
         if df.empty:
             print(f"❌ No price data available around {earnings_date.date()}")
             return {}
         
-        # Find closest trading day to earnings date
-        df['date_diff'] = abs((df.index - earnings_date).days)
-        earnings_day_idx = df['date_diff'].idxmin()
+        # Find closest trading day to earnings date (index is sorted by date)
+        target = pd.Timestamp(earnings_date)
+        if df.index.tz is not None and target.tz is None:
+            target = target.tz_localize(df.index.tz)
+        pos = int(df.index.searchsorted(target))
+        if pos == len(df) or (pos > 0 and target - df.index[pos - 1] <= df.index[pos] - target):
+            pos -= 1
         
         # Get before/after prices
         try:
-            day_before_price = df.loc[:earnings_day_idx].iloc[-2]['Close']
-            earnings_day_close = df.loc[earnings_day_idx]['Close']
+            if pos < 1:
+                raise IndexError("no trading day before the earnings date in the window")
+            close = df['Close']
+            day_before_price = close.iat[pos - 1]
+            earnings_day_close = close.iat[pos]
             
             # Calculate returns over different periods
             reaction = {
@@ -210,14 +258,17 @@ class MarketDataFetcher:
                 'immediate_reaction_%': float(((earnings_day_close - day_before_price) / day_before_price) * 100),
             }
             
-            # Multi-day reaction
-            after_df = df.loc[earnings_day_idx:].iloc[1:days_after+1]
+            # Multi-day reaction, computed for the whole window at once
+            after = close.iloc[pos + 1:pos + 1 + days_after].to_numpy(dtype=np.float64)
+            day_returns = (after - earnings_day_close) / earnings_day_close * 100
+            cumulative_returns = (after - day_before_price) / day_before_price * 100
             
-            if not after_df.empty:
-                for i, (date, row) in enumerate(after_df.iterrows(), 1):
-                    reaction[f'day_{i}_close'] = float(row['Close'])
-                    reaction[f'day_{i}_return_%'] = float(((row['Close'] - earnings_day_close) / earnings_day_close) * 100)
-                    reaction[f'cumulative_return_day_{i}_%'] = float(((row['Close'] - day_before_price) / day_before_price) * 100)
+            for i, (day_close, day_return, cumulative) in enumerate(
+                zip(after.tolist(), day_returns.tolist(), cumulative_returns.tolist()), 1
+            ):
+                reaction[f'day_{i}_close'] = day_close
+                reaction[f'day_{i}_return_%'] = day_return
+                reaction[f'cumulative_return_day_{i}_%'] = cumulative
             
             # Determine reaction type
             immediate = reaction['immediate_reaction_%']
@@ -259,17 +310,17 @@ class MarketDataFetcher:
         surprises = earnings_dates[earnings_dates['Reported EPS'].notna()].head(limit)
         
         if not surprises.empty:
-            # Calculate surprise percentage
-            surprises = surprises.copy()
-            surprises['EPS Surprise %'] = (
-                (surprises['Reported EPS'] - surprises['EPS Estimate']) / 
-                abs(surprises['EPS Estimate']) * 100
-            )
+            # Calculate surprise percentage on raw arrays; assign adds the one column
+            reported = surprises['Reported EPS'].to_numpy(dtype=np.float64, na_value=np.nan)
+            estimate = surprises['EPS Estimate'].to_numpy(dtype=np.float64, na_value=np.nan)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                surprise_pct = (reported - estimate) / np.abs(estimate) * 100
+            surprises = surprises.assign(**{'EPS Surprise %': surprise_pct})
             
-            # Save to CSV
-            csv_path = self.earnings_dir / f"{ticker}_earnings_surprises.csv"
-            surprises.to_csv(csv_path)
-            print(f"💾 Saved: {csv_path}")
+            saved_path = save_frame(
+                surprises, self.earnings_dir / f"{ticker}_earnings_surprises", self.format
+            )
+            print(f"💾 Saved: {saved_path}")
         
         return surprises
     
@@ -302,56 +353,34 @@ class MarketDataFetcher:
             'consecutive_misses': 0
         }
         
-        # Count beats/misses
-        for _, row in surprises.iterrows():
-            surprise = row['EPS Surprise %']
-            if surprise > 1:  # Beat by >1%
-                analysis['beat_count'] += 1
-            elif surprise < -1:  # Miss by >1%
-                analysis['miss_count'] += 1
-            else:
-                analysis['meet_count'] += 1
+        # Beat above +1%, miss below -1%, anything else (including NaN) a meet
+        surprise_pct = surprises['EPS Surprise %'].to_numpy(dtype=np.float64)
+        beat_mask = surprise_pct > 1
+        miss_mask = surprise_pct < -1
+        analysis['beat_count'] = int(beat_mask.sum())
+        analysis['miss_count'] = int(miss_mask.sum())
+        analysis['meet_count'] = len(surprise_pct) - analysis['beat_count'] - analysis['miss_count']
         
         analysis['avg_surprise_%'] = float(surprises['EPS Surprise %'].mean())
         analysis['beat_rate_%'] = (analysis['beat_count'] / len(surprises)) * 100
         
-        # Check for consecutive patterns
-        consecutive_beats = 0
-        consecutive_misses = 0
-        current_beat_streak = 0
-        current_miss_streak = 0
-        
-        for _, row in surprises.iterrows():
-            surprise = row['EPS Surprise %']
-            if surprise > 1:
-                current_beat_streak += 1
-                current_miss_streak = 0
-            elif surprise < -1:
-                current_miss_streak += 1
-                current_beat_streak = 0
-            else:
-                current_beat_streak = 0
-                current_miss_streak = 0
-            
-            consecutive_beats = max(consecutive_beats, current_beat_streak)
-            consecutive_misses = max(consecutive_misses, current_miss_streak)
-        
-        analysis['max_consecutive_beats'] = consecutive_beats
-        analysis['max_consecutive_misses'] = consecutive_misses
+        analysis['max_consecutive_beats'] = int(_longest_run(beat_mask))
+        analysis['max_consecutive_misses'] = int(_longest_run(miss_mask))
         
-        # Print summary
-        print(f"📈 Pattern Summary:")
-        print(f"   • Total Quarters: {analysis['quarters_analyzed']}")
-        print(f"   • Beats: {analysis['beat_count']} ({analysis['beat_rate_%']:.1f}%)")
-        print(f"   • Misses: {analysis['miss_count']}")
-        print(f"   • Meets: {analysis['meet_count']}")
-        print(f"   • Avg Surprise: {analysis['avg_surprise_%']:.2f}%")
-        print(f"   • Max Consecutive Beats: {analysis['max_consecutive_beats']}")
+        # Print summary in one write
+        print("\n".join([
+            "📈 Pattern Summary:",
+            f"   • Total Quarters: {analysis['quarters_analyzed']}",
+            f"   • Beats: {analysis['beat_count']} ({analysis['beat_rate_%']:.1f}%)",
+            f"   • Misses: {analysis['miss_count']}",
+            f"   • Meets: {analysis['meet_count']}",
+            f"   • Avg Surprise: {analysis['avg_surprise_%']:.2f}%",
+            f"   • Max Consecutive Beats: {analysis['max_consecutive_beats']}",
+        ]))
         
         # Save analysis
         json_path = self.analysis_dir / f"{ticker}_earnings_pattern.json"
-        with open(json_path, 'w') as f:
-            json.dump(analysis, f, indent=2)
+        save_json(analysis, json_path)
         
         print(f"\n💾 Saved: {json_path}")
         
@@ -359,5 +388,5 @@ class MarketDataFetcher:
     
     def get_company_info(self, ticker: str) -> Dict:
         """Get basic company information"""
-        stock = yf.Ticker(ticker)
+        stock = self._ticker(ticker)
         return stock.info
@@ -2,10 +2,31 @@
 SEC EDGAR Data Fetcher
 Retrieves financial data from SEC EDGAR database with proper rate limiting and caching
 """
+import asyncio
+import hashlib
+import importlib.util
+import json
+import random
 import time
+from contextlib import asynccontextmanager
+from typing import AbstractSet, AsyncIterator, Dict, Optional
+
+import httpx
 import requests
-from typing import Dict, Optional
-from diskcache import Cache
+from diskcache import UNKNOWN, Cache, Disk
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3Error
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 from app.config import (
     SEC_HEADERS,
@@ -16,6 +37,65 @@ from app.config import (
     MAX_RETRIES,
     CACHE_DIR,
 )
+from app.data.pipeline.financial_data_parser import prune_facts, stream_facts, stream_facts_async
+
+# SEC allows 10 requests/second; REQUEST_DELAY spaces them, this caps in-flight ones
+MAX_CONCURRENCY = 10
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Ask for brotli only when a decoder is installed (requests and httpx both use it)
+_HAS_BROTLI = any(importlib.util.find_spec(name) for name in ("brotli", "brotlicffi"))
+HTTP_HEADERS = {
+    **SEC_HEADERS,
+    "Accept-Encoding": "gzip, deflate, br" if _HAS_BROTLI else "gzip, deflate",
+}
+
+# The ticker list changes rarely, filings daily; company facts use cache_hours
+COMPANY_TICKERS_TTL = 7 * 24 * 3600
+SUBMISSIONS_TTL = 6 * 3600
+# The ticker index is small and read per lookup, so it gets its own never-evicted
+# cache; company facts and submissions share a larger LRU-bounded one
+TICKERS_CACHE_SIZE = 50 * 1024 ** 2
+FACTS_CACHE_SIZE = 5 * 1024 ** 3
+TICKERS_CACHE_KEYS = frozenset({"company_tickers", "ticker_map"})
+# Failures while reading or parsing a (streamed) body, beyond the HTTP clients'
+# own request errors: dropped connections mid-body, truncated or invalid JSON
+BODY_ERRORS = (json.JSONDecodeError, Urllib3Error) + ((ijson.JSONError,) if ijson is not None else ())
+# Up to 10% extra TTL per entry so a bulk download's entries don't all expire together
+TTL_JITTER = 0.1
+
+
+class _ResponseReader:
+    """Async read(size) over an httpx streaming response, as ijson.parse_async expects"""
+    
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+    
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes the stream type with read(0); chunks may exceed size
+        if size == 0:
+            return b""
+        return await anext(self._chunks, b"")
+
+
+class OrjsonDisk(Disk):
+    """
+    diskcache Disk that stores JSON response values as orjson bytes instead of pickles
+    
+    Keys are plain strings, which diskcache already stores natively.
+    Entries pickled by the default Disk are still read back unchanged.
+    """
+    
+    def store(self, value, read, key=UNKNOWN):
+        if not read:
+            value = orjson.dumps(value)
+        return super().store(value, read, key=key)
+    
+    def fetch(self, mode, filename, value, read):
+        data = super().fetch(mode, filename, value, read)
+        if not read and isinstance(data, bytes):
+            data = orjson.loads(data)
+        return data
 
 
 class SECDataFetcher:
@@ -28,10 +108,38 @@ class SECDataFetcher:
         Args:
             cache_hours: Number of hours to cache responses (default: 24)
         """
-        self.cache = Cache(str(CACHE_DIR))
+        disk = OrjsonDisk if orjson is not None else Disk
+        self.tickers_cache = Cache(
+            str(CACHE_DIR / "tickers"), disk=disk,
+            size_limit=TICKERS_CACHE_SIZE, eviction_policy="none",
+        )
+        self.facts_cache = Cache(
+            str(CACHE_DIR / "facts"), disk=disk,
+            size_limit=FACTS_CACHE_SIZE, eviction_policy="least-recently-used",
+        )
         self.cache_ttl = cache_hours * 3600  # Convert to seconds
         self.last_request_time = 0
         
+        # Keep-alive session; urllib3 retries 429/5xx with exponential backoff
+        # and honours Retry-After, for MAX_RETRIES attempts in total
+        self.session = requests.Session()
+        self.session.headers.update(HTTP_HEADERS)
+        retries = Retry(
+            total=MAX_RETRIES - 1,
+            backoff_factor=1,
+            status_forcelist=RETRYABLE_STATUS,
+            allowed_methods=frozenset({"GET"}),
+        )
+        self.session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retries))
+        
+        # Set while an async_session() is open
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._rate_lock: Optional[asyncio.Lock] = None
+        
+        # Ticker -> company map, built once per instance
+        self._ticker_map: Optional[Dict[str, Dict]] = None
+        
     def _rate_limit(self):
         """Enforce rate limiting between requests"""
         elapsed = time.time() - self.last_request_time
@@ -39,44 +147,174 @@ class SECDataFetcher:
             time.sleep(REQUEST_DELAY - elapsed)
         self.last_request_time = time.time()
     
-    def _make_request(self, url: str, use_cache: bool = True) -> Optional[Dict]:
+    def _cache_for(self, key: str) -> Cache:
+        """Sub-cache holding entries for this key"""
+        return self.tickers_cache if key in TICKERS_CACHE_KEYS else self.facts_cache
+    
+    def _cache_lookup(self, key: str, url: str) -> Optional[Dict]:
+        """Single cache read; None on a miss"""
+        data = self._cache_for(key).get(key)
+        if data is not None:
+            print(f"📦 Using cached data for: {url}")
+        return data
+    
+    def _cache_store(self, key: str, data: Dict, ttl: Optional[int]):
+        """Cache a response with a jittered TTL (cache_hours if ttl is None)"""
+        ttl = self.cache_ttl if ttl is None else ttl
+        self._cache_for(key).set(key, data, expire=ttl + random.uniform(0, ttl * TTL_JITTER))
+    
+    def _make_request(
+        self,
+        url: str,
+        use_cache: bool = True,
+        cache_key: Optional[str] = None,
+        cache_ttl: Optional[int] = None,
+        concepts: Optional[AbstractSet[str]] = None
+    ) -> Optional[Dict]:
         """
-        Make HTTP request to SEC with retries and caching
+        Make HTTP request to SEC with retries (via the session) and caching
         
         Args:
             url: URL to fetch
             use_cache: Whether to use cached response
+            cache_key: Cache key (default: the URL)
+            cache_ttl: Seconds to cache the response (default: cache_hours)
+            concepts: For companyfacts, the us-gaap concepts to keep; the body
+                is stream-parsed and only the pruned dict is built and cached
             
         Returns:
             JSON response as dictionary or None if failed
         """
+        cache_key = cache_key or url
+        
         # Check cache first
-        if use_cache and url in self.cache:
-            print(f"📦 Using cached data for: {url}")
-            return self.cache[url]
+        if use_cache:
+            data = self._cache_lookup(cache_key, url)
+            if data is not None:
+                return data
         
-        # Make request with retries
-        for attempt in range(MAX_RETRIES):
-            try:
-                self._rate_limit()
-                print(f"🌐 Fetching: {url} (attempt {attempt + 1}/{MAX_RETRIES})")
-                
-                response = requests.get(url, headers=SEC_HEADERS, timeout=30)
-                response.raise_for_status()
-                
+        try:
+            self._rate_limit()
+            print(f"🌐 Fetching: {url}")
+            
+            response = self.session.get(url, timeout=30, stream=concepts is not None)
+            response.raise_for_status()
+            
+            if concepts is None:
                 data = response.json()
-                
-                # Cache successful response
-                self.cache.set(url, data, expire=self.cache_ttl)
-                
+            elif ijson is not None:
+                with response:
+                    response.raw.decode_content = True
+                    data = stream_facts(response.raw, concepts)
+            else:
+                data = prune_facts(response.json(), concepts)
+            
+            # Cache successful response
+            self._cache_store(cache_key, data, cache_ttl)
+            
+            return data
+            
+        except (requests.exceptions.RequestException, *BODY_ERRORS) as e:
+            print(f"⚠️  Request failed: {e}")
+            print(f"❌ Failed to fetch {url}")
+            return None
+    
+    @asynccontextmanager
+    async def async_session(self, max_concurrency: int = MAX_CONCURRENCY) -> AsyncIterator["SECDataFetcher"]:
+        """
+        Open a shared HTTP client for concurrent async requests
+        
+        Args:
+            max_concurrency: Maximum requests in flight at once
+        """
+        limits = httpx.Limits(
+            max_connections=max_concurrency,
+            max_keepalive_connections=max_concurrency,
+        )
+        async with httpx.AsyncClient(headers=HTTP_HEADERS, timeout=30, limits=limits) as client:
+            self._client = client
+            self._semaphore = asyncio.Semaphore(max_concurrency)
+            self._rate_lock = asyncio.Lock()
+            try:
+                yield self
+            finally:
+                self._client = self._semaphore = self._rate_lock = None
+    
+    async def _rate_limit_async(self):
+        """Async _rate_limit: concurrent requests still start REQUEST_DELAY apart"""
+        async with self._rate_lock:
+            elapsed = time.time() - self.last_request_time
+            if elapsed < REQUEST_DELAY:
+                await asyncio.sleep(REQUEST_DELAY - elapsed)
+            self.last_request_time = time.time()
+    
+    async def _make_request_async(
+        self,
+        url: str,
+        use_cache: bool = True,
+        cache_key: Optional[str] = None,
+        cache_ttl: Optional[int] = None,
+        concepts: Optional[AbstractSet[str]] = None
+    ) -> Optional[Dict]:
+        """
+        Async _make_request; 429 and 5xx responses and network errors are retried
+        
+        Args:
+            url: URL to fetch
+            use_cache: Whether to use cached response
+            cache_key: Cache key (default: the URL)
+            cache_ttl: Seconds to cache the response (default: cache_hours)
+            concepts: us-gaap concepts to keep (see _make_request)
+            
+        Returns:
+            JSON response as dictionary or None if failed
+        """
+        cache_key = cache_key or url
+        
+        if use_cache:
+            data = self._cache_lookup(cache_key, url)
+            if data is not None:
                 return data
+        
+        if self._client is None:
+            async with self.async_session():
+                return await self._make_request_async(url, False, cache_key, cache_ttl, concepts)
+        
+        async with self._semaphore:
+            for attempt in range(MAX_RETRIES):
+                try:
+                    await self._rate_limit_async()
+                    print(f"🌐 Fetching: {url} (attempt {attempt + 1}/{MAX_RETRIES})")
+                    
+                    async with self._client.stream("GET", url) as response:
+                        response.raise_for_status()
+                        
+                        if concepts is not None and ijson is not None:
+                            data = await stream_facts_async(_ResponseReader(response), concepts)
+                        else:
+                            await response.aread()
+                            data = response.json()
+                            if concepts is not None:
+                                data = prune_facts(data, concepts)
+                    
+                    # Cache successful response
+                    self._cache_store(cache_key, data, cache_ttl)
+                    
+                    return data
+                    
+                except httpx.HTTPStatusError as e:
+                    print(f"⚠️  Request failed: {e}")
+                    if e.response.status_code not in RETRYABLE_STATUS:
+                        print(f"❌ Failed to fetch {url}")
+                        return None
+                except (httpx.HTTPError, *BODY_ERRORS) as e:
+                    # Includes bodies cut off or malformed mid-stream; retried like network errors
+                    print(f"⚠️  Request failed: {e}")
                 
-            except requests.exceptions.RequestException as e:
-                print(f"⚠️  Request failed: {e}")
                 if attempt == MAX_RETRIES - 1:
                     print(f"❌ Failed to fetch {url} after {MAX_RETRIES} attempts")
                     return None
-                time.sleep(2 ** attempt)  # Exponential backoff
+                await asyncio.sleep(2 ** attempt)  # Exponential backoff
         
         return None
     
@@ -87,7 +325,18 @@ class SECDataFetcher:
         Returns:
             Dictionary mapping ticker to company info (cik, name)
         """
-        data = self._make_request(SEC_COMPANY_TICKERS_URL)
+        if self._ticker_map is not None:
+            return self._ticker_map
+        
+        # The restructured map is cached too, so warm runs skip the raw index entirely
+        ticker_map = self.tickers_cache.get("ticker_map")
+        if ticker_map:
+            self._ticker_map = ticker_map
+            return ticker_map
+        
+        data = self._make_request(
+            SEC_COMPANY_TICKERS_URL, cache_key="company_tickers", cache_ttl=COMPANY_TICKERS_TTL
+        )
         
         if not data:
             return {}
@@ -104,6 +353,8 @@ class SECDataFetcher:
                 }
         
         print(f"✅ Loaded {len(ticker_map)} company tickers")
+        self._cache_store("ticker_map", ticker_map, COMPANY_TICKERS_TTL)
+        self._ticker_map = ticker_map
         return ticker_map
     
     def get_cik_from_ticker(self, ticker: str) -> Optional[str]:
@@ -126,12 +377,40 @@ class SECDataFetcher:
             print(f"❌ Ticker {ticker.upper()} not found")
             return None
     
-    def get_company_facts(self, cik: str) -> Optional[Dict]:
+    @staticmethod
+    def _facts_cache_key(cik: str, concepts: Optional[AbstractSet[str]]) -> str:
+        """Full and pruned company facts are cached separately"""
+        if concepts is None:
+            return f"companyfacts:{cik}"
+        digest = hashlib.sha1(",".join(sorted(concepts)).encode()).hexdigest()[:12]
+        return f"companyfacts:{cik}:{digest}"
+    
+    def has_cached_facts(self, ticker: str, concepts: Optional[AbstractSet[str]] = None) -> bool:
+        """
+        Whether company facts for ticker would be served from the cache
+        
+        Args:
+            ticker: Stock ticker symbol
+            concepts: Concepts the facts would be fetched with (see get_company_facts)
+        """
+        company = self.get_company_tickers().get(ticker.upper())
+        if not company:
+            return False
+        cik = str(company['cik']).zfill(10)
+        return self._facts_cache_key(cik, concepts) in self.facts_cache
+    
+    def get_company_facts(
+        self,
+        cik: str,
+        concepts: Optional[AbstractSet[str]] = None
+    ) -> Optional[Dict]:
         """
         Get all financial facts for a company by CIK
         
         Args:
             cik: Company CIK number (can be with or without leading zeros)
+            concepts: Only keep these us-gaap concepts (e.g. parser.wanted_names);
+                the multi-MB response is stream-parsed instead of loaded whole
             
         Returns:
             Dictionary containing all company financial facts
@@ -140,7 +419,29 @@ class SECDataFetcher:
         cik = str(cik).zfill(10)
         url = SEC_COMPANY_FACTS_URL.format(cik=cik)
         
-        data = self._make_request(url)
+        data = self._make_request(
+            url, cache_key=self._facts_cache_key(cik, concepts), concepts=concepts
+        )
+        
+        if data:
+            print(f"✅ Retrieved financial facts for CIK {cik}")
+            return data
+        else:
+            print(f"❌ Failed to retrieve facts for CIK {cik}")
+            return None
+    
+    async def get_company_facts_async(
+        self,
+        cik: str,
+        concepts: Optional[AbstractSet[str]] = None
+    ) -> Optional[Dict]:
+        """Async get_company_facts"""
+        cik = str(cik).zfill(10)
+        url = SEC_COMPANY_FACTS_URL.format(cik=cik)
+        
+        data = await self._make_request_async(
+            url, cache_key=self._facts_cache_key(cik, concepts), concepts=concepts
+        )
         
         if data:
             print(f"✅ Retrieved financial facts for CIK {cik}")
@@ -162,7 +463,9 @@ class SECDataFetcher:
         cik = str(cik).zfill(10)
         url = SEC_SUBMISSIONS_URL.format(cik=cik)
         
-        data = self._make_request(url)
+        data = self._make_request(
+            url, cache_key=f"submissions:{cik}", cache_ttl=SUBMISSIONS_TTL
+        )
         
         if data:
             print(f"✅ Retrieved submissions for CIK {cik}")
@@ -171,29 +474,53 @@ class SECDataFetcher:
             print(f"❌ Failed to retrieve submissions for CIK {cik}")
             return None
     
-    def get_company_data_by_ticker(self, ticker: str) -> Optional[Dict]:
+    def get_company_data_by_ticker(
+        self,
+        ticker: str,
+        concepts: Optional[AbstractSet[str]] = None
+    ) -> Optional[Dict]:
         """
         Convenience method to get company facts using ticker symbol
         
         Args:
             ticker: Stock ticker symbol
+            concepts: Only keep these us-gaap concepts (see get_company_facts)
             
         Returns:
             Company financial facts or None
         """
         cik = self.get_cik_from_ticker(ticker)
         if cik:
-            return self.get_company_facts(cik)
+            return self.get_company_facts(cik, concepts)
+        return None
+    
+    async def get_company_data_by_ticker_async(
+        self,
+        ticker: str,
+        concepts: Optional[AbstractSet[str]] = None
+    ) -> Optional[Dict]:
+        """
+        Async get_company_data_by_ticker
+        
+        The ticker map is memoized; call get_company_tickers() once before
+        fanning out so concurrent lookups don't all fetch it.
+        """
+        cik = self.get_cik_from_ticker(ticker)
+        if cik:
+            return await self.get_company_facts_async(cik, concepts)
         return None
     
     def clear_cache(self):
         """Clear all cached data"""
-        self.cache.clear()
+        self.tickers_cache.clear()
+        self.facts_cache.clear()
+        self._ticker_map = None
         print("🗑️  Cache cleared")
     
     def get_cache_stats(self) -> Dict:
         """Get cache statistics"""
+        caches = (self.tickers_cache, self.facts_cache)
         return {
-            "size": len(self.cache),
-            "volume": self.cache.volume()
+            "size": sum(len(cache) for cache in caches),
+            "volume": sum(cache.volume() for cache in caches)
         }
@@ -0,0 +1,71 @@
+"""
+yfinance Session Helpers
+Shared HTTP session and Ticker construction for the yfinance-based fetchers
+"""
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+import requests
+import yfinance as yf
+from requests.adapters import HTTPAdapter
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+
+def make_cached_session(cache_path: Path, cache_hours: int = 6, pool_size: int = 32) -> requests.Session:
+    """
+    Create a keep-alive HTTP session for Yahoo Finance requests
+
+    Args:
+        cache_path: SQLite file backing the response cache
+        cache_hours: Number of hours to keep responses (default: 6)
+        pool_size: Connections kept open per host (default: 32)
+
+    Returns:
+        requests_cache.CachedSession, or a plain requests.Session if
+        requests-cache is not installed
+    """
+    if requests_cache is not None:
+        session = requests_cache.CachedSession(
+            str(cache_path),
+            backend="sqlite",
+            expire_after=timedelta(hours=cache_hours),
+            allowable_methods=("GET", "POST"),
+        )
+    else:
+        session = requests.Session()
+
+    # Pool sized for the fetchers' thread pools so concurrent calls reuse warm TLS connections
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class TickerFactory:
+    """Builds one yf.Ticker per symbol, all sharing a single HTTP session"""
+
+    def __init__(self, session: Optional[Any] = None):
+        self.session = session
+        self._tickers = {}
+
+    def __call__(self, ticker: str) -> "yf.Ticker":
+        stock = self._tickers.get(ticker)
+        if stock is None:
+            stock = self._create(ticker)
+            self._tickers[ticker] = stock
+        return stock
+
+    def _create(self, ticker: str) -> "yf.Ticker":
+        if self.session is not None:
+            try:
+                return yf.Ticker(ticker, session=self.session)
+            except Exception as e:
+                # Newer yfinance only accepts curl_cffi sessions
+                print(f"⚠️  yfinance rejected the cached session, fetching uncached: {e}")
+                self.session = None
+        return yf.Ticker(ticker)
@@ -3,20 +3,36 @@ Bulk Data Downloader
 Download financial data for multiple companies at once
 """
 import argparse
-import json
+import asyncio
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 import pandas as pd
 from datetime import datetime
 
-BACKEND_DIR = Path(__file__).resolve().parents[3]
-if str(BACKEND_DIR) not in sys.path:
-    sys.path.insert(0, str(BACKEND_DIR))
+# Only needed when run as a file; `python -m app.data.scripts.<name>` and imports skip it
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
 from app.config import DATA_OUTPUT_DIR
+from app.data.pipeline.frame_io import json_line, load_jsonl, save_frame, save_json, write_csv
 from app.data.pipeline.sec_data_fetcher import SECDataFetcher
 from app.data.pipeline.financial_data_parser import FinancialDataParser
+from app.utils.helpers import run_async
+
+# Summary column -> annual data column (latest non-null value per company)
+SUMMARY_METRICS = {
+    'Revenue': 'Revenue',
+    'Net Income': 'NetIncome',
+    'Total Assets': 'Assets',
+    'Equity': 'Equity',
+    'Profit Margin %': 'ProfitMargin',
+    'ROE %': 'ROE',
+    'Revenue Growth %': 'Revenue_YoY_%',
+}
 
 
 def download_company_data(
@@ -40,51 +56,211 @@ def download_company_data(
     print(f"\n📥 Downloading {ticker}...")
     
     try:
-        facts = fetcher.get_company_data_by_ticker(ticker)
-        
-        if not facts:
-            print(f"   ❌ Failed to fetch {ticker}")
-            return None
-        
-        company_name = facts.get('entityName', ticker)
-        cik = facts.get('cik', 'Unknown')
-        
-        print(f"   ✅ {company_name} (CIK: {cik})")
-        
-        # Parse financial data
-        summary = parser.create_financial_summary(facts, num_periods=num_years)
-        
-        if 'annual' not in summary or summary['annual'].empty:
-            print(f"   ⚠️  No annual data available for {ticker}")
-            return None
-        
-        # Enhance with calculations
-        annual = parser.calculate_derived_metrics(summary['annual'])
-        annual = parser.calculate_growth_rates(annual)
-        
-        print(f"   ✅ Processed {len(annual)} years of data")
-        
-        return {
-            'ticker': ticker,
-            'company_name': company_name,
-            'cik': cik,
-            'annual_data': annual,
-            'quarterly_data': summary.get('quarterly')
-        }
-        
+        facts = fetcher.get_company_data_by_ticker(ticker, parser.wanted_names)
+        return process_company_data(ticker, facts, parser, num_years)
+    except Exception as e:
+        print(f"   ❌ Error processing {ticker}: {e}")
+        return None
+
+
+async def download_company_data_async(
+    ticker: str,
+    fetcher: SECDataFetcher,
+    parser: FinancialDataParser,
+    num_years: int = 10
+) -> dict:
+    """Async download_company_data; the SEC request runs concurrently with other tickers"""
+    print(f"\n📥 Downloading {ticker}...")
+    
+    try:
+        facts = await fetcher.get_company_data_by_ticker_async(ticker, parser.wanted_names)
+        return process_company_data(ticker, facts, parser, num_years)
     except Exception as e:
         print(f"   ❌ Error processing {ticker}: {e}")
         return None
 
 
-def bulk_download(tickers: List[str], num_years: int = 10, export_format: str = 'csv'):
+def process_company_data(
+    ticker: str,
+    facts: dict,
+    parser: FinancialDataParser,
+    num_years: int = 10
+) -> dict:
+    """
+    Parse downloaded company facts into annual data
+    
+    Args:
+        ticker: Stock ticker symbol
+        facts: SEC company facts (None if the download failed)
+        parser: FinancialDataParser instance
+        num_years: Number of years to include
+        
+    Returns:
+        Dictionary with company data
+    """
+    if not facts:
+        print(f"   ❌ Failed to fetch {ticker}")
+        return None
+    
+    company_name = facts.get('entityName', ticker)
+    cik = facts.get('cik', 'Unknown')
+    
+    print(f"   ✅ {company_name} (CIK: {cik})")
+    
+    # Parse financial data
+    summary = parser.create_financial_summary(facts, num_periods=num_years)
+    
+    if 'annual' not in summary or summary['annual'].empty:
+        print(f"   ⚠️  No annual data available for {ticker}")
+        return None
+    
+    # Enhance with calculations
+    annual = parser.calculate_derived_metrics(summary['annual'])
+    annual = parser.calculate_growth_rates(annual)
+    
+    print(f"   ✅ Processed {len(annual)} years of data")
+    
+    return {
+        'ticker': ticker,
+        'company_name': company_name,
+        'cik': cik,
+        'annual_data': annual,
+        'quarterly_data': summary.get('quarterly')
+    }
+
+
+async def download_all_async(
+    tickers: List[str],
+    fetcher: SECDataFetcher,
+    parser: FinancialDataParser,
+    num_years: int,
+    output_dir: Path,
+    export_format: str,
+    summary_file: Path,
+    pretty: bool = False
+) -> Tuple[int, int]:
+    """
+    Download all tickers concurrently over one shared HTTP client, handling each as it lands
+    
+    Every company's summary row is appended to summary_file (JSON Lines) and its
+    files handed to an export worker as soon as it is processed, so only the
+    companies in flight are held in memory however many tickers are requested.
+    
+    Returns:
+        (successful, failed) company counts
+    """
+    loop = asyncio.get_running_loop()
+    successful = failed = 0
+    exports = []
+    
+    # One export process per CPU; a single company is exported on a thread
+    workers = min(os.cpu_count() or 1, len(tickers))
+    pool = ProcessPoolExecutor(max_workers=workers) if len(tickers) > 1 else nullcontext()
+    
+    async def download(position: int, ticker: str):
+        return position, await download_company_data_async(ticker, fetcher, parser, num_years)
+    
+    # Cached companies first: they finish without the network, so an interrupted
+    # run still leaves as many rows as possible
+    cached = [fetcher.has_cached_facts(ticker, parser.wanted_names) for ticker in tickers]
+    order = sorted(range(len(tickers)), key=lambda position: not cached[position])
+    print(f"📦 {sum(cached)}/{len(tickers)} companies already cached")
+    
+    async with fetcher.async_session():
+        with pool as executor, open(summary_file, 'wb') as summary:
+            # Tasks start in creation order; as_completed alone would start them in set order
+            tasks = [asyncio.ensure_future(download(position, tickers[position])) for position in order]
+            for next_done in asyncio.as_completed(tasks):
+                position, data = await next_done
+                if not data:
+                    failed += 1
+                    continue
+                
+                successful += 1
+                # Rows land in completion order; position restores ticker order
+                summary.write(json_line({'position': position, **summary_row(data, parser)}))
+                # Workers only need the exported fields, not the quarterly frames
+                payload = {key: data[key] for key in ('ticker', 'company_name', 'cik', 'annual_data')}
+                exports.append(loop.run_in_executor(
+                    executor, export_company_data, payload, output_dir, export_format, pretty
+                ))
+            
+            for written in await asyncio.gather(*exports):
+                for path in written:
+                    print(f"   💾 Saved: {path}")
+    
+    return successful, failed
+
+
+def summary_row(data: dict, parser: FinancialDataParser) -> dict:
+    """Latest values from one company's annual data, as a summary CSV row"""
+    annual = data['annual_data']
+    latest = parser.get_latest_values(annual, list(SUMMARY_METRICS.values()))
+    
+    row = {
+        'Ticker': data['ticker'],
+        'Company': data['company_name'],
+        'CIK': data['cik'],
+        'Latest Year': annual.iloc[0].get('fy', 'N/A'),
+    }
+    for label, column in SUMMARY_METRICS.items():
+        row[label] = latest[column]
+    return row
+
+
+def export_company_data(
+    data: dict,
+    output_dir: Path,
+    export_format: str = 'csv',
+    pretty: bool = False
+) -> List[Path]:
+    """
+    Write one company's annual data as CSV and/or JSON
+    
+    Module-level so ProcessPoolExecutor workers can run it.
+    JSON is written compact unless pretty is set.
+    
+    Returns:
+        Paths written
+    """
+    written = []
+    
+    if export_format in ['csv', 'both']:
+        csv_file = output_dir / f"{data['ticker']}_annual.csv"
+        written.append(write_csv(data['annual_data'], csv_file))
+    
+    if export_format == 'parquet':
+        written.append(save_frame(
+            data['annual_data'], output_dir / f"{data['ticker']}_annual", 'parquet', index=False
+        ))
+    
+    if export_format in ['json', 'both']:
+        json_file = output_dir / f"{data['ticker']}_data.json"
+        save_json({
+            'ticker': data['ticker'],
+            'company_name': data['company_name'],
+            'cik': data['cik'],
+            'annual_data': data['annual_data'].to_dict('records')
+        }, json_file, indent=pretty)
+        written.append(json_file)
+    
+    return written
+
+
+def bulk_download(
+    tickers: List[str],
+    num_years: int = 10,
+    export_format: str = 'csv',
+    pretty: bool = False
+):
     """
     Download data for multiple companies
     
     Args:
         tickers: List of ticker symbols
         num_years: Number of years to download
-        export_format: Export format ('csv', 'json', or 'both')
+        export_format: Export format ('csv', 'json', 'both' or 'parquet')
+        pretty: Indent JSON exports (default: compact)
     """
     print("\n" + "="*80)
     print(f"📦 BULK DATA DOWNLOAD - {len(tickers)} companies")
@@ -100,74 +276,41 @@ def bulk_download(tickers: List[str], num_years: int = 10, export_format: str =
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    # Download data
-    results = []
-    successful = 0
-    failed = 0
+    # Summary rows are streamed here as companies finish, then sorted into ticker order;
+    # it is only scratch space for the CSV and is removed afterwards
+    summary_jsonl = output_dir / f"summary_{timestamp}.jsonl"
     
-    for ticker in tickers:
-        data = download_company_data(ticker, fetcher, parser, num_years)
+    try:
+        # Warm the ticker -> CIK map once, then fetch all companies concurrently
+        fetcher.get_company_tickers()
+        successful, failed = run_async(download_all_async(
+            tickers, fetcher, parser, num_years, output_dir, export_format, summary_jsonl, pretty
+        ))
         
-        if data:
-            results.append(data)
-            successful += 1
+        # Create summary file
+        if successful:
+            print("\n" + "─"*80)
+            print("📊 Creating summary...")
             
-            # Export individual company files
-            if export_format in ['csv', 'both']:
-                csv_file = output_dir / f"{ticker}_annual.csv"
-                data['annual_data'].to_csv(csv_file, index=False)
-                print(f"   💾 Saved: {csv_file}")
+            summary_df = (
+                pd.DataFrame.from_records(load_jsonl(summary_jsonl))
+                .sort_values('position', kind='stable')
+                .drop(columns='position')
+            )
             
-            if export_format in ['json', 'both']:
-                json_file = output_dir / f"{ticker}_data.json"
-                with open(json_file, 'w') as f:
-                    json.dump({
-                        'ticker': data['ticker'],
-                        'company_name': data['company_name'],
-                        'cik': data['cik'],
-                        'annual_data': data['annual_data'].to_dict('records')
-                    }, f, indent=2, default=str)
-        else:
-            failed += 1
-    
-    # Create summary file
-    if results:
-        print("\n" + "─"*80)
-        print("📊 Creating summary...")
-        
-        # Compile latest data from all companies
-        summary_rows = []
-        
-        for data in results:
-            annual = data['annual_data']
-
-            summary_rows.append({
-                'Ticker': data['ticker'],
-                'Company': data['company_name'],
-                'CIK': data['cik'],
-                'Latest Year': annual.iloc[0].get('fy', 'N/A'),
-                'Revenue': parser.get_latest_non_null(annual, 'Revenue'),
-                'Net Income': parser.get_latest_non_null(annual, 'NetIncome'),
-                'Total Assets': parser.get_latest_non_null(annual, 'Assets'),
-                'Equity': parser.get_latest_non_null(annual, 'Equity'),
-                'Profit Margin %': parser.get_latest_non_null(annual, 'ProfitMargin'),
-                'ROE %': parser.get_latest_non_null(annual, 'ROE'),
-                'Revenue Growth %': parser.get_latest_non_null(annual, 'Revenue_YoY_%'),
-            })
-        
-        summary_df = pd.DataFrame(summary_rows)
-        
-        # Save summary
-        summary_file = output_dir / f"summary_{timestamp}.csv"
-        summary_df.to_csv(summary_file, index=False)
-        
-        print(f"\n✅ Summary saved: {summary_file}")
-        
-        # Display summary
-        print("\n" + "─"*80)
-        print("📈 DOWNLOAD SUMMARY")
-        print("─"*80)
-        print(summary_df.to_string(index=False))
+            # Save summary
+            summary_file = output_dir / f"summary_{timestamp}.csv"
+            write_csv(summary_df, summary_file)
+            
+            print(f"\n✅ Summary saved: {summary_file}")
+            
+            # Display summary
+            print("\n" + "─"*80)
+            print("📈 DOWNLOAD SUMMARY")
+            print("─"*80)
+            print(summary_df.to_string(index=False))
+    finally:
+        summary_jsonl.unlink(missing_ok=True)
     
     # Final statistics
     print("\n" + "="*80)
@@ -206,9 +349,15 @@ def main():
     
     parser.add_argument(
         '-f', '--format',
-        choices=['csv', 'json', 'both'],
+        choices=['csv', 'json', 'both', 'parquet'],
         default='csv',
-        help='Export format (default: csv)'
+        help='Export format (default: csv; ingest parquet with ingest_data.py --format parquet)'
+    )
+    
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Indent JSON exports for reading (default: compact)'
     )
     
     args = parser.parse_args()
@@ -217,7 +366,7 @@ def main():
     tickers = [t.upper() for t in args.tickers]
     
     # Run bulk download
-    bulk_download(tickers, num_years=args.years, export_format=args.format)
+    bulk_download(tickers, num_years=args.years, export_format=args.format, pretty=args.pretty)
 
 
 if __name__ == "__main__":
@@ -4,12 +4,13 @@ Data Ingestion Script
 Initializes PostgreSQL schema and ingests pipeline output data
 Run this after bulk_download.py to populate the AI system with data
 """
+import argparse
 import sys
 from pathlib import Path
 
-BACKEND_DIR = Path(__file__).resolve().parents[3]
-if str(BACKEND_DIR) not in sys.path:
-    sys.path.insert(0, str(BACKEND_DIR))
+# Only needed when run as a file; `python -m app.data.scripts.<name>` and imports skip it
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
 from app.core.schema import init_schema
 from app.data.adapter import (
@@ -23,6 +24,15 @@ logger = get_logger(__name__)
 
 def main():
     """Main ingestion workflow"""
+    parser = argparse.ArgumentParser(description='Ingest pipeline output into PostgreSQL and Qdrant')
+    parser.add_argument(
+        '-f', '--format',
+        choices=['csv', 'parquet'],
+        default='csv',
+        help='Format of the bulk_download annual files (default: csv)'
+    )
+    args = parser.parse_args()
+    
     print("\n" + "="*80)
     print("📊 FINVAULT AI - DATA INGESTION")
     print("="*80)
@@ -38,7 +48,7 @@ def main():
     
     # Step 2: Ingest bulk download CSV data
     print("\n[2/3] Ingesting financial metrics from bulk_download/...")
-    summary = ingest_bulk_download_data()
+    summary = ingest_bulk_download_data(file_format=args.format)
     
     if not summary.get('success'):
         print("⚠️  No data ingested")
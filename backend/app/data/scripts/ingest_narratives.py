@@ -11,25 +11,31 @@ This script:
 
 Phase 2: Hybrid Narrative Retrieval
 """
+import asyncio
 import sys
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
-# Add backend to path (go up 4 levels from backend/app/data/scripts/)
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+# Only needed when run as a file; `python -m app.data.scripts.<name>` and imports skip it
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
 from app.config import settings, DATA_OUTPUT_DIR
 from app.data.adapter import (
     chunk_text,
     create_qdrant_collection_if_needed,
-    embed_and_store_narrative,
+    embed_and_store_narratives,
 )
-from app.core.embeddings import embed_text
-from app.utils.helpers import get_logger
+from app.core.embeddings import embed_batch
+from app.utils.helpers import get_logger, run_async
 
 logger = get_logger(__name__)
 
+# Transcripts buffered between pipeline stages in ingest_narratives_async
+CHUNK_QUEUE_SIZE = 128
+EMBED_QUEUE_SIZE = 32
+
 # Sample narrative data for demonstration
 # In production, fetch from earnings_call_fetcher.py
 SAMPLE_NARRATIVES = {
@@ -146,9 +152,96 @@ persists, impacting at least 2-3 points of growth.
 }
 
 
+# Transcript sections encoded once at import; chunk_text scans ASCII bytes directly
+_TEXT_FIELDS = ("prepared_remarks", "qa_section")
+_SAMPLE_NARRATIVES_UTF8 = {
+    key: {**narrative, **{field: narrative[field].encode("utf-8") for field in _TEXT_FIELDS}}
+    for key, narrative in SAMPLE_NARRATIVES.items()
+}
+
+
 def load_sample_narratives() -> dict:
-    """Load sample narrative data for demonstration."""
-    return SAMPLE_NARRATIVES
+    """Load sample narrative data for demonstration, with sections as UTF-8 bytes."""
+    return _SAMPLE_NARRATIVES_UTF8
+
+
+def build_narrative_chunks(
+    quarter: int,
+    prepared_remarks: Union[str, bytes],
+    qa_section: Union[str, bytes]
+) -> list[dict]:
+    """
+    Chunk a transcript's prepared remarks and Q&A into embed_and_store_narratives chunk dicts.
+    
+    Args:
+        quarter: Quarter number
+        prepared_remarks: Prepared remarks text (str or UTF-8 bytes)
+        qa_section: Q&A section text (str or UTF-8 bytes)
+        
+    Returns:
+        Chunk dicts for both sections, prepared remarks first
+    """
+    chunks = []
+    
+    # Prepared remarks
+    if prepared_remarks and len(prepared_remarks.strip()) > 100:
+        prepared_chunks = chunk_text(prepared_remarks, chunk_size=400, overlap=50)
+        chunks.extend(
+            {
+                'text': chunk,
+                'chunk_id': idx,
+                'total_chunks': len(prepared_chunks),
+                'section_title': f"Prepared Remarks (AAPL Q{quarter})",
+            }
+            for idx, chunk in enumerate(prepared_chunks)
+        )
+    
+    # Q&A section
+    if qa_section and len(qa_section.strip()) > 100:
+        qa_chunks = chunk_text(qa_section, chunk_size=400, overlap=50)
+        chunks.extend(
+            {
+                'text': chunk,
+                'chunk_id': idx + len(qa_chunks),  # Offset from prepared remarks
+                'total_chunks': len(qa_chunks),
+                'section_title': f"Q&A Section (AAPL Q{quarter})",
+            }
+            for idx, chunk in enumerate(qa_chunks)
+        )
+    
+    return chunks
+
+
+def store_narrative_chunks(
+    chunks: list[dict],
+    ticker: str,
+    company: str,
+    year: int,
+    quarter: int,
+    collection_name: str = "financial_narratives",
+    embeddings_batch_fn=embed_batch
+) -> int:
+    """
+    Embed one transcript's chunks and store them in Qdrant and PostgreSQL.
+    
+    embeddings_batch_fn may also hand back vectors computed earlier (see
+    ingest_narratives_async).
+    
+    Returns:
+        Number of chunks successfully ingested
+    """
+    # Embed both sections in one batch and upsert them in one request
+    db_ids = embed_and_store_narratives(
+        chunks,
+        collection_name=collection_name,
+        company=company,
+        ticker=ticker,
+        year=year,
+        doc_type="earnings_transcript",
+        embeddings_batch_fn=embeddings_batch_fn,
+        source_file=f"{ticker}_earnings_q{quarter}_{year}.json"
+    )
+    return sum(db_id is not None for db_id in db_ids)
 
 
 def ingest_narrative(
@@ -156,8 +249,8 @@ def ingest_narrative(
     company: str,
     year: int,
     quarter: int,
-    prepared_remarks: str,
-    qa_section: str,
+    prepared_remarks: Union[str, bytes],
+    qa_section: Union[str, bytes],
     collection_name: str = "financial_narratives"
 ) -> int:
     """
@@ -168,60 +261,86 @@ def ingest_narrative(
         company: Company name
         year: Fiscal year
         quarter: Quarter number
-        prepared_remarks: Prepared remarks text
-        qa_section: Q&A section text
+        prepared_remarks: Prepared remarks text (str or UTF-8 bytes)
+        qa_section: Q&A section text (str or UTF-8 bytes)
         collection_name: Qdrant collection name
         
     Returns:
         Number of chunks successfully ingested
     """
-    ingested = 0
+    chunks = build_narrative_chunks(quarter, prepared_remarks, qa_section)
+    return store_narrative_chunks(chunks, ticker, company, year, quarter, collection_name)
+
+
+async def ingest_narratives_async(
+    narratives: dict,
+    collection_name: str = "financial_narratives"
+) -> int:
+    """
+    Ingest many transcripts with chunking, embedding and storage pipelined.
     
-    # Process prepared remarks
-    if prepared_remarks and len(prepared_remarks.strip()) > 100:
-        chunks = chunk_text(prepared_remarks, chunk_size=400, overlap=50)
-        for idx, chunk in enumerate(chunks):
-            try:
-                embed_and_store_narrative(
-                    text=chunk,
-                    collection_name=collection_name,
-                    company=company,
-                    ticker=ticker,
-                    year=year,
-                    doc_type="earnings_transcript",
-                    embeddings_model_fn=embed_text,
-                    chunk_id=idx,
-                    total_chunks=len(chunks),
-                    section_title=f"Prepared Remarks (AAPL Q{quarter})",
-                    source_file=f"{ticker}_earnings_q{quarter}_{year}.json"
-                )
-                ingested += 1
-            except Exception as exc:
-                logger.error(f"Failed to ingest chunk {idx}: {exc}")
+    Each stage runs as its own task joined by bounded queues, so one transcript
+    is embedded while the previous one is upserted and registered. Embedding and
+    storage are blocking calls and run in worker threads.
     
-    # Process Q&A section
-    if qa_section and len(qa_section.strip()) > 100:
-        chunks = chunk_text(qa_section, chunk_size=400, overlap=50)
-        for idx, chunk in enumerate(chunks):
-            try:
-                embed_and_store_narrative(
-                    text=chunk,
-                    collection_name=collection_name,
-                    company=company,
-                    ticker=ticker,
-                    year=year,
-                    doc_type="earnings_transcript",
-                    embeddings_model_fn=embed_text,
-                    chunk_id=idx + len(chunks),  # Offset from prepared remarks
-                    total_chunks=len(chunks),
-                    section_title=f"Q&A Section (AAPL Q{quarter})",
-                    source_file=f"{ticker}_earnings_q{quarter}_{year}.json"
-                )
-                ingested += 1
-            except Exception as exc:
-                logger.error(f"Failed to ingest Q&A chunk {idx}: {exc}")
+    Args:
+        narratives: Narrative dicts keyed by source (see SAMPLE_NARRATIVES)
+        collection_name: Qdrant collection name
+        
+    Returns:
+        Number of chunks successfully ingested
+    """
+    chunk_q: asyncio.Queue = asyncio.Queue(maxsize=CHUNK_QUEUE_SIZE)
+    embed_q: asyncio.Queue = asyncio.Queue(maxsize=EMBED_QUEUE_SIZE)
+    total_chunks = 0
+    
+    async def chunker():
+        for narrative in narratives.values():
+            print(f"\n  Ingesting {narrative['ticker']}_{narrative['year']}_Q{narrative['quarter']}...")
+            chunks = build_narrative_chunks(
+                narrative['quarter'], narrative['prepared_remarks'], narrative['qa_section']
+            )
+            await chunk_q.put((narrative, chunks))
+        await chunk_q.put(None)
+    
+    async def embedder():
+        # One embedder: a second would only contend for the same model
+        while (item := await chunk_q.get()) is not None:
+            narrative, chunks = item
+            vectors = None
+            if chunks:
+                vectors = await asyncio.to_thread(embed_batch, [chunk['text'] for chunk in chunks])
+            await embed_q.put((narrative, chunks, vectors))
+        await embed_q.put(None)
+    
+    async def upserter():
+        nonlocal total_chunks
+        while (item := await embed_q.get()) is not None:
+            narrative, chunks, vectors = item
+            ingest_key = f"{narrative['ticker']}_{narrative['year']}_Q{narrative['quarter']}"
+            chunks_ingested = await asyncio.to_thread(
+                store_narrative_chunks,
+                chunks,
+                narrative['ticker'],
+                narrative['company'],
+                narrative['year'],
+                narrative['quarter'],
+                collection_name,
+                lambda texts: vectors,
+            )
+            total_chunks += chunks_ingested
+            print(f"    ✅ {ingest_key}: {chunks_ingested} chunks ingested")
     
-    return ingested
+    # If a stage fails, cancel the others so none is left waiting on its queue
+    stages = [asyncio.ensure_future(stage()) for stage in (chunker, embedder, upserter)]
+    try:
+        await asyncio.gather(*stages)
+    except BaseException:
+        for stage in stages:
+            stage.cancel()
+        raise
+    
+    return total_chunks
 
 
 def main():
@@ -244,23 +363,7 @@ def main():
     
     # Step 3: Ingest narratives
     print("🔄 Step 3: Ingesting narratives into Qdrant...")
-    total_chunks = 0
-    
-    for key, narrative in narratives.items():
-        ingest_key = f"{narrative['ticker']}_{narrative['year']}_Q{narrative['quarter']}"
-        print(f"\n  Ingesting {ingest_key}...")
-        
-        chunks_ingested = ingest_narrative(
-            ticker=narrative['ticker'],
-            company=narrative['company'],
-            year=narrative['year'],
-            quarter=narrative['quarter'],
-            prepared_remarks=narrative['prepared_remarks'],
-            qa_section=narrative['qa_section']
-        )
-        
-        total_chunks += chunks_ingested
-        print(f"    ✅ {chunks_ingested} chunks ingested")
+    total_chunks = run_async(ingest_narratives_async(narratives))
     
     print(f"\n✅ Ingestion complete: {total_chunks} chunks total\n")
     
@@ -3,22 +3,30 @@
 End-to-End Test Script
 Tests the complete hybrid retrieval + LLM reasoning workflow
 """
+import argparse
+import asyncio
 import sys
 from pathlib import Path
 
-BACKEND_DIR = Path(__file__).resolve().parents[3]
-if str(BACKEND_DIR) not in sys.path:
-    sys.path.insert(0, str(BACKEND_DIR))
+# Only needed when run as a file; `python -m app.data.scripts.<name>` and imports skip it
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
 from app.core.retrieval import (
     perform_hybrid_retrieval,
+    perform_hybrid_retrieval_async,
     classify_query_mode,
-    build_llm_prompt,
+    build_llm_messages,
     format_context_for_llm
 )
-from app.core.embeddings import embed_text
+from app.core.embeddings import (
+    embed_text,
+    embed_text_cache_info,
+    embed_text_cached,
+    get_embedding_model,
+)
 from app.core.llm import quick_model_call
-from app.utils.helpers import get_logger
+from app.utils.helpers import get_logger, run_async
 
 logger = get_logger(__name__)
 
@@ -30,74 +38,89 @@ TEST_QUERIES = [
 ]
 
 
-def run_test_query(query: str, tickers: list = None, verbose: bool = True):
+def run_test_query(
+    query: str,
+    tickers: list = None,
+    verbose: bool = True,
+    use_cache: bool = True,
+    context: dict = None
+):
     """
     Execute a test query through the full pipeline
+    
+    Progress is collected and printed as one block at the end, so queries run
+    concurrently (see run_all_queries) don't interleave their output.
+    With use_cache, query embeddings are memoized (embed_text_cached).
+    Pass an already retrieved context to skip the retrieval step.
     """
+    report = []
+    
     if verbose:
-        print(f"\n{'='*80}")
-        print(f"🔍 TEST QUERY: {query}")
-        print(f"{'='*80}")
+        report.append(f"\n{'='*80}")
+        report.append(f"🔍 TEST QUERY: {query}")
+        report.append(f"{'='*80}")
     
     try:
         # Step 1: Classify query
         mode = classify_query_mode(query)
         if verbose:
-            print(f"[1] Query Mode: {mode}")
+            report.append(f"[1] Query Mode: {mode}")
         
         # Step 2: Hybrid retrieval
         if verbose:
-            print(f"[2] Performing hybrid retrieval...")
+            report.append(f"[2] Performing hybrid retrieval...")
         
-        context = perform_hybrid_retrieval(
-            query=query,
-            embeddings_model_fn=embed_text,
-            tickers=tickers,
-            force_mode=None
-        )
+        if context is None:
+            context = perform_hybrid_retrieval(
+                query=query,
+                embeddings_model_fn=embed_text_cached if use_cache else embed_text,
+                tickers=tickers,
+                force_mode=None
+            )
         
         summary = context.get('retrieval_summary', {})
         if verbose:
-            print(f"    - Numeric records: {summary.get('numeric_retrieved')}")
-            print(f"    - Narrative chunks: {summary.get('narrative_retrieved')}")
-            print(f"    - Retrieval latency: {summary.get('latency_ms')}ms")
+            report.append(f"    - Numeric records: {summary.get('numeric_retrieved')}")
+            report.append(f"    - Narrative chunks: {summary.get('narrative_retrieved')}")
+            report.append(f"    - Retrieval latency: {summary.get('latency_ms')}ms")
         
         # Step 3: Format context
         if verbose:
-            print(f"[3] Formatting context for LLM...")
+            report.append(f"[3] Formatting context for LLM...")
         
         formatted_context = format_context_for_llm(context)
         if verbose:
-            print(f"    - Context length: {len(formatted_context)} chars")
+            report.append(f"    - Context length: {len(formatted_context)} chars")
         
         # Step 4: Build prompt
         if verbose:
-            print(f"[4] Building LLM prompt...")
+            report.append(f"[4] Building LLM prompt...")
         
-        prompt = build_llm_prompt(query, context)
+        # Stable prefix (instructions + context) as the system message, query last
+        system_prefix, user_suffix = build_llm_messages(query, context)
         if verbose:
-            print(f"    - Prompt length: {len(prompt)} chars")
+            report.append(f"    - Prompt length: {len(system_prefix) + len(user_suffix)} chars")
         
         # Step 5: Call LLM
         if verbose:
-            print(f"[5] Calling Groq LLM (quick model)...")
+            report.append(f"[5] Calling Groq LLM (quick model)...")
         
-        result = quick_model_call(prompt)
+        result = quick_model_call(user_suffix, system=system_prefix)
         analysis = result.get('output', '')
         is_mock = result.get('mock', False)
         
         if verbose:
-            print(f"    - Model: {'llama-3.1-8b-instant'}")
-            print(f"    - Mock response: {is_mock}")
-            print(f"    - Response length: {len(analysis)} chars")
+            report.append(f"    - Model: {'llama-3.1-8b-instant'}")
+            report.append(f"    - Mock response: {is_mock}")
+            report.append(f"    - Response length: {len(analysis)} chars")
         
         # Step 6: Display results
         if verbose:
-            print(f"\n{'─'*80}")
-            print("ANALYSIS:")
-            print(f"{'─'*80}")
-            print(analysis)
-            print(f"{'─'*80}\n")
+            report.append(f"\n{'─'*80}")
+            report.append("ANALYSIS:")
+            report.append(f"{'─'*80}")
+            report.append(analysis)
+            report.append(f"{'─'*80}\n")
         
         return {
             'success': True,
@@ -112,26 +135,72 @@ def run_test_query(query: str, tickers: list = None, verbose: bool = True):
     except Exception as exc:
         logger.error(f"Test query failed: {exc}")
         if verbose:
-            print(f"\n❌ ERROR: {exc}")
+            report.append(f"\n❌ ERROR: {exc}")
+        
+        return {
+            'success': False,
+            'query': query,
+            'error': str(exc)
+        }
+    
+    finally:
+        if report:
+            print("\n".join(report))
+
+
+async def run_test_query_async(
+    query: str, tickers: list = None, verbose: bool = True, use_cache: bool = True
+):
+    """
+    run_test_query with async retrieval (numeric and narrative fetched concurrently);
+    the blocking LLM call then runs on a worker thread
+    """
+    try:
+        context = await perform_hybrid_retrieval_async(
+            query=query,
+            embeddings_model_fn=embed_text_cached if use_cache else embed_text,
+            tickers=tickers,
+            force_mode=None
+        )
+    except Exception as exc:
+        # A failed retrieval fails this query only, not the whole gather
+        logger.error(f"Test query failed: {exc}")
+        if verbose:
+            print(f"\n🔍 TEST QUERY: {query}\n❌ ERROR: {exc}")
         
         return {
             'success': False,
             'query': query,
             'error': str(exc)
         }
+    
+    return await asyncio.to_thread(run_test_query, query, tickers, verbose, use_cache, context)
+
+
+async def run_all_queries(queries: list, verbose: bool = True, use_cache: bool = True) -> list:
+    """Run every (query, tickers) pair concurrently, returning results in query order"""
+    # Load the embedding model once up front rather than racing to load it per query
+    await asyncio.to_thread(get_embedding_model)
+    return await asyncio.gather(
+        *(run_test_query_async(query, tickers, verbose, use_cache) for query, tickers in queries)
+    )
 
 
 def main():
     """Run end-to-end tests"""
+    parser = argparse.ArgumentParser(description='FinVault AI end-to-end test')
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Embed every query afresh instead of memoizing query embeddings'
+    )
+    args = parser.parse_args()
+    
     print("\n" + "="*80)
     print("🧪 FINVAULT AI - END-TO-END TEST")
     print("="*80)
     
-    results = []
-    
-    for query, tickers in TEST_QUERIES:
-        result = run_test_query(query, tickers, verbose=True)
-        results.append(result)
+    results = run_async(run_all_queries(TEST_QUERIES, verbose=True, use_cache=not args.no_cache))
     
     # Summary
     print("\n" + "="*80)
@@ -154,6 +223,10 @@ def main():
     
     print(f"\n Summary: {successful}/{len(results)} tests passed")
     
+    if not args.no_cache:
+        cache = embed_text_cache_info()
+        print(f" Query embedding cache: {cache.hits} hits, {cache.misses} misses")
+    
     if successful == len(results):
         print("🎉 All tests passed! System is ready for queries.")
     else:
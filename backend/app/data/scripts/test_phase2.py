@@ -9,16 +9,20 @@ Tests the complete workflow:
 4. Check for contradiction detection
 5. Validate latency under 30 seconds (quick mode)
 """
+import argparse
+import functools
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import json
 
-# Add backend to path (go up 4 levels from backend/app/data/scripts/)
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+# Only needed when run as a file; `python -m app.data.scripts.<name>` and imports skip it
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
-from app.core.embeddings import embed_text
-from app.core.retrieval import perform_hybrid_retrieval, assemble_context
+from app.core.embeddings import embed_text, embed_text_cache_info, embed_text_cached
+from app.core.retrieval import perform_hybrid_retrieval_batch, assemble_context, count_tokens
 from app.core.llm import quick_model_call, deep_model_call
 from app.config import DATA_OUTPUT_DIR
 from app.utils.helpers import get_logger
@@ -48,55 +52,74 @@ PHASE2_TEST_QUERIES = [
 ]
 
 
-def run_phase2_tests():
-    """Run comprehensive Phase 2 tests."""
+def run_phase2_tests(use_cache: bool = True):
+    """Run comprehensive Phase 2 tests; use_cache memoizes query embeddings."""
     print("\n" + "="*80)
     print("PHASE 2 END-TO-END TEST: Hybrid Narrative Retrieval")
     print("="*80 + "\n")
     
     results = []
     
+    import time
+    queries = [test_case['query'] for test_case in PHASE2_TEST_QUERIES]
+    retrieve = functools.partial(
+        perform_hybrid_retrieval_batch,
+        embeddings_model_fn=embed_text_cached if use_cache else embed_text,
+        tickers=['AAPL', 'MSFT'],
+        force_mode=None,  # Let it classify
+        numeric_limit=20,
+        narrative_limit=5
+    )
+    
+    # The first query is retrieved on its own; the rest are fetched in one
+    # Qdrant batch search on a background thread while the first LLM call runs
+    prefetcher = ThreadPoolExecutor(max_workers=1)
+    first_batch = prefetcher.submit(retrieve, queries[:1])
+    rest_batch = prefetcher.submit(retrieve, queries[1:])
+    prefetcher.shutdown(wait=False)
+    
     for idx, test_case in enumerate(PHASE2_TEST_QUERIES, 1):
-        print(f"\n📋 Test {idx}: {test_case['description']}")
-        print(f"   Query: {test_case['query'][:60]}...")
-        print(f"   Mode: {test_case['mode']}")
-        print("-" * 80)
+        # Each test's progress is buffered and written in one go when it finishes
+        report = []
+        report.append(f"\n📋 Test {idx}: {test_case['description']}")
+        report.append(f"   Query: {test_case['query'][:60]}...")
+        report.append(f"   Mode: {test_case['mode']}")
+        report.append("-" * 80)
         
         try:
-            import time
             start_time = time.time()
             
-            # Perform hybrid retrieval
-            print("   ⏳ Performing hybrid retrieval...")
-            context = perform_hybrid_retrieval(
-                query=test_case['query'],
-                embeddings_model_fn=embed_text,
-                tickers=['AAPL', 'MSFT'],
-                force_mode=None,  # Let it classify
-                numeric_limit=20,
-                narrative_limit=5
-            )
+            # Only blocks if the prefetched retrieval hasn't finished yet
+            report.append("   ⏳ Waiting for hybrid retrieval...")
+            if idx == 1:
+                context = first_batch.result()[0]
+            else:
+                context = rest_batch.result()[idx - 2]
+            answer_start = time.time()
+            retrieval_wait_ms = int((answer_start - start_time) * 1000)
             
             retrieval_summary = context.get('retrieval_summary', {})
+            # Wall time of the batch retrieval that produced this context
+            retrieval_ms = retrieval_summary.get('latency_ms') or 0
             numeric_count = retrieval_summary.get('numeric_retrieved', 0)
             narrative_count = retrieval_summary.get('narrative_retrieved', 0)
             detected_mode = retrieval_summary.get('query_mode', 'unknown')
             
-            print(f"   ✅ Retrieval complete:")
-            print(f"      • Detected mode: {detected_mode}")
-            print(f"      • Numeric records: {numeric_count}")
-            print(f"      • Narrative chunks: {narrative_count}")
+            report.append(f"   ✅ Retrieval complete ({retrieval_ms}ms, waited {retrieval_wait_ms}ms):")
+            report.append(f"      • Detected mode: {detected_mode}")
+            report.append(f"      • Numeric records: {numeric_count}")
+            report.append(f"      • Narrative chunks: {narrative_count}")
             
             # Verify mode detection
             mode_match = detected_mode == test_case['expected_mode']
-            print(f"      • Mode match: {'✅' if mode_match else '⚠️'} ({test_case['expected_mode']} expected)")
+            report.append(f"      • Mode match: {'✅' if mode_match else '⚠️'} ({test_case['expected_mode']} expected)")
             
             # Extract data
             numeric_data = context.get('numeric_data', [])
             narrative_chunks = context.get('narrative_chunks', [])
             
             # Assemble context with citations
-            print("   ⏳ Assembling context with citations...")
+            report.append("   ⏳ Assembling context with citations...")
             assembled = assemble_context(
                 query=test_case['query'],
                 numeric_data=numeric_data,
@@ -118,25 +141,29 @@ def run_phase2_tests():
             
             # Check for citations
             has_citations = '[Source:' in assembled
-            print(f"   ✅ Context assembled: {'✅ Has citations' if has_citations else '⚠️ No citations detected'}")
+            report.append(f"   ✅ Context assembled: {'✅ Has citations' if has_citations else '⚠️ No citations detected'}")
             
             # Call LLM
-            print("   ⏳ Calling Groq LLM (quick mode)...")
+            report.append("   ⏳ Calling Groq LLM (quick mode)...")
             llm_input = assembled + "\n\nProvide your analysis:\n"
+            prompt_tokens = count_tokens(llm_input)
+            report.append(f"      • Prompt tokens: {prompt_tokens}")
             llm_result = quick_model_call(llm_input)
             analysis = llm_result.get("output", "No response")
             
-            latency_ms = int((time.time() - start_time) * 1000)
+            # Real per-query latency: its retrieval plus assembly and the LLM call.
+            # The prefetch wait alone would hide retrieval time for tests 2+.
+            latency_ms = retrieval_ms + int((time.time() - answer_start) * 1000)
             
             # Verify output quality
             has_citations_in_response = '[Source:' in analysis or 'Source:' in analysis
             has_metrics = any(word in analysis.lower() for word in ['revenue', 'profit', 'growth', 'roe', 'margin'])
             
-            print(f"   ✅ LLM response received ({latency_ms}ms):")
-            print(f"      • Response length: {len(analysis)} chars")
-            print(f"      • Has citations: {'✅' if has_citations_in_response else '⚠️'}")
-            print(f"      • References metrics: {'✅' if has_metrics else '⚠️'}")
-            print(f"      • Latency OK: {'✅' if latency_ms < 30_000 else '❌'} ({latency_ms}ms < 30s)")
+            report.append(f"   ✅ LLM response received ({latency_ms}ms):")
+            report.append(f"      • Response length: {len(analysis)} chars")
+            report.append(f"      • Has citations: {'✅' if has_citations_in_response else '⚠️'}")
+            report.append(f"      • References metrics: {'✅' if has_metrics else '⚠️'}")
+            report.append(f"      • Latency OK: {'✅' if latency_ms < 30_000 else '❌'} ({latency_ms}ms < 30s)")
             
             # Store result
             results.append({
@@ -149,15 +176,18 @@ def run_phase2_tests():
                 'narrative_count': narrative_count,
                 'has_citations': has_citations_in_response,
                 'has_metrics': has_metrics,
+                'retrieval_ms': retrieval_ms,
+                'retrieval_wait_ms': retrieval_wait_ms,
                 'latency_ms': latency_ms,
                 'latency_ok': latency_ms < 30_000,
+                'prompt_tokens': prompt_tokens,
                 'response_chars': len(analysis),
             })
             
             # Print sample response
-            print(f"\n   📄 Sample Output ({len(analysis)} chars):")
+            report.append(f"\n   📄 Sample Output ({len(analysis)} chars):")
             sample = analysis[:300].replace('\n', ' ')
-            print(f"      {sample}...\n")
+            report.append(f"      {sample}...\n")
             
         except Exception as exc:
             logger.error(f"Test {idx} failed: {exc}")
@@ -167,7 +197,10 @@ def run_phase2_tests():
                 'description': test_case['description'],
                 'error': str(exc),
             })
-            print(f"   ❌ Test failed: {exc}\n")
+            report.append(f"   ❌ Test failed: {exc}\n")
+        
+        finally:
+            print("\n".join(report))
     
     # Summary
     print("\n" + "="*80)
@@ -187,10 +220,13 @@ def run_phase2_tests():
             print(f"   Mode: {result['detected_mode']} (expected {result.get('expected_mode', '?')})")
             print(f"   Data: {result['numeric_count']} metrics + {result['narrative_count']} narratives")
             print(f"   Quality: Citations={result['has_citations']}, Metrics={result['has_metrics']}")
-            print(f"   Latency: {result['latency_ms']}ms {'✅' if result['latency_ok'] else '❌'}")
+            print(f"   Latency: {result['latency_ms']}ms {'✅' if result['latency_ok'] else '❌'} ({result['prompt_tokens']} prompt tokens)")
     
     print(f"\n{'-'*80}")
     print(f"Results: {success_count}/{total_count} tests completed successfully")
+    if use_cache:
+        cache = embed_text_cache_info()
+        print(f"Query embedding cache: {cache.hits} hits, {cache.misses} misses")
     print(f"Phase 2 Status: {'✅ COMPLETE' if success_count == total_count else '⚠️ PARTIAL'}")
     print("="*80 + "\n")
     
@@ -199,7 +235,15 @@ def run_phase2_tests():
 
 def main():
     """Main test runner."""
-    success = run_phase2_tests()
+    parser = argparse.ArgumentParser(description='Phase 2 hybrid narrative retrieval test')
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Embed every query afresh instead of memoizing query embeddings'
+    )
+    args = parser.parse_args()
+    
+    success = run_phase2_tests(use_cache=not args.no_cache)
     sys.exit(0 if success else 1)
 
 
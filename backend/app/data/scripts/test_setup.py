@@ -2,13 +2,49 @@
 Test Script - Verify SEC Data Fetcher Setup
 Quick test to ensure everything is working
 """
+import functools
+import io
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Only needed when run as a file; `python -m app.data.scripts.<name>` and imports skip it
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+
+def _once(loader):
+    """functools.cache for a no-argument loader, computed once even when probe threads race"""
+    cached = functools.cache(loader)
+    lock = threading.Lock()
+    
+    @functools.wraps(loader)
+    def wrapper():
+        with lock:
+            return cached()
+    return wrapper
+
+
+@_once
+def _shared_fetcher():
+    """One SECDataFetcher (and ticker map) for every check"""
+    from app.data.pipeline.sec_data_fetcher import SECDataFetcher
+    return SECDataFetcher()
+
+
+@_once
+def _aapl_facts():
+    """AAPL company facts, fetched once and shared by the fetch, parser and export checks"""
+    return _shared_fetcher().get_company_data_by_ticker("AAPL")
+
+
+@_once
+def _aapl_summary():
+    """3-period AAPL financial summary, shared by the parser and export checks"""
+    from app.data.pipeline.financial_data_parser import FinancialDataParser
+    return FinancialDataParser().create_financial_summary(_aapl_facts(), num_periods=3)
 
-BACKEND_DIR = Path(__file__).resolve().parents[3]
-if str(BACKEND_DIR) not in sys.path:
-    sys.path.insert(0, str(BACKEND_DIR))
 
 def test_imports():
     """Test if all required modules can be imported"""
@@ -56,9 +92,7 @@ def test_sec_fetch():
     """Test SEC data fetching"""
     print("\n🧪 Testing SEC data fetch...")
     try:
-        from app.data.pipeline.sec_data_fetcher import SECDataFetcher
-        
-        fetcher = SECDataFetcher()
+        fetcher = _shared_fetcher()
         
         # Test ticker lookup
         print("   📥 Testing ticker lookup...")
@@ -72,7 +106,7 @@ def test_sec_fetch():
         
         # Test company facts fetch
         print("   📥 Testing company facts fetch...")
-        facts = fetcher.get_company_facts(cik)
+        facts = _aapl_facts()
         
         if facts and 'entityName' in facts:
             print(f"   ✅ Retrieved data for: {facts['entityName']}")
@@ -105,15 +139,12 @@ def test_parser():
     """Test financial data parser"""
     print("\n🧪 Testing financial data parser...")
     try:
-        import pandas as pd
-        from app.data.pipeline.sec_data_fetcher import SECDataFetcher
         from app.data.pipeline.financial_data_parser import FinancialDataParser
         
-        fetcher = SECDataFetcher()
         parser = FinancialDataParser()
         
         # Get Apple data
-        facts = fetcher.get_company_data_by_ticker("AAPL")
+        facts = _aapl_facts()
         
         if not facts:
             print("   ❌ No data to parse")
@@ -121,7 +152,7 @@ def test_parser():
         
         # Test summary creation
         print("   🔧 Creating financial summary...")
-        summary = parser.create_financial_summary(facts, num_periods=3)
+        summary = _aapl_summary()
         
         if 'annual' in summary and not summary['annual'].empty:
             annual = summary['annual']
@@ -173,18 +204,13 @@ def test_export():
     print("\n🧪 Testing CSV export...")
     try:
         from app import config
-        from app.data.pipeline.sec_data_fetcher import SECDataFetcher
-        from app.data.pipeline.financial_data_parser import FinancialDataParser
-        
-        fetcher = SECDataFetcher()
-        parser = FinancialDataParser()
+        from app.data.pipeline.frame_io import write_csv
         
-        facts = fetcher.get_company_data_by_ticker("AAPL")
-        summary = parser.create_financial_summary(facts, num_periods=3)
+        summary = _aapl_summary()
         
         if 'annual' in summary:
             test_file = Path(config.DATA_OUTPUT_DIR) / "test_export.csv"
-            summary['annual'].to_csv(test_file, index=False)
+            write_csv(summary['annual'], test_file)
             
             if test_file.exists():
                 size = test_file.stat().st_size
@@ -206,20 +232,82 @@ def test_export():
         return False
 
 
+class _ThreadBufferedStdout:
+    """sys.stdout stand-in that collects each probe thread's output separately"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer or self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+    
+    def capture(self, probe):
+        """Run probe, returning (passed, everything it printed)"""
+        self._local.buffer = io.StringIO()
+        try:
+            passed = probe()
+        except Exception as e:
+            print(f"   ❌ Unexpected error: {e}")
+            passed = False
+        finally:
+            output, self._local.buffer = self._local.buffer.getvalue(), None
+        return passed, output
+
+
+# Probes run level by level, each level concurrently; a level only starts if
+# every probe before it passed (nothing works without imports and config)
+PROBE_LEVELS = [
+    [("Import Dependencies", test_imports), ("Configuration", test_config)],
+    [("SEC Data Fetch", test_sec_fetch)],
+    [("Financial Parser", test_parser), ("CSV Export", test_export)],
+]
+
+
+def run_probes(levels=PROBE_LEVELS) -> list:
+    """
+    Run the probes level by level, returning (name, status) in order
+    
+    status is True/False, or None for probes skipped after an earlier failure.
+    Each probe's output is printed as one block, in declaration order.
+    """
+    results = []
+    failed = False
+    stdout = sys.stdout
+    buffered = _ThreadBufferedStdout(stdout)
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for level in levels:
+            if failed:
+                results.extend((name, None) for name, _ in level)
+                continue
+            
+            sys.stdout = buffered
+            try:
+                futures = [executor.submit(buffered.capture, probe) for _, probe in level]
+                outcomes = [future.result() for future in futures]
+            finally:
+                sys.stdout = stdout
+            
+            for (name, _), (passed, output) in zip(level, outcomes):
+                stdout.write(output)
+                results.append((name, passed))
+                failed = failed or not passed
+    
+    return results
+
+
 def main():
     """Run all tests"""
     print("\n" + "="*80)
     print("🧪 FIN-VAULT-AI - SETUP VERIFICATION TEST")
     print("="*80)
     
-    results = []
-    
-    # Run tests
-    results.append(("Import Dependencies", test_imports()))
-    results.append(("Configuration", test_config()))
-    results.append(("SEC Data Fetch", test_sec_fetch()))
-    results.append(("Financial Parser", test_parser()))
-    results.append(("CSV Export", test_export()))
+    results = run_probes()
     
     # Summary
     print("\n" + "="*80)
@@ -227,7 +315,10 @@ def main():
     print("="*80)
     
     for test_name, passed in results:
-        status = "✅ PASS" if passed else "❌ FAIL"
+        if passed is None:
+            status = "⏭  SKIPPED"
+        else:
+            status = "✅ PASS" if passed else "❌ FAIL"
         print(f"{status:10s} - {test_name}")
     
     total = len(results)
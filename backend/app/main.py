@@ -1,5 +1,10 @@
+import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from app.api.routes import router
 from app.api.auth import router as auth_router
@@ -10,31 +15,9 @@ from app.core.auth_schema import init_auth_schema
 from app.agents.graph import build_graph
 
 logger = get_logger(__name__)
-app = FastAPI(title=settings.app_name)
-
-# Enable CORS for frontend
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://localhost:3001",
-        "https://localhost:3000",
-        "https://fin-vault-ai.vercel.app/"
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-app.include_router(router)
-app.include_router(auth_router)
 
-
-@app.on_event("startup")
-def on_startup() -> None:
-    setup_logging(settings.log_level)
-    logger.info(f"Starting {settings.app_name} in {settings.env} mode")
-    
+def init_databases() -> None:
     # Initialize database schema
     try:
         if init_schema():
@@ -52,7 +35,9 @@ def on_startup() -> None:
             logger.warning("Failed to initialize auth schema (continuing anyway)")
     except Exception as exc:
         logger.warning(f"Auth schema initialization issue: {exc} (continuing anyway)")
-    
+
+
+def init_agent_graph() -> None:
     # Build agent graph
     try:
         build_graph()
@@ -61,6 +46,57 @@ def on_startup() -> None:
         logger.error(f"Failed to build agent graph: {exc}")
 
 
-@app.on_event("shutdown")
-def on_shutdown() -> None:
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    # The lifespan can be entered more than once for the same app (e.g. a test
+    # client re-entering it); schema probes and graph building only run once
+    if not application.state.initialized:
+        application.state.initialized = True
+        setup_logging(settings.log_level)
+        logger.info(f"Starting {settings.app_name} in {settings.env} mode")
+        
+        # Both schemas define query_history, so the two inits stay ordered in one
+        # thread; the agent graph is independent and is built alongside them
+        await asyncio.gather(
+            asyncio.to_thread(init_databases),
+            asyncio.to_thread(init_agent_graph),
+        )
+    
+    yield
     logger.info(f"Shutting down {settings.app_name}")
+
+
+@lru_cache(maxsize=1)
+def create_app() -> FastAPI:
+    """Build the FastAPI app once; every caller shares the same instance"""
+    application = FastAPI(title=settings.app_name, lifespan=lifespan)
+    application.state.initialized = False
+    
+    # Enable CORS for frontend
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            "http://localhost:3000",
+            "http://localhost:3001",
+            "https://localhost:3000",
+            "https://fin-vault-ai.vercel.app/"
+        ],
+        allow_credentials=True,
+        # Only what the frontend sends, so browsers can cache preflights for a day
+        allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
+        allow_headers=["Authorization", "Content-Type"],
+        max_age=86400,
+    )
+    
+    # Analyses and source lists run to tens of KB; tiny health responses stay uncompressed.
+    # ORJSONResponse is deprecated and not the default: routes with a response_model
+    # are already serialized by Pydantic, and the two without one (save_query,
+    # clear_query_history) only return {"success": True}.
+    application.add_middleware(GZipMiddleware, minimum_size=1024)
+    
+    application.include_router(router)
+    application.include_router(auth_router)
+    return application
+
+
+app = create_app()
@@ -1,13 +1,44 @@
+import asyncio
 import logging
 
+try:
+	import uvloop
+except ImportError:
+	uvloop = None
+
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s - %(message)s"
+
 
 def setup_logging(log_level: str) -> None:
 	level = logging.getLevelName(log_level.upper())
-	logging.basicConfig(
-		level=level,
-		format="%(asctime)s %(levelname)s %(name)s - %(message)s",
-	)
+
+	# LOG_FORMAT never uses thread or process fields, so skip collecting them
+	logging.logThreads = False
+	logging.logProcesses = False
+	logging.logMultiprocessing = False
+
+	# Like basicConfig, a no-op when others (uvicorn, pytest) already configured root
+	root = logging.getLogger()
+	if not root.handlers:
+		handler = logging.StreamHandler()
+		handler.setFormatter(logging.Formatter(LOG_FORMAT))
+		root.addHandler(handler)
+		root.setLevel(level)
 
 
 def get_logger(name: str) -> logging.Logger:
 	return logging.getLogger(name)
+
+
+def run_async(coro):
+	"""Run a coroutine to completion on uvloop when installed, else the default loop"""
+	if uvloop is None:
+		return asyncio.run(coro)
+	# Policy is restored afterwards (unlike uvloop.install()), so importers keep their own
+	policy = asyncio.get_event_loop_policy()
+	asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+	try:
+		return asyncio.run(coro)
+	finally:
+		asyncio.set_event_loop_policy(policy)